@@ -0,0 +1,43 @@
+"""
+Check flags for many positions: is_king_in_check in a Python loop against
+the NumPy batch of logic/batch_attacks.py
+
+Run with: python3 -m benchmarks.batch_attacks [--positions N]
+"""
+import argparse
+import time
+from domain.chess_board import ChessBoard
+from domain.teams import TeamEnum
+from logic.batch_attacks import check_flags, encode_boards
+from logic.move_generation.perft import PERFT_POSITIONS
+from logic.move_validations import is_king_in_check
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Batched check evaluation')
+    parser.add_argument('--positions', type=int, default=100_000)
+    arguments = parser.parse_args(argv)
+
+    samples = [ChessBoard(board_string, team) for board_string, team, _ in PERFT_POSITIONS.values()]
+    boards = [samples[index % len(samples)] for index in range(arguments.positions)]
+    teams = [team.value for team in TeamEnum]
+
+    started = time.perf_counter()
+    looped = [[is_king_in_check(team, chess_board) for chess_board in boards] for team in teams]
+    loop_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    positions = encode_boards(boards)
+    encode_seconds = time.perf_counter() - started
+    flags = check_flags(positions)
+    batch_seconds = time.perf_counter() - started
+
+    assert looped == [flags[team].tolist() for team in teams]
+    print(f'{len(boards)} positions, both kings')
+    print(f'python loop   {loop_seconds:8.3f} s')
+    print(f'numpy batch   {batch_seconds:8.3f} s  (encoding {encode_seconds:.3f} s)  '
+          f'{loop_seconds / batch_seconds:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Compares the flat ChessBoard with the list-of-rows ListChessBoard on the
+positions used by logic/unit_tests/test_move_validators.py
+
+Run with: python3 -m benchmarks.board_backends
+"""
+import timeit
+from typing import List, Tuple
+from domain.chess_board import ChessBoard
+from domain.list_chess_board import ListChessBoard
+from domain.squares import col_of, row_of, square_of, to_square
+
+# (pieces placed on the default board, cell whose rays are walked)
+POSITIONS: List[Tuple[List[Tuple[str, int, str]], Tuple[str, int]]] = [
+    ([('a', 7, 'k'), ('c', 5, 'Q')], ('a', 7)),
+    ([('d', 3, 'K'), ('g', 6, 'b')], ('d', 3)),
+    ([('h', 3, 'K'), ('b', 3, 'r'), ('g', 1, '.')], ('h', 3)),
+    ([('b', 6, 'k'), ('b', 4, 'Q')], ('b', 6)),
+    ([('f', 3, 'k'), ('g', 1, '.')], ('f', 3)),
+    ([('d', 6, 'K')], ('d', 6)),
+    ([('e', 4, 'K'), ('f', 6, 'n')], ('e', 4)),
+    ([('d', 4, 'k'), ('b', 5, 'N')], ('d', 4)),
+    ([('e', 4, 'q')], ('e', 1)),
+    ([('e', 4, 'R'), ('c', 4, 'B'), ('a', 4, 'k')], ('a', 4)),
+    ([('b', 5, 'B')], ('e', 8)),
+    ([('b', 3, 'K'), ('e', 6, 'q'), ('c', 4, 'r')], ('b', 3)),
+    ([('f', 4, 'K')], ('f', 4)),
+]
+
+DIRECTIONS = [[-1, -1], [-1, 1], [1, -1], [1, 1], [-1, 0], [1, 0], [0, -1], [0, 1]]
+
+
+def build_boards(board_type) -> list:
+    boards = []
+    for pieces, cell in POSITIONS:
+        board = board_type()
+        for col, row, piece in pieces:
+            board._set_cell(col, row, piece)
+        boards.append((board, cell))
+    return boards
+
+
+def walk_rays_by_cell(board, cell: Tuple[str, int]) -> int:
+    """
+    The ray walk of logic/move_validations.py, through the (col, row) API
+    """
+    pieces_seen = 0
+    for direction in DIRECTIONS:
+        checked_cell = tuple([chr(ord(cell[0]) + direction[0]), cell[1] + direction[1]])
+        while board.is_in_bounds(checked_cell):
+            if board.get_cell(checked_cell) != '.':
+                pieces_seen += 1
+                break
+            checked_cell = tuple(
+                [chr(ord(checked_cell[0]) + direction[0]), checked_cell[1] + direction[1]])
+    return pieces_seen
+
+
+def walk_rays_by_square(board: ChessBoard, cell: Tuple[str, int]) -> int:
+    """
+    The same ray walk through the integer square API
+    """
+    pieces_seen = 0
+    square = to_square(cell)
+    squares = board.squares
+    for direction in DIRECTIONS:
+        col = col_of(square) + direction[0]
+        row = row_of(square) + direction[1]
+        while 0 <= col < 8 and 0 <= row < 8:
+            if squares[square_of(col, row)] != '.':
+                pieces_seen += 1
+                break
+            col += direction[0]
+            row += direction[1]
+    return pieces_seen
+
+
+def run_workload(boards: list, walk) -> int:
+    total = 0
+    for board, cell in boards:
+        total += walk(board, cell)
+    return total
+
+
+def main(number: int = 2000):
+    list_boards = build_boards(ListChessBoard)
+    flat_boards = build_boards(ChessBoard)
+    cases = [
+        ('ListChessBoard, cell API', list_boards, walk_rays_by_cell),
+        ('ChessBoard, cell API', flat_boards, walk_rays_by_cell),
+        ('ChessBoard, square API', flat_boards, walk_rays_by_square),
+    ]
+    expected = run_workload(list_boards, walk_rays_by_cell)
+    for name, boards, walk in cases:
+        assert run_workload(boards, walk) == expected
+        seconds = timeit.timeit(lambda: run_workload(boards, walk), number=number)
+        print(f'{name:<28} {seconds * 1e6 / number:10.1f} us per pass '
+              f'({len(boards)} positions)')
+
+
+if __name__ == '__main__':
+    main()
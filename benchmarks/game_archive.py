@@ -0,0 +1,58 @@
+"""
+Game archive lookups: random access by id and a sequential scan of the mapped records,
+reading only the headers or materialising every game.
+
+Run with: python3 -m benchmarks.game_archive [--games N] [--plies N] [--lookups N]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from benchmarks.game_snapshot import random_moves, replay
+from domain.game_archive import GameArchive
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Game archive lookup speed')
+    parser.add_argument('--games', type=int, default=20000)
+    parser.add_argument('--plies', type=int, default=80)
+    parser.add_argument('--lookups', type=int, default=5000)
+    arguments = parser.parse_args(argv)
+
+    game = replay(random_moves(arguments.plies))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'games.csa')
+        with GameArchive(path) as archive:
+            started = time.perf_counter()
+            for _ in range(arguments.games):
+                archive.append(game)
+            archive.flush()
+            append_seconds = time.perf_counter() - started
+            size = os.path.getsize(path)
+
+            randomizer = random.Random(1)
+            ids = [randomizer.randrange(arguments.games) for _ in range(arguments.lookups)]
+            started = time.perf_counter()
+            for game_id in ids:
+                archive.load(game_id)
+            lookup_seconds = (time.perf_counter() - started) / arguments.lookups
+
+            started = time.perf_counter()
+            steps = sum(record.get_header().steps for record in archive.scan())
+            header_scan_seconds = time.perf_counter() - started
+            started = time.perf_counter()
+            for record in archive.scan():
+                record.load()
+            load_scan_seconds = time.perf_counter() - started
+            del record
+
+    print(f'{arguments.games} games of {arguments.plies} plies, {size / 1e6:.1f} MB, '
+          f'appended in {append_seconds:.2f} s')
+    print(f'random load   {lookup_seconds * 1e6:8.1f} us per game')
+    print(f'header scan   {arguments.games / header_scan_seconds:8.0f} games/s ({steps} steps)')
+    print(f'load scan     {arguments.games / load_scan_seconds:8.0f} games/s')
+
+
+if __name__ == '__main__':
+    main()
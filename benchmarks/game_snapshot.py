@@ -0,0 +1,70 @@
+"""
+Restoring a game from its binary snapshot against replaying its moves.
+The replay skips validation, so it is a lower bound of replaying through Game.make_move
+
+Run with: python3 -m benchmarks.game_snapshot [--plies N] [--repeat N]
+"""
+import argparse
+import random
+import timeit
+from typing import List
+from domain.chess_board import ChessBoard
+from domain.game import Game
+from domain.game_snapshot import dumps, loads
+from domain.move import Move
+from logic.move_generation.move_generator import STANDARD_SPECIAL_MOVES, generate_legal_moves
+from logic.special_move_registry import get_special_move_registry
+
+
+def play(game: Game, move: Move):
+    special_move = get_special_move_registry(game.rule_set).find(move, game.chess_board)
+    if special_move is not None:
+        game.move_history.append_special_steps(special_move.create_executor(move)(game.chess_board))
+    else:
+        game.chess_board.apply_move(move)
+        game.move_history.append(move)
+    game.chess_board.end_turn()
+
+
+def replay(moves: List[Move]) -> Game:
+    game = Game(chess_board=ChessBoard())
+    for move in moves:
+        play(game, move)
+    return game
+
+
+def random_moves(plies: int) -> List[Move]:
+    randomizer = random.Random(1)
+    game = Game(chess_board=ChessBoard())
+    moves = []
+    for _ in range(plies):
+        chess_board = game.chess_board
+        legal_moves = generate_legal_moves(chess_board.side_to_move, chess_board, STANDARD_SPECIAL_MOVES)
+        if not legal_moves:
+            break
+        moves.append(randomizer.choice(legal_moves))
+        play(game, moves[-1])
+    return moves
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Game snapshot restore speed')
+    parser.add_argument('--plies', type=int, default=80)
+    parser.add_argument('--repeat', type=int, default=2000)
+    arguments = parser.parse_args(argv)
+
+    moves = random_moves(arguments.plies)
+    game = replay(moves)
+    snapshot = dumps(game)
+    replay_seconds = timeit.timeit(lambda: replay(moves), number=arguments.repeat) / arguments.repeat
+    dumps_seconds = timeit.timeit(lambda: dumps(game), number=arguments.repeat) / arguments.repeat
+    loads_seconds = timeit.timeit(lambda: loads(snapshot), number=arguments.repeat) / arguments.repeat
+
+    print(f'{len(moves)} plies, {len(game.move_history)} history steps, snapshot {len(snapshot)} bytes')
+    print(f'replay  {replay_seconds * 1e6:8.1f} us')
+    print(f'dumps   {dumps_seconds * 1e6:8.1f} us')
+    print(f'loads   {loads_seconds * 1e6:8.1f} us  {replay_seconds / loads_seconds:.1f}x faster than replay')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Cost of deciding checkmate and stalemate: logic/game_termination.py's has_legal_move,
+which stops at the first legal move, against generating every legal move.
+Typical positions usually stop at the first king step or piece move tried,
+the mated and stalemated ones are the worst case where every candidate is tried.
+
+Run with: python3 -m benchmarks.game_termination [--repeat N]
+"""
+import argparse
+import time
+from typing import Callable, Dict, List
+from domain.chess_board import ChessBoard
+from logic.game_termination import has_legal_move
+from logic.move_generation.move_generator import STANDARD_SPECIAL_MOVES, generate_legal_moves
+from logic.move_generation.perft import PERFT_POSITIONS
+
+POSITIONS: Dict[str, List[str]] = {
+    'typical': [ChessBoard(board_string, team).to_fen() for board_string, team, _ in PERFT_POSITIONS.values()],
+    'in check': [
+        'rnbqkbnr/ppp2ppp/3p4/1B2p3/4P3/8/PPPP1PPP/RNBQK1NR b KQkq - 1 3',
+        '4k3/8/8/8/8/8/5N2/R3K2r w - - 0 1',
+        '1RB5/8/8/k7/1Pp5/8/8/3QK3 b - b3 0 1',
+    ],
+    'checkmate': [
+        'rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3',
+        'r1bqkb1r/pppp1Qpp/2n2n2/4p3/2B1P3/8/PPPP1PPP/RNB1K1NR b KQkq - 0 4',
+        '6rk/5Npp/8/8/8/8/8/7K b - - 0 1',
+    ],
+    'stalemate': [
+        '7k/5Q2/6K1/8/8/8/8/8 b - - 0 1',
+        'k7/P7/K7/8/8/8/8/8 b - - 0 1',
+        # Every black piece is blocked or pinned, so each one is tried before giving up
+        'R5bk/8/6Q1/p1p1p1p1/P1P1P1P1/8/8/K7 b - - 0 1',
+    ],
+}
+
+
+def _time(check: Callable[[ChessBoard], bool], boards: List[ChessBoard], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for chess_board in boards:
+            # Drop the attack maps cached by the previous round, as a move would
+            chess_board._attack_maps = None
+            check(chess_board)
+    return (time.perf_counter() - started) / (repeat * len(boards))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Checkmate and stalemate detection')
+    parser.add_argument('--repeat', type=int, default=2000)
+    arguments = parser.parse_args(argv)
+
+    def early_exit(chess_board: ChessBoard) -> bool:
+        return has_legal_move(chess_board.side_to_move, chess_board, STANDARD_SPECIAL_MOVES)
+
+    def full_generation(chess_board: ChessBoard) -> bool:
+        return bool(generate_legal_moves(chess_board.side_to_move, chess_board, STANDARD_SPECIAL_MOVES))
+
+    print(f'{"positions":<12}{"early exit":>14}{"generate all":>16}')
+    for name, fens in POSITIONS.items():
+        boards = [ChessBoard.from_fen(fen) for fen in fens]
+        assert [early_exit(chess_board) for chess_board in boards] == \
+            [full_generation(chess_board) for chess_board in boards]
+        early_exit_seconds = _time(early_exit, boards, arguments.repeat)
+        full_seconds = _time(full_generation, boards, arguments.repeat)
+        print(f'{name:<12}{early_exit_seconds * 1e6:>11.1f} us{full_seconds * 1e6:>13.1f} us'
+              f'  {full_seconds / early_exit_seconds:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Move log throughput at each durability level. Every thread plays its own games and logs
+each move as Game.make_move does; with SYNC the threads' moves share fsyncs (group commit).
+One thread with SYNC is the cost of an fsync per move.
+Moves are replayed without validation, so the numbers are the logging overhead.
+
+Run with: python3 -m benchmarks.move_log [--threads N] [--games N] [--plies N] [--directory DIR]
+"""
+import argparse
+import tempfile
+import threading
+import time
+from typing import List
+from benchmarks.game_snapshot import random_moves
+from domain.game import Game
+from domain.move import Move
+from domain.move_log import Durability, MoveLog
+
+
+def play_games(log: MoveLog, thread_number: int, games: int, moves: List[Move]):
+    for number in range(games):
+        game_id = f'{thread_number}-{number}'
+        game = Game()
+        log.track(game_id, game)
+        for move in moves:
+            game.replay_move(move)
+            log.log_move(game_id, move)
+        log.close_game(game_id)
+
+
+def measure(durability: Durability, threads: int, games: int, moves: List[Move], directory: str) -> float:
+    with tempfile.TemporaryDirectory(dir=directory) as log_directory:
+        with MoveLog(log_directory, durability) as log:
+            workers = [threading.Thread(target=play_games, args=(log, number, games, moves))
+                       for number in range(threads)]
+            started = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            log.sync()
+            seconds = time.perf_counter() - started
+    return threads * games * len(moves) / seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Move log throughput per durability level')
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--games', type=int, default=4, help='games per thread')
+    parser.add_argument('--plies', type=int, default=60)
+    parser.add_argument('--directory', default=None, help='where to write the logs, a temporary directory by default')
+    arguments = parser.parse_args(argv)
+
+    moves = random_moves(arguments.plies)
+    for durability in Durability:
+        for threads in sorted({1, arguments.threads}):
+            games = arguments.games * arguments.threads // threads
+            moves_per_second = measure(durability, threads, games, moves, arguments.directory)
+            print(f'{durability.value:8} {threads:3} threads  {moves_per_second:10.0f} moves/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Perft throughput and correctness gate: counts leaf nodes for the published positions,
+compares them with the expected counts and reports nodes per second.
+Exits with status 1 if any count is wrong.
+
+Run with: python3 -m benchmarks.perft [--depth N] [--processes N] [--divide] [position ...]
+"""
+import argparse
+import sys
+import time
+from domain.chess_board import ChessBoard
+from logic.move_generation.perft import PERFT_POSITIONS, divide, perft
+
+
+def run_position(name: str, depth: int, processes: int, show_divide: bool) -> bool:
+    board_string, team, expected_counts = PERFT_POSITIONS[name]
+    depth = min(depth, len(expected_counts))
+    chess_board = ChessBoard(board_string, team)
+
+    started = time.perf_counter()
+    if processes == 1 and not show_divide:
+        nodes = perft(chess_board, depth)
+        root_counts = dict()
+    else:
+        root_counts = divide(chess_board, depth, processes=processes)
+        nodes = sum(root_counts.values())
+    seconds = time.perf_counter() - started
+
+    for move_name in sorted(root_counts) if show_divide else []:
+        print(f'  {move_name}: {root_counts[move_name]}')
+    expected = expected_counts[depth - 1]
+    status = 'ok' if nodes == expected else f'FAIL (expected {expected})'
+    print(f'{name:<18} depth {depth}  {nodes:>10} nodes  {seconds:8.2f} s  '
+          f'{nodes / seconds if seconds else 0:>10.0f} nodes/s  {status}')
+    return nodes == expected
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Perft correctness and throughput')
+    parser.add_argument('positions', nargs='*', default=list(PERFT_POSITIONS))
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--processes', type=int, default=1,
+                        help='size of the divide process pool, 0 for all cores')
+    parser.add_argument('--divide', action='store_true', help='print the leaf count of every root move')
+    arguments = parser.parse_args(argv)
+
+    processes = arguments.processes or None
+    results = [run_position(name, arguments.depth, processes, arguments.divide) for name in arguments.positions]
+    return 0 if all(results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+PGN import throughput: writes random legal games to a PGN file, or reads the given one,
+and replays it through logic/pgn_importer.py.
+
+Run with: python3 -m benchmarks.pgn_import [--games N] [--plies N] [--processes N] [--file games.pgn]
+"""
+import argparse
+import os
+import random
+import tempfile
+from domain.chess_board import ChessBoard
+from domain.fen import STARTING_FEN
+from logic.move_generation.move_generator import STANDARD_SPECIAL_MOVES, generate_legal_moves
+from logic.pgn_importer import import_pgn, move_to_san, write_game
+from logic.special_move_registry import get_special_move_registry
+
+
+def write_random_games(path: str, games: int, plies: int):
+    registry = get_special_move_registry()
+    randomizer = random.Random(1)
+    with open(path, 'w') as pgn_file:
+        for number in range(1, games + 1):
+            chess_board = ChessBoard.from_fen(STARTING_FEN)
+            sans = []
+            for _ in range(plies):
+                moves = generate_legal_moves(chess_board.side_to_move, chess_board, STANDARD_SPECIAL_MOVES)
+                if not moves:
+                    break
+                move = randomizer.choice(moves)
+                sans.append(move_to_san(move, chess_board, moves))
+                special_move = registry.find(move, chess_board)
+                if special_move is not None:
+                    special_move.create_executor(move)(chess_board)
+                else:
+                    chess_board.apply_move(move)
+                chess_board.end_turn()
+            pgn_file.write(write_game(sans, {'Event': f'Random {number}'}))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='PGN import throughput')
+    parser.add_argument('--games', type=int, default=500)
+    parser.add_argument('--plies', type=int, default=80)
+    parser.add_argument('--processes', type=int, default=None, help='pool size, all cores by default')
+    parser.add_argument('--file', help='PGN file to import instead of random games')
+    arguments = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = arguments.file
+        if path is None:
+            path = os.path.join(directory, 'games.pgn')
+            write_random_games(path, arguments.games, arguments.plies)
+        report = import_pgn(path, arguments.processes)
+
+    print(f'{report.games} games, {report.plies} plies in {report.seconds:.2f} s '
+          f'({report.games_per_second:.0f} games/s, {report.plies / report.seconds:.0f} plies/s)')
+    for failure in report.failures[:10]:
+        print(f'game {failure.game_number} ({failure.tags.get("Event", "?")}): '
+              f'ply {failure.ply} {failure.san}: {failure.message}')
+    if len(report.failures) > 10:
+        print(f'... {len(report.failures)} failing games')
+
+
+if __name__ == '__main__':
+    main()
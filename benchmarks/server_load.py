@@ -0,0 +1,77 @@
+"""
+Load client for server/game_server.py: plays many concurrent games on localhost
+and reports move throughput and round-trip latency.
+Starts an in-process server unless --port is given.
+
+Run with: python3 -m benchmarks.server_load [--games N] [--connections N] [--moves N] [--port P]
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+from domain.teams import TeamEnum
+from server.game_client import GameClient
+from server.game_server import GameServer
+
+# Knights out and back, repeatable for as long as needed
+SHUFFLE = [
+    (TeamEnum.WHITES.value, 'g1', 'f3'), (TeamEnum.BLACKS.value, 'g8', 'f6'),
+    (TeamEnum.WHITES.value, 'f3', 'g1'), (TeamEnum.BLACKS.value, 'f6', 'g8'),
+]
+
+
+async def play_game(client: GameClient, moves: int, latencies: List[float], errors: List[str]):
+    game_id = await client.create_game()
+    for team in TeamEnum:
+        await client.join(game_id, team.value, f'player-{game_id}-{team.value}')
+    for index in range(moves):
+        team, cell_from, cell_to = SHUFFLE[index % len(SHUFFLE)]
+        started = time.perf_counter()
+        response = await client.move(game_id, team, cell_from, cell_to)
+        latencies.append(time.perf_counter() - started)
+        if not response['ok']:
+            errors.append(response['error'])
+            return
+    await client.request('close', game_id=game_id)
+
+
+async def run(games: int, connections: int, moves: int, port: int):
+    server = None
+    if not port:
+        server = GameServer()
+        port = (await server.start_tcp()).sockets[0].getsockname()[1]
+    clients = [await GameClient.connect_tcp('127.0.0.1', port) for _ in range(connections)]
+    latencies: List[float] = []
+    errors: List[str] = []
+
+    started = time.perf_counter()
+    await asyncio.gather(*[play_game(clients[index % connections], moves, latencies, errors)
+                           for index in range(games)])
+    seconds = time.perf_counter() - started
+
+    for client in clients:
+        await client.close()
+    if server is not None:
+        await server.close()
+
+    latencies.sort()
+    print(f'{games} games over {connections} connections, {len(latencies)} moves in {seconds:.2f} s '
+          f'({len(latencies) / seconds:.0f} moves/s)')
+    print(f'latency p50 {latencies[len(latencies) // 2] * 1000:.2f} ms  '
+          f'p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms  max {latencies[-1] * 1000:.2f} ms')
+    if errors:
+        print(f'{len(errors)} games stopped on an error, first: {errors[0]}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Game server load client')
+    parser.add_argument('--games', type=int, default=2000)
+    parser.add_argument('--connections', type=int, default=50)
+    parser.add_argument('--moves', type=int, default=8)
+    parser.add_argument('--port', type=int, default=0, help='existing server port, in-process server if 0')
+    arguments = parser.parse_args(argv)
+    asyncio.run(run(arguments.games, arguments.connections, arguments.moves, arguments.port))
+
+
+if __name__ == '__main__':
+    main()
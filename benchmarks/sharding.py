@@ -0,0 +1,42 @@
+"""
+Moves per second of server/sharding.py as the number of worker processes grows.
+Every round submits one move for each game, in one batch per worker.
+
+Run with: python3 -m benchmarks.sharding [--workers 1 2 4] [--games N] [--rounds N] [--pin-cpus]
+"""
+import argparse
+import time
+from domain.move import Move
+from server.sharding import ShardedGames
+from benchmarks.server_load import SHUFFLE
+
+
+def run(workers: int, games: int, rounds: int, pin_cpus: bool):
+    with ShardedGames(workers, pin_cpus) as sharded_games:
+        game_ids = [sharded_games.create_game() for _ in range(games)]
+        moves = [Move(team, cell_from, cell_to, None) for team, cell_from, cell_to in SHUFFLE]
+        errors = 0
+        started = time.perf_counter()
+        for index in range(rounds):
+            move = moves[index % len(moves)]
+            errors += sum(error is not None for error in sharded_games.make_moves(
+                [(game_id, move) for game_id in game_ids]))
+        seconds = time.perf_counter() - started
+    total = games * rounds
+    print(f'{workers:>3} workers  {total} moves  {seconds:7.2f} s  {total / seconds:>9.0f} moves/s'
+          + (f'  ({errors} rejected)' if errors else ''))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Sharded game throughput')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--games', type=int, default=2000)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--pin-cpus', action='store_true')
+    arguments = parser.parse_args(argv)
+    for workers in arguments.workers:
+        run(workers, arguments.games, arguments.rounds, arguments.pin_cpus)
+
+
+if __name__ == '__main__':
+    main()
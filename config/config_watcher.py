@@ -0,0 +1,80 @@
+import os
+import threading
+from typing import Any, Callable, Optional
+
+from config.config_wrapper import DEFAULT_CONFIG_FILENAME, ConfigurationWrapper
+from config.rule_set import RuleSet
+
+
+class ConfigWatcher:
+    """
+    Background thread that polls the config file's mtime and reloads it when it changes.
+    The new RuleSet is built, and compiled by compile_rule_set if given (e.g. with
+    logic.special_move_registry.get_special_move_registry), off the hot path and swapped in
+    with a single assignment.
+    A file that cannot be loaded or compiled (half written, malformed, naming missing functions...)
+    keeps the current rule set, is recorded in last_error and is retried on the next poll
+    """
+
+    filename: str
+    interval: float
+    on_reload: Optional[Callable[[RuleSet], None]]
+    compile_rule_set: Optional[Callable[[RuleSet], Any]]
+    last_mtime: Optional[int]
+    last_error: Optional[Exception]
+
+    def __init__(self, filename: str = DEFAULT_CONFIG_FILENAME, interval: float = 1.0,
+                 on_reload: Optional[Callable[[RuleSet], None]] = None,
+                 compile_rule_set: Optional[Callable[[RuleSet], Any]] = None):
+        self.filename = filename
+        self.interval = interval
+        self.on_reload = on_reload
+        self.compile_rule_set = compile_rule_set
+        self.last_mtime = self._get_mtime()
+        self.last_error = None
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='config-watcher', daemon=True)
+
+    def _get_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.filename).st_mtime_ns
+        except OSError:
+            return None
+
+    def check(self) -> bool:
+        """
+        Reloads the config if the file changed since the last check, returns whether it did
+        """
+        mtime = self._get_mtime()
+        if mtime is None or mtime == self.last_mtime:
+            return False
+        try:
+            rule_set = ConfigurationWrapper.build_rule_set(self.filename)
+            if self.compile_rule_set is not None:
+                self.compile_rule_set(rule_set)
+        except Exception as error:
+            self.last_error = error
+            return False
+        ConfigurationWrapper.rule_set = rule_set
+        self.last_mtime = mtime
+        self.last_error = None
+        if self.on_reload is not None:
+            self.on_reload(rule_set)
+        return True
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.check()
+            except Exception as error:
+                # on_reload failed, the rule set is already swapped in
+                self.last_error = error
+
+    def start(self) -> 'ConfigWatcher':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join()
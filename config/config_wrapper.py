@@ -1,14 +1,20 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+import itertools
 import json
 
-from exception.no_such_config_exception import NoSuchConfigException
+from config.rule_set import RuleSet
 
 DEFAULT_CONFIG_FILENAME = 'config/config.json'
 
 
 class ConfigurationWrapper:
+    """
+    Holds the current RuleSet. Reloading builds a new snapshot and swaps the reference,
+    readers never lock and never see a half loaded config
+    """
 
-    config: Dict = dict()
+    rule_set: Optional[RuleSet] = None
+    _versions = itertools.count(1)
 
     @staticmethod
     def load_config_file(filename: str = DEFAULT_CONFIG_FILENAME) -> Dict:
@@ -20,16 +26,32 @@ class ConfigurationWrapper:
         return config_dict
 
     @staticmethod
-    def reload_config_from_file(filename: str = DEFAULT_CONFIG_FILENAME):
-        ConfigurationWrapper.config = ConfigurationWrapper.load_config_file(
-            filename)
+    def build_rule_set(filename: str = DEFAULT_CONFIG_FILENAME) -> RuleSet:
+        """
+        A new snapshot of the file that is not made current
+        """
+        return RuleSet(
+            ConfigurationWrapper.load_config_file(filename),
+            next(ConfigurationWrapper._versions))
 
     @staticmethod
-    def get_config(config_name: str) -> Any:
-        if not ConfigurationWrapper.config:
-            ConfigurationWrapper.reload_config_from_file()
+    def reload_config_from_file(filename: str = DEFAULT_CONFIG_FILENAME) -> RuleSet:
+        rule_set = ConfigurationWrapper.build_rule_set(filename)
+        ConfigurationWrapper.rule_set = rule_set
+        return rule_set
+
+    @staticmethod
+    def get_rule_set() -> RuleSet:
+        rule_set = ConfigurationWrapper.rule_set
+        if rule_set is None:
+            rule_set = ConfigurationWrapper.reload_config_from_file()
 
-        if not config_name in ConfigurationWrapper.config:
-            raise NoSuchConfigException(f'Config {config_name} does not exist')
+        return rule_set
 
-        return ConfigurationWrapper.config.get(config_name)
+    @staticmethod
+    def get_version() -> int:
+        return ConfigurationWrapper.get_rule_set().version
+
+    @staticmethod
+    def get_config(config_name: str) -> Any:
+        return ConfigurationWrapper.get_rule_set().get_config(config_name)
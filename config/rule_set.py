@@ -0,0 +1,59 @@
+from types import MappingProxyType
+from typing import Any, List, Mapping, Tuple
+
+from exception.no_such_config_exception import NoSuchConfigException
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class RuleSet:
+    """
+    An immutable, versioned snapshot of the configuration.
+    Games hold a reference to the rule set they were created with, so reloading
+    the config swaps in a new snapshot without touching running games.
+    Pickling keeps the config and the version, e.g. to move a game to another process
+    """
+
+    __slots__ = ('version', 'config', 'special_moves', 'enabled_special_moves', '__weakref__')
+
+    version: int
+    config: Mapping[str, Any]
+    special_moves: Tuple[Mapping[str, Any], ...]
+    enabled_special_moves: Tuple[Mapping[str, Any], ...]
+
+    def __init__(self, config: dict, version: int):
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, 'config', _freeze(config))
+        special_moves = self.config.get('special_moves', ())
+        object.__setattr__(self, 'special_moves', special_moves)
+        object.__setattr__(self, 'enabled_special_moves',
+                           tuple(special_move for special_move in special_moves if special_move['enabled'] is True))
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError('RuleSet is immutable')
+
+    def __reduce__(self):
+        return RuleSet, (_thaw(self.config), self.version)
+
+    def get_config(self, config_name: str) -> Any:
+        if not config_name in self.config:
+            raise NoSuchConfigException(f'Config {config_name} does not exist')
+
+        return self.config[config_name]
+
+    def get_enabled_special_move_names(self) -> List[str]:
+        return [special_move['name'] for special_move in self.enabled_special_moves]
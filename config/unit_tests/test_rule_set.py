@@ -0,0 +1,131 @@
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+import unittest
+from config.config_watcher import ConfigWatcher
+from config.config_wrapper import DEFAULT_CONFIG_FILENAME, ConfigurationWrapper
+from config.rule_set import RuleSet
+from domain.game import Game
+from logic.special_move_registry import get_special_move_registry
+
+
+def _config_with(enabled_names: list) -> dict:
+    config = ConfigurationWrapper.load_config_file()
+    for special_move in config['special_moves']:
+        special_move['enabled'] = special_move['name'] in enabled_names
+    return config
+
+
+class TestRuleSet(unittest.TestCase):
+
+    def test_rule_set_is_immutable(self):
+        rule_set = RuleSet(_config_with(['Castle']), 1)
+        with self.assertRaises(AttributeError):
+            rule_set.version = 2
+        with self.assertRaises(TypeError):
+            rule_set.config['special_moves'] = []
+        with self.assertRaises(TypeError):
+            rule_set.special_moves[0]['enabled'] = False
+
+    def test_enabled_special_moves(self):
+        rule_set = RuleSet(_config_with(['Castle', 'En Passant']), 1)
+        self.assertEqual(['Castle', 'En Passant'], rule_set.get_enabled_special_move_names())
+
+    def test_pickle_keeps_config_and_version(self):
+        rule_set = pickle.loads(pickle.dumps(RuleSet(_config_with(['Castle']), 7)))
+        self.assertEqual(7, rule_set.version)
+        self.assertEqual(['Castle'], rule_set.get_enabled_special_move_names())
+        with self.assertRaises(TypeError):
+            rule_set.config['special_moves'] = []
+
+    def test_games_keep_their_rule_set(self):
+        castle_only = RuleSet(_config_with(['Castle']), 1)
+        game = Game(castle_only)
+        default_game = Game()
+        self.assertEqual(['Castle'], [special_move.name for special_move in game.get_special_moves()])
+        self.assertIn('En Passant', [special_move.name for special_move in default_game.get_special_moves()])
+        ConfigurationWrapper.reload_config_from_file()
+        self.assertIs(castle_only, game.rule_set)
+
+
+class TestConfigWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'config.json')
+        shutil.copy(DEFAULT_CONFIG_FILENAME, self.filename)
+
+    def tearDown(self):
+        ConfigurationWrapper.reload_config_from_file()
+        shutil.rmtree(self.directory)
+
+    def _write_config(self, content: str, mtime_offset: int):
+        with open(self.filename, 'w') as config_file:
+            config_file.write(content)
+        stat = os.stat(self.filename)
+        os.utime(self.filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + mtime_offset))
+
+    def test_check_reloads_on_mtime_change(self):
+        watcher = ConfigWatcher(self.filename, compile_rule_set=get_special_move_registry)
+        self.assertFalse(watcher.check())
+        rule_set_before = ConfigurationWrapper.get_rule_set()
+
+        self._write_config(json.dumps(_config_with(['Castle'])), 1_000_000_000)
+        self.assertTrue(watcher.check())
+        self.assertGreater(ConfigurationWrapper.get_version(), rule_set_before.version)
+        self.assertEqual(['Castle'], ConfigurationWrapper.get_rule_set().get_enabled_special_move_names())
+
+    def test_invalid_file_keeps_current_rule_set(self):
+        watcher = ConfigWatcher(self.filename, compile_rule_set=get_special_move_registry)
+        rule_set_before = ConfigurationWrapper.get_rule_set()
+        self._write_config('{"special_moves": [', 1_000_000_000)
+        self.assertFalse(watcher.check())
+        self.assertIsNotNone(watcher.last_error)
+        self.assertIs(rule_set_before, ConfigurationWrapper.get_rule_set())
+
+    def test_rule_set_that_cannot_be_built_keeps_current_rule_set(self):
+        watcher = ConfigWatcher(self.filename, compile_rule_set=get_special_move_registry)
+        rule_set_before = ConfigurationWrapper.get_rule_set()
+        config = ConfigurationWrapper.load_config_file()
+        del config['special_moves'][0]['enabled']
+        broken_configs = [json.dumps(config), '[]', json.dumps(_config_with(['Siberian Swipe']))]
+        for offset, content in enumerate(broken_configs, start=1):
+            with self.subTest(content=content[:40]):
+                self._write_config(content, offset * 1_000_000_000)
+                self.assertFalse(watcher.check())
+                self.assertIsNotNone(watcher.last_error)
+                self.assertIs(rule_set_before, ConfigurationWrapper.get_rule_set())
+
+    def test_background_thread_survives_broken_config(self):
+        reloaded = []
+        watcher = ConfigWatcher(self.filename, interval=0.01, on_reload=reloaded.append,
+                                compile_rule_set=get_special_move_registry).start()
+        try:
+            self._write_config('[]', 1_000_000_000)
+            deadline = time.monotonic() + 5
+            while watcher.last_error is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self._write_config(json.dumps(_config_with(['Castle'])), 2_000_000_000)
+            while not reloaded and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            watcher.stop()
+        self.assertEqual(1, len(reloaded))
+        self.assertIsNone(watcher.last_error)
+
+    def test_background_thread_swaps_rule_set(self):
+        reloaded = []
+        watcher = ConfigWatcher(self.filename, interval=0.01, on_reload=reloaded.append,
+                                compile_rule_set=get_special_move_registry).start()
+        try:
+            self._write_config(json.dumps(_config_with(['En Passant'])), 1_000_000_000)
+            deadline = time.monotonic() + 5
+            while not reloaded and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            watcher.stop()
+        self.assertEqual(1, len(reloaded))
+        self.assertIs(reloaded[0], ConfigurationWrapper.get_rule_set())
@@ -0,0 +1,87 @@
+from typing import List, Tuple
+from domain.attack_tables import DIAGONAL_DIRECTIONS, KING_ATTACKS, KNIGHT_ATTACKS, ORTHOGONAL_DIRECTIONS, \
+    POSITIVE_DIRECTIONS, RAYS, iterate_bits
+from domain.bitboards import BISHOP, KING, KNIGHT, OPPONENTS, PAWN, PIECE_KEYS, QUEEN, ROOK, Bitboards
+from domain.squares import BOARD_SIZE
+from domain.teams import TeamEnum
+
+_WHITES = TeamEnum.WHITES.value
+_ALL_SQUARES = (1 << BOARD_SIZE) - 1
+_NOT_FILE_A = _ALL_SQUARES & ~sum(1 << square for square in range(0, BOARD_SIZE, 8))
+_NOT_FILE_H = _ALL_SQUARES & ~sum(1 << square for square in range(7, BOARD_SIZE, 8))
+# (rays of the direction, whether square ids grow along it)
+_DIAGONAL_SLIDES: List[Tuple[List[int], bool]] = [
+    (RAYS[direction], direction in POSITIVE_DIRECTIONS) for direction in DIAGONAL_DIRECTIONS]
+_ORTHOGONAL_SLIDES: List[Tuple[List[int], bool]] = [
+    (RAYS[direction], direction in POSITIVE_DIRECTIONS) for direction in ORTHOGONAL_DIRECTIONS]
+
+
+def _slider_attacks(sliders: int, slides: List[Tuple[List[int], bool]], occupied: int, piece_attacks: List[int]):
+    """
+    Appends the attacks of each slider, ray_attacks inlined over the directions
+    """
+    for square in iterate_bits(sliders):
+        attacks = 0
+        for rays, is_positive in slides:
+            ray = rays[square]
+            blockers = ray & occupied
+            if blockers:
+                ray ^= rays[(blockers & -blockers).bit_length() - 1 if is_positive else blockers.bit_length() - 1]
+            attacks |= ray
+        piece_attacks.append(attacks)
+
+
+class AttackMap:
+    """
+    Every square one team attacks in a position, from one pass over its pieces.
+    As in Bitboards.is_attacked the defending king does not block rays.
+    The attacked squares are computed up front, the per square attacker counts on first use.
+    ChessBoard.get_attack_map caches one per team until the next write to the board
+    """
+
+    __slots__ = ('attacking_team', 'attacked', '_piece_attacks', '_counts')
+
+    attacking_team: str
+    attacked: int
+
+    def __init__(self, bitboards: Bitboards, attacking_team: str):
+        self.attacking_team = attacking_team
+        keys = PIECE_KEYS[attacking_team]
+        pieces = bitboards.pieces
+        occupied = bitboards.occupied & ~pieces[PIECE_KEYS[OPPONENTS[attacking_team]][KING]]
+        pawns = pieces[keys[PAWN]]
+
+        # Bitboards that each add one attacker to their squares: the pawns' captures to either side
+        # (no square is reached by two pawns capturing the same way), then one per piece
+        if attacking_team == _WHITES:
+            piece_attacks = [(pawns & _NOT_FILE_A) << 7 & _ALL_SQUARES, (pawns & _NOT_FILE_H) << 9 & _ALL_SQUARES]
+        else:
+            piece_attacks = [(pawns & _NOT_FILE_A) >> 9, (pawns & _NOT_FILE_H) >> 7]
+        piece_attacks += [KNIGHT_ATTACKS[square] for square in iterate_bits(pieces[keys[KNIGHT]])]
+        piece_attacks += [KING_ATTACKS[square] for square in iterate_bits(pieces[keys[KING]])]
+        _slider_attacks(pieces[keys[BISHOP]] | pieces[keys[QUEEN]], _DIAGONAL_SLIDES, occupied, piece_attacks)
+        _slider_attacks(pieces[keys[ROOK]] | pieces[keys[QUEEN]], _ORTHOGONAL_SLIDES, occupied, piece_attacks)
+        attacked = 0
+        for attacks in piece_attacks:
+            attacked |= attacks
+        self.attacked = attacked
+        self._piece_attacks = piece_attacks
+        self._counts = None
+
+    def is_attacked(self, square: int) -> bool:
+        return bool(self.attacked >> square & 1)
+
+    def get_counts(self) -> List[int]:
+        """
+        Number of attackers of every square, a queen counts once
+        """
+        if self._counts is None:
+            counts = [0] * BOARD_SIZE
+            for attacks in self._piece_attacks:
+                for square in iterate_bits(attacks):
+                    counts[square] += 1
+            self._counts = counts
+        return self._counts
+
+    def get_attacker_count(self, square: int) -> int:
+        return self.get_counts()[square]
@@ -0,0 +1,145 @@
+from typing import Dict, List
+
+from domain.squares import BOARD_SIZE, col_of, row_of, square_of
+from domain.teams import TeamEnum
+
+"""
+Precomputed attack masks, one 64-bit int per square (bit n = square n)
+"""
+
+NORTH = 0
+SOUTH = 1
+EAST = 2
+WEST = 3
+NORTH_EAST = 4
+NORTH_WEST = 5
+SOUTH_EAST = 6
+SOUTH_WEST = 7
+
+DIRECTION_STEPS = [(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (-1, 1), (1, -1), (-1, -1)]
+ORTHOGONAL_DIRECTIONS = [NORTH, SOUTH, EAST, WEST]
+DIAGONAL_DIRECTIONS = [NORTH_EAST, NORTH_WEST, SOUTH_EAST, SOUTH_WEST]
+# Directions whose square ids grow along the ray, the nearest blocker is the lowest bit
+POSITIVE_DIRECTIONS = {NORTH, EAST, NORTH_EAST, NORTH_WEST}
+
+KNIGHT_STEPS = [(2, -1), (2, 1), (-2, -1), (-2, 1), (1, -2), (1, 2), (-1, -2), (-1, 2)]
+KING_STEPS = DIRECTION_STEPS
+
+
+def _steps_mask(square: int, steps: list) -> int:
+    mask = 0
+    for col_step, row_step in steps:
+        col = col_of(square) + col_step
+        row = row_of(square) + row_step
+        if 0 <= col < 8 and 0 <= row < 8:
+            mask |= 1 << square_of(col, row)
+    return mask
+
+
+def _ray_squares(square: int, direction: int) -> List[int]:
+    col_step, row_step = DIRECTION_STEPS[direction]
+    squares = []
+    col = col_of(square) + col_step
+    row = row_of(square) + row_step
+    while 0 <= col < 8 and 0 <= row < 8:
+        squares.append(square_of(col, row))
+        col += col_step
+        row += row_step
+    return squares
+
+
+def _mask_of(squares: List[int]) -> int:
+    mask = 0
+    for square in squares:
+        mask |= 1 << square
+    return mask
+
+
+KNIGHT_ATTACKS: List[int] = [_steps_mask(square, KNIGHT_STEPS) for square in range(BOARD_SIZE)]
+KING_ATTACKS: List[int] = [_steps_mask(square, KING_STEPS) for square in range(BOARD_SIZE)]
+
+# Squares attacked by a pawn of the given team standing on the square
+PAWN_ATTACKS: Dict[str, List[int]] = {
+    TeamEnum.WHITES.value: [_steps_mask(square, [(-1, 1), (1, 1)]) for square in range(BOARD_SIZE)],
+    TeamEnum.BLACKS.value: [_steps_mask(square, [(-1, -1), (1, -1)]) for square in range(BOARD_SIZE)],
+}
+
+# RAY_SQUARES[direction][square]: squares from the square outwards, nearest first
+RAY_SQUARES: List[List[List[int]]] = [
+    [_ray_squares(square, direction) for square in range(BOARD_SIZE)]
+    for direction in range(len(DIRECTION_STEPS))
+]
+RAYS: List[List[int]] = [
+    [_mask_of(squares) for squares in direction_squares]
+    for direction_squares in RAY_SQUARES
+]
+
+ORTHOGONAL_RAYS: List[int] = [
+    RAYS[NORTH][square] | RAYS[SOUTH][square] | RAYS[EAST][square] | RAYS[WEST][square]
+    for square in range(BOARD_SIZE)
+]
+DIAGONAL_RAYS: List[int] = [
+    RAYS[NORTH_EAST][square] | RAYS[NORTH_WEST][square]
+    | RAYS[SOUTH_EAST][square] | RAYS[SOUTH_WEST][square]
+    for square in range(BOARD_SIZE)
+]
+
+
+def ray_attacks(square: int, direction: int, occupied: int) -> int:
+    """
+    Squares reached from the square along the direction, up to and including the first blocker
+    """
+    ray = RAYS[direction][square]
+    blockers = ray & occupied
+    if blockers:
+        if direction in POSITIVE_DIRECTIONS:
+            first_blocker = (blockers & -blockers).bit_length() - 1
+        else:
+            first_blocker = blockers.bit_length() - 1
+        ray ^= RAYS[direction][first_blocker]
+    return ray
+
+
+def orthogonal_attacks(square: int, occupied: int) -> int:
+    return ray_attacks(square, NORTH, occupied) | ray_attacks(square, SOUTH, occupied) \
+        | ray_attacks(square, EAST, occupied) | ray_attacks(square, WEST, occupied)
+
+
+def diagonal_attacks(square: int, occupied: int) -> int:
+    return ray_attacks(square, NORTH_EAST, occupied) | ray_attacks(square, NORTH_WEST, occupied) \
+        | ray_attacks(square, SOUTH_EAST, occupied) | ray_attacks(square, SOUTH_WEST, occupied)
+
+
+def iterate_bits(bitboard: int):
+    while bitboard:
+        lowest_bit = bitboard & -bitboard
+        yield lowest_bit.bit_length() - 1
+        bitboard ^= lowest_bit
+
+
+def _between_masks(square: int) -> List[int]:
+    masks = [0] * BOARD_SIZE
+    for direction in range(len(DIRECTION_STEPS)):
+        between = 0
+        for ray_square in RAY_SQUARES[direction][square]:
+            masks[ray_square] = between
+            between |= 1 << ray_square
+    return masks
+
+
+# BETWEEN[a][b]: squares strictly between two squares on a shared line, 0 if they are not aligned
+BETWEEN: List[List[int]] = [_between_masks(square) for square in range(BOARD_SIZE)]
+
+NO_DIRECTION = -1
+
+
+def _directions_to(square: int) -> List[int]:
+    directions = [NO_DIRECTION] * BOARD_SIZE
+    for direction in range(len(DIRECTION_STEPS)):
+        for ray_square in RAY_SQUARES[direction][square]:
+            directions[ray_square] = direction
+    return directions
+
+
+# DIRECTION_TO[a][b]: the direction going from a to b, NO_DIRECTION if they are not on a shared line
+DIRECTION_TO: List[List[int]] = [_directions_to(square) for square in range(BOARD_SIZE)]
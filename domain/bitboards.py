@@ -0,0 +1,104 @@
+from typing import Dict, List
+
+from domain.attack_tables import DIAGONAL_RAYS, KING_ATTACKS, KNIGHT_ATTACKS, ORTHOGONAL_RAYS, \
+    PAWN_ATTACKS, diagonal_attacks, orthogonal_attacks
+from domain.teams import TeamEnum
+
+PAWN = 0
+KNIGHT = 1
+BISHOP = 2
+ROOK = 3
+QUEEN = 4
+KING = 5
+
+PIECE_KEYS: Dict[str, str] = {team.value: team.get_piece_keys() for team in TeamEnum}
+OPPONENTS: Dict[str, str] = {team.value: team.get_opponent().value for team in TeamEnum}
+
+_WHITES = TeamEnum.WHITES.value
+_BLACKS = TeamEnum.BLACKS.value
+
+
+class Bitboards:
+    """
+    One 64-bit int per piece key and per team, kept in sync by ChessBoard.set_square
+    """
+
+    pieces: Dict[str, int]
+    occupancy: Dict[str, int]
+    occupied: int
+
+    def __init__(self, squares: List[str]):
+        self.pieces = {piece: 0 for piece in PIECE_KEYS[TeamEnum.WHITES.value] + PIECE_KEYS[TeamEnum.BLACKS.value]}
+        self.occupancy = {team.value: 0 for team in TeamEnum}
+        self.occupied = 0
+        for square, piece in enumerate(squares):
+            if piece != '.':
+                self.place(square, piece)
+
+    def copy(self) -> 'Bitboards':
+        copied = Bitboards.__new__(Bitboards)
+        copied.pieces = dict(self.pieces)
+        copied.occupancy = dict(self.occupancy)
+        copied.occupied = self.occupied
+        return copied
+
+    def place(self, square: int, piece: str):
+        bit = 1 << square
+        self.pieces[piece] |= bit
+        team = _WHITES if piece.isupper() else _BLACKS
+        self.occupancy[team] |= bit
+        self.occupied |= bit
+
+    def remove(self, square: int, piece: str):
+        mask = ~(1 << square)
+        self.pieces[piece] &= mask
+        team = _WHITES if piece.isupper() else _BLACKS
+        self.occupancy[team] &= mask
+        self.occupied &= mask
+
+    def get_piece_bitboard(self, team: str, piece_type: int) -> int:
+        return self.pieces[PIECE_KEYS[team][piece_type]]
+
+    def _slider_occupancy(self, attacking_team: str) -> int:
+        """
+        The defending king does not block rays, so squares it steps back into along a ray stay attacked
+        """
+        return self.occupied & ~self.pieces[PIECE_KEYS[OPPONENTS[attacking_team]][KING]]
+
+    def pawn_attackers(self, square: int, attacking_team: str) -> int:
+        return PAWN_ATTACKS[OPPONENTS[attacking_team]][square] & self.pieces[PIECE_KEYS[attacking_team][PAWN]]
+
+    def knight_attackers(self, square: int, attacking_team: str) -> int:
+        return KNIGHT_ATTACKS[square] & self.pieces[PIECE_KEYS[attacking_team][KNIGHT]]
+
+    def king_attackers(self, square: int, attacking_team: str) -> int:
+        return KING_ATTACKS[square] & self.pieces[PIECE_KEYS[attacking_team][KING]]
+
+    def diagonal_attackers(self, square: int, attacking_team: str) -> int:
+        keys = PIECE_KEYS[attacking_team]
+        sliders = self.pieces[keys[BISHOP]] | self.pieces[keys[QUEEN]]
+        if not DIAGONAL_RAYS[square] & sliders:
+            return 0
+        return diagonal_attacks(square, self._slider_occupancy(attacking_team)) & sliders
+
+    def orthogonal_attackers(self, square: int, attacking_team: str) -> int:
+        keys = PIECE_KEYS[attacking_team]
+        sliders = self.pieces[keys[ROOK]] | self.pieces[keys[QUEEN]]
+        if not ORTHOGONAL_RAYS[square] & sliders:
+            return 0
+        return orthogonal_attacks(square, self._slider_occupancy(attacking_team)) & sliders
+
+    def attackers_to(self, square: int, attacking_team: str) -> int:
+        return self.pawn_attackers(square, attacking_team) \
+            | self.knight_attackers(square, attacking_team) \
+            | self.king_attackers(square, attacking_team) \
+            | self.diagonal_attackers(square, attacking_team) \
+            | self.orthogonal_attackers(square, attacking_team)
+
+    def is_attacked(self, square: int, attacking_team: str) -> bool:
+        return bool(
+            self.pawn_attackers(square, attacking_team)
+            or self.knight_attackers(square, attacking_team)
+            or self.king_attackers(square, attacking_team)
+            or self.diagonal_attackers(square, attacking_team)
+            or self.orthogonal_attackers(square, attacking_team))
@@ -0,0 +1,54 @@
+from typing import Dict, List
+
+from domain.squares import BOARD_SIZE, to_square
+from domain.teams import TeamEnum
+
+"""
+Castling rights as a 4 bit field
+"""
+
+WHITE_KINGSIDE = 1
+WHITE_QUEENSIDE = 2
+BLACK_KINGSIDE = 4
+BLACK_QUEENSIDE = 8
+ALL_CASTLING_RIGHTS = WHITE_KINGSIDE | WHITE_QUEENSIDE | BLACK_KINGSIDE | BLACK_QUEENSIDE
+NO_CASTLING_RIGHTS = 0
+
+TEAM_CASTLING_RIGHTS: Dict[str, int] = {
+    TeamEnum.WHITES.value: WHITE_KINGSIDE | WHITE_QUEENSIDE,
+    TeamEnum.BLACKS.value: BLACK_KINGSIDE | BLACK_QUEENSIDE,
+}
+
+# Right kept by the rook standing on each starting rook square
+ROOK_CASTLING_RIGHTS: Dict[int, int] = {
+    to_square(tuple(['h', 1])): WHITE_KINGSIDE,
+    to_square(tuple(['a', 1])): WHITE_QUEENSIDE,
+    to_square(tuple(['h', 8])): BLACK_KINGSIDE,
+    to_square(tuple(['a', 8])): BLACK_QUEENSIDE,
+}
+
+
+def _rights_lost_from(square: int) -> int:
+    for team in TeamEnum:
+        if square == to_square(team.get_starting_king_cell()):
+            return TEAM_CASTLING_RIGHTS[team.value]
+    return ROOK_CASTLING_RIGHTS.get(square, NO_CASTLING_RIGHTS)
+
+
+# CASTLING_RIGHTS_KEPT[square]: rights left after a piece moves from or to the square
+CASTLING_RIGHTS_KEPT: List[int] = [
+    ALL_CASTLING_RIGHTS & ~_rights_lost_from(square) for square in range(BOARD_SIZE)
+]
+
+
+def infer_castling_rights(squares: List[str]) -> int:
+    """
+    Rights implied by kings and rooks standing on their starting squares
+    """
+    rights = NO_CASTLING_RIGHTS
+    for rook_square, right in ROOK_CASTLING_RIGHTS.items():
+        team = TeamEnum.WHITES if right & TEAM_CASTLING_RIGHTS[TeamEnum.WHITES.value] else TeamEnum.BLACKS
+        king_square = to_square(team.get_starting_king_cell())
+        if squares[king_square] == team.get_king_key() and squares[rook_square] == team.get_piece_keys()[3]:
+            rights |= right
+    return rights
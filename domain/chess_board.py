@@ -1,9 +1,21 @@
-from typing import List, Tuple
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+from domain.attack_map import AttackMap
+from domain.bitboards import KING, PIECE_KEYS, Bitboards
+from domain.castling_rights import CASTLING_RIGHTS_KEPT, infer_castling_rights
+from domain.fen import format_fen, parse_fen
 from domain.move import Move
+from domain.squares import BOARD_SIZE, CELL_SQUARES, col_of, row_of, to_square
+from domain.teams import TeamEnum
+from domain.zobrist import BLACKS_TO_MOVE_KEY, CASTLING_KEYS, EN_PASSANT_FILE_KEYS, PIECE_SQUARE_KEYS
 
 from exception.illegal_move_exception import IllegalMoveException
+from exception.no_king_exception import NoKingException
 
 BOARD_LENGHT = 8
+WHITES = TeamEnum.WHITES.value
+BLACKS = TeamEnum.BLACKS.value
 DEFAULT_CHESS_BOARD = \
     "R N B Q K B N R;" + \
     "P P P P P P P P;" + \
@@ -13,65 +25,352 @@ DEFAULT_CHESS_BOARD = \
     ". . . . . . . .;" + \
     "p p p p p p p p;" + \
     "r n b q k b n r"
+TEMPLATE_CACHE_SIZE = 128
+LIGHT_SQUARES = sum(1 << square for square in range(BOARD_SIZE) if (col_of(square) + row_of(square)) % 2)
+# Pieces that can always force mate with their king, whatever else is on the board
+MATING_MATERIAL = 'PRQprq'
 
 
 class ChessBoard:
     """
-    A chess board
+    A chess board, stored as a flat list of 64 squares (a1 = 0, h8 = 63).
+    The integer square API (get_square/set_square) is the fast path,
+    the (col, row) cell API is kept on top of it.
+    Every write goes through set_square, which keeps the bitboards, the
+    per-team piece lists, the piece counts and the Zobrist hash in sync, and drops the cached attack maps.
+    Besides the pieces the board holds the side to move, the castling rights
+    and the en passant square, which are part of the hash, and the halfmove
+    clock and fullmove number. Moves update them as they are applied, so rule
+    checks never need the move history.
+    While an undo frame is open every write is logged, so make_move/unmake_move
+    and probe() restore the position exactly without copying the board
     """
 
-    board: List[List[str]]
+    squares: List[str]
+    bitboards: Bitboards
+    team_squares: Dict[str, Set[int]]
+    piece_counts: Dict[str, int]
+    side_to_move: str
+    castling_rights: int
+    en_passant_square: Optional[int]
+    zobrist_hash: int
+    halfmove_clock: int
+    fullmove_number: int
+    _is_irreversible_move: bool
+    undo_log: List[Tuple[int, str]]
+    undo_frames: List[Tuple[int, tuple]]
+    _attack_maps: Optional[Dict[str, AttackMap]]
 
-    def __init__(self, board = DEFAULT_CHESS_BOARD):
+    def __init__(self, board = DEFAULT_CHESS_BOARD, side_to_move: str = WHITES):
         rows = board.split(';')
-        self.board = [[cell.strip() for cell in row.split(' ')]
-                      for row in rows]
+        squares = [cell.strip() for row in rows for cell in row.split(' ')]
+        if len(squares) != BOARD_SIZE:
+            raise IllegalMoveException(f'Invalid board: {board}')
+        self._init_from_squares(squares, side_to_move)
 
-    def _convert_row_to_index(self, row: int) -> int:
-        index = row - 1
-        if index >= BOARD_LENGHT or index < 0:
-            raise IllegalMoveException(f'Invalid row: {row}')
-        return index
+    @classmethod
+    def from_squares(cls, squares: List[str], side_to_move: str = WHITES, castling_rights: Optional[int] = None,
+                     en_passant_square: Optional[int] = None, halfmove_clock: int = 0,
+                     fullmove_number: int = 1) -> 'ChessBoard':
+        """
+        Builds a board from its 64 squares and state without parsing a board string.
+        Castling rights are inferred from the pieces when not given
+        """
+        chess_board = cls.__new__(cls)
+        chess_board._init_from_squares(list(squares), side_to_move, castling_rights, en_passant_square,
+                                       halfmove_clock, fullmove_number)
+        return chess_board
 
-    def _convert_col_to_index(self, col: str) -> int:
-        index = ord(col.upper()) - 65
-        if index >= BOARD_LENGHT or index < 0:
-            raise IllegalMoveException(f'Invalid column: {col}')
-        return index
+    @classmethod
+    def from_fen(cls, fen: str) -> 'ChessBoard':
+        """
+        Parsed positions are kept as templates, so a FEN seen before only costs a copy
+        """
+        return _get_template(fen).copy()
 
-    def is_in_bounds(self, cell: Tuple[str, int]) -> bool:
-        try:
-            self._convert_row_to_index(cell[1])
-            self._convert_col_to_index(cell[0])
+    def to_fen(self) -> str:
+        return format_fen(self.squares, self.side_to_move, self.castling_rights, self.en_passant_square,
+                          self.halfmove_clock, self.fullmove_number)
+
+    def copy(self) -> 'ChessBoard':
+        """
+        An independent board in the same position, without the undo history
+        """
+        chess_board = ChessBoard.__new__(ChessBoard)
+        chess_board.squares = list(self.squares)
+        chess_board.bitboards = self.bitboards.copy()
+        chess_board.team_squares = {team: set(squares) for team, squares in self.team_squares.items()}
+        chess_board.piece_counts = dict(self.piece_counts)
+        chess_board._restore_state(self.get_state())
+        chess_board.undo_log = []
+        chess_board.undo_frames = []
+        chess_board._attack_maps = None
+        return chess_board
+
+    def _init_from_squares(self, squares: List[str], side_to_move: str, castling_rights: Optional[int] = None,
+                           en_passant_square: Optional[int] = None, halfmove_clock: int = 0,
+                           fullmove_number: int = 1):
+        self.squares = squares
+        self.bitboards = Bitboards(squares)
+        self.team_squares = {WHITES: set(), BLACKS: set()}
+        self.piece_counts = {piece: 0 for piece in PIECE_KEYS[WHITES] + PIECE_KEYS[BLACKS]}
+        for square, piece in enumerate(squares):
+            if piece != '.':
+                self.team_squares[WHITES if piece.isupper() else BLACKS].add(square)
+                self.piece_counts[piece] += 1
+        self.side_to_move = side_to_move
+        self.castling_rights = infer_castling_rights(squares) if castling_rights is None else castling_rights
+        self.en_passant_square = en_passant_square
+        self.zobrist_hash = self.compute_zobrist_hash()
+        self.halfmove_clock = halfmove_clock
+        self.fullmove_number = fullmove_number
+        self._is_irreversible_move = False
+        self.undo_log = []
+        self.undo_frames = []
+        self._attack_maps = None
+
+    def get_square(self, square: int) -> str:
+        return self.squares[square]
+
+    def set_square(self, square: int, piece: str):
+        if self.undo_frames:
+            self.undo_log.append((square, self.squares[square]))
+        self._write_square(square, piece)
+
+    def _write_square(self, square: int, piece: str):
+        self._attack_maps = None
+        previous_piece = self.squares[square]
+        if previous_piece != '.':
+            self.bitboards.remove(square, previous_piece)
+            self.team_squares[WHITES if previous_piece.isupper() else BLACKS].discard(square)
+            self.piece_counts[previous_piece] -= 1
+            self.zobrist_hash ^= PIECE_SQUARE_KEYS[previous_piece][square]
+        if piece != '.':
+            self.bitboards.place(square, piece)
+            self.team_squares[WHITES if piece.isupper() else BLACKS].add(square)
+            self.piece_counts[piece] += 1
+            self.zobrist_hash ^= PIECE_SQUARE_KEYS[piece][square]
+        self.squares[square] = piece
+
+    def has_insufficient_material(self) -> bool:
+        """
+        Whether neither team can ever mate: bare kings, a single knight or bishop,
+        or only bishops that all stand on squares of the same colour.
+        Reads the piece counts, so it does not look at the squares
+        """
+        piece_counts = self.piece_counts
+        for piece in MATING_MATERIAL:
+            if piece_counts[piece]:
+                return False
+        knights = piece_counts['N'] + piece_counts['n']
+        bishops = piece_counts['B'] + piece_counts['b']
+        if knights + bishops <= 1:
             return True
-        except IllegalMoveException:
+        if knights:
             return False
+        pieces = self.bitboards.pieces
+        bishop_squares = pieces['B'] | pieces['b']
+        return not bishop_squares & LIGHT_SQUARES or not bishop_squares & ~LIGHT_SQUARES
+
+    def switch_side_to_move(self):
+        self.side_to_move = BLACKS if self.side_to_move == WHITES else WHITES
+        self.zobrist_hash ^= BLACKS_TO_MOVE_KEY
+
+    def end_turn(self):
+        """
+        Called once after all the steps of a move: updates the clocks and passes the turn.
+        The halfmove clock is reset if any step moved a pawn or captured a piece
+        """
+        if self._is_irreversible_move:
+            self.halfmove_clock = 0
+            self._is_irreversible_move = False
+        else:
+            self.halfmove_clock += 1
+        if self.side_to_move == BLACKS:
+            self.fullmove_number += 1
+        self.switch_side_to_move()
+
+    def get_ply(self) -> int:
+        """
+        Moves (not steps) played since the starting position, by the fullmove number and side to move
+        """
+        return 2 * (self.fullmove_number - 1) + (1 if self.side_to_move == BLACKS else 0)
+
+    def set_castling_rights(self, castling_rights: int):
+        self.zobrist_hash ^= CASTLING_KEYS[self.castling_rights] ^ CASTLING_KEYS[castling_rights]
+        self.castling_rights = castling_rights
+
+    def set_en_passant_square(self, en_passant_square: Optional[int]):
+        if self.en_passant_square is not None:
+            self.zobrist_hash ^= EN_PASSANT_FILE_KEYS[col_of(self.en_passant_square)]
+        if en_passant_square is not None:
+            self.zobrist_hash ^= EN_PASSANT_FILE_KEYS[col_of(en_passant_square)]
+        self.en_passant_square = en_passant_square
+
+    def compute_zobrist_hash(self) -> int:
+        """
+        Hash of the whole position computed from scratch, zobrist_hash is kept equal to it incrementally
+        """
+        zobrist_hash = CASTLING_KEYS[self.castling_rights]
+        for square, piece in enumerate(self.squares):
+            if piece != '.':
+                zobrist_hash ^= PIECE_SQUARE_KEYS[piece][square]
+        if self.side_to_move == BLACKS:
+            zobrist_hash ^= BLACKS_TO_MOVE_KEY
+        if self.en_passant_square is not None:
+            zobrist_hash ^= EN_PASSANT_FILE_KEYS[col_of(self.en_passant_square)]
+        return zobrist_hash
+
+    def get_state(self) -> tuple:
+        """
+        Everything besides the pieces that describes the position
+        """
+        return (
+            self.side_to_move,
+            self.castling_rights,
+            self.en_passant_square,
+            self.halfmove_clock,
+            self.fullmove_number,
+            self._is_irreversible_move,
+            self.zobrist_hash
+        )
+
+    def _restore_state(self, state: tuple):
+        self.side_to_move, self.castling_rights, self.en_passant_square, self.halfmove_clock, \
+            self.fullmove_number, self._is_irreversible_move, self.zobrist_hash = state
+
+    def push_undo_frame(self):
+        self.undo_frames.append((len(self.undo_log), self.get_state()))
+
+    def pop_undo_frame(self):
+        """
+        Restores every square written and the state changed since the matching push_undo_frame
+        """
+        frame_start, state = self.undo_frames.pop()
+        undo_log = self.undo_log
+        while len(undo_log) > frame_start:
+            square, piece = undo_log.pop()
+            self._write_square(square, piece)
+        self._restore_state(state)
+
+    def make_move(self, move: Move) -> str:
+        """
+        Applies the move so that it can be reverted with unmake_move.
+        Returns the piece at the destination
+        """
+        self.push_undo_frame()
+        return self.apply_move(move)
+
+    def make_steps(self, execute_function: Callable[['ChessBoard'], List[Move]]) -> List[Move]:
+        """
+        Runs a special move executor so that it can be reverted with unmake_move
+        """
+        self.push_undo_frame()
+        return execute_function(self)
+
+    def unmake_move(self):
+        self.pop_undo_frame()
+
+    @contextmanager
+    def probe(self) -> Iterator['ChessBoard']:
+        """
+        Everything applied inside the with block is reverted when it exits
+        """
+        self.push_undo_frame()
+        try:
+            yield self
+        finally:
+            self.pop_undo_frame()
+
+    def get_attack_map(self, attacking_team: str) -> AttackMap:
+        """
+        The squares the team attacks, computed once per position and kept until the board is written
+        """
+        attack_maps = self._attack_maps
+        if attack_maps is None:
+            attack_maps = self._attack_maps = dict()
+        attack_map = attack_maps.get(attacking_team)
+        if attack_map is None:
+            attack_map = attack_maps[attacking_team] = AttackMap(self.bitboards, attacking_team)
+        return attack_map
+
+    def get_team_squares(self, team: str) -> Set[int]:
+        """
+        Squares holding the team's pieces, the returned set must not be modified
+        """
+        return self.team_squares[team]
+
+    def get_king_square(self, team: str) -> int:
+        """
+        If the team has more than one king, the lowest square is returned
+        """
+        kings = self.bitboards.pieces[PIECE_KEYS[team][KING]]
+        if not kings:
+            raise NoKingException(f'There is no {team} king on the board')
+        return (kings & -kings).bit_length() - 1
+
+    def move_square(self, square_from: int, square_to: int) -> str:
+        """
+        Moves the piece between two squares and returns the piece at the destination
+        """
+        squares = self.squares
+        moved_piece = squares[square_from]
+        destination_piece = squares[square_to]
+        self.set_square(square_to, moved_piece)
+        self.set_square(square_from, '.')
+
+        if destination_piece != '.' or moved_piece == 'P' or moved_piece == 'p':
+            self._is_irreversible_move = True
+        castling_rights = self.castling_rights & CASTLING_RIGHTS_KEPT[square_from] & CASTLING_RIGHTS_KEPT[square_to]
+        if castling_rights != self.castling_rights:
+            self.set_castling_rights(castling_rights)
+        if (moved_piece == 'P' or moved_piece == 'p') and abs(square_to - square_from) == 16:
+            self.set_en_passant_square((square_from + square_to) // 2)
+        elif self.en_passant_square is not None:
+            self.set_en_passant_square(None)
+        return destination_piece
+
+    def is_in_bounds(self, cell: Tuple[str, int]) -> bool:
+        return cell in CELL_SQUARES
 
     def get_cell(self, cell: Tuple[str, int]) -> str:
-        return self._get_cell(cell[0], cell[1])
+        return self.squares[to_square(cell)]
 
     def _get_cell(self, col: str, row: int,) -> str:
-        row_index = self._convert_row_to_index(row)
-        col_index = self._convert_col_to_index(col)
-        return self.board[row_index][col_index]
+        return self.squares[to_square((col, row))]
 
     def set_cell(self, cell: Tuple[str, int], piece: str):
-        self._set_cell(cell[0], cell[1], piece)
+        self.set_square(to_square(cell), piece)
 
     def _set_cell(self, col: str, row: int, piece: str):
-        row_index = self._convert_row_to_index(row)
-        col_index = self._convert_col_to_index(col)
-        self.board[row_index][col_index] = piece
+        self.set_square(to_square((col, row)), piece)
 
     def apply_move(self, move: Move) -> str:
         """
         Returns the piece at the destination
         """
-        moved_piece = self.get_cell(move.get_cell_from())
-        destination_piece = self.get_cell(move.get_cell_to())
-        self.set_cell(move.get_cell_to(), moved_piece)
-        self.set_cell(move.get_cell_from(), '.')
-        return destination_piece
+        return self.move_square(
+            to_square(move.get_cell_from()),
+            to_square(move.get_cell_to())
+        )
+
+    def to_board_string(self) -> str:
+        """
+        The position in the format accepted by the constructor
+        """
+        squares = self.squares
+        return ';'.join([' '.join(squares[row * 8:row * 8 + 8]) for row in range(8)])
 
     def to_string(self) -> str:
-        return ('\n'.join([' '.join([str(cell) for cell in row]) for row in self.board[::-1]]))
+        squares = self.squares
+        return '\n'.join([' '.join(squares[row * 8:row * 8 + 8]) for row in range(7, -1, -1)])
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _get_template(fen: str) -> ChessBoard:
+    """
+    Shared by every caller, only ever copied
+    """
+    position = parse_fen(fen)
+    return ChessBoard.from_squares(*position)
+
@@ -0,0 +1,101 @@
+from typing import List, NamedTuple, Optional, Tuple
+from domain.castling_rights import BLACK_KINGSIDE, BLACK_QUEENSIDE, WHITE_KINGSIDE, WHITE_QUEENSIDE
+from domain.squares import NAMED_CELLS, SQUARE_NAMES
+from domain.teams import TeamEnum
+from exception.illegal_move_exception import IllegalMoveException
+
+"""
+Forsyth-Edwards Notation: placement from rank 8 to rank 1, side to move, castling availability,
+en passant target square, halfmove clock and fullmove number
+"""
+
+STARTING_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+FEN_CASTLING_RIGHTS: List[Tuple[str, int]] = [
+    ('K', WHITE_KINGSIDE), ('Q', WHITE_QUEENSIDE), ('k', BLACK_KINGSIDE), ('q', BLACK_QUEENSIDE),
+]
+FEN_SIDES = {'w': TeamEnum.WHITES.value, 'b': TeamEnum.BLACKS.value}
+PIECES = 'PNBRQKpnbrqk'
+
+
+class FenPosition(NamedTuple):
+    squares: Tuple[str, ...]
+    side_to_move: str
+    castling_rights: int
+    en_passant_square: Optional[int]
+    halfmove_clock: int
+    fullmove_number: int
+
+
+def parse_fen(fen: str) -> FenPosition:
+    """
+    Raises IllegalMoveException for malformed FEN. The clocks may be left out
+    """
+    fields = fen.split()
+    if len(fields) not in (4, 6):
+        raise IllegalMoveException(f'Invalid FEN: {fen}')
+    placement, side, castling, en_passant = fields[:4]
+
+    ranks = placement.split('/')
+    if len(ranks) != 8:
+        raise IllegalMoveException(f'Invalid FEN placement: {placement}')
+    squares: List[str] = []
+    for rank in reversed(ranks):
+        row: List[str] = []
+        for symbol in rank:
+            if symbol in PIECES:
+                row.append(symbol)
+            elif symbol in '12345678':
+                row.extend('.' * int(symbol))
+            else:
+                raise IllegalMoveException(f'Invalid FEN placement: {placement}')
+        if len(row) != 8:
+            raise IllegalMoveException(f'Invalid FEN placement: {placement}')
+        squares.extend(row)
+
+    if side not in FEN_SIDES:
+        raise IllegalMoveException(f'Invalid FEN side to move: {side}')
+
+    castling_rights = 0
+    if castling != '-':
+        for symbol in castling:
+            rights = [right for castling_symbol, right in FEN_CASTLING_RIGHTS if castling_symbol == symbol]
+            if not rights:
+                raise IllegalMoveException(f'Invalid FEN castling: {castling}')
+            castling_rights |= rights[0]
+
+    en_passant_square = None
+    if en_passant != '-':
+        if en_passant not in NAMED_CELLS:
+            raise IllegalMoveException(f'Invalid FEN en passant square: {en_passant}')
+        en_passant_square = NAMED_CELLS[en_passant].index
+
+    halfmove_clock, fullmove_number = 0, 1
+    if len(fields) == 6:
+        if not fields[4].isdigit() or not fields[5].isdigit():
+            raise IllegalMoveException(f'Invalid FEN clocks: {fields[4]} {fields[5]}')
+        halfmove_clock, fullmove_number = int(fields[4]), int(fields[5])
+
+    return FenPosition(tuple(squares), FEN_SIDES[side], castling_rights, en_passant_square,
+                       halfmove_clock, fullmove_number)
+
+
+def format_fen(squares: List[str], side_to_move: str, castling_rights: int, en_passant_square: Optional[int],
+               halfmove_clock: int, fullmove_number: int) -> str:
+    ranks = []
+    for row in range(7, -1, -1):
+        rank = ''
+        empty = 0
+        for piece in squares[row * 8:row * 8 + 8]:
+            if piece == '.':
+                empty += 1
+                continue
+            if empty:
+                rank += str(empty)
+                empty = 0
+            rank += piece
+        ranks.append(rank + str(empty) if empty else rank)
+    side = 'w' if side_to_move == TeamEnum.WHITES.value else 'b'
+    castling = ''.join(symbol for symbol, right in FEN_CASTLING_RIGHTS if castling_rights & right) or '-'
+    en_passant = '-' if en_passant_square is None else SQUARE_NAMES[en_passant_square]
+    return f'{"/".join(ranks)} {side} {castling} {en_passant} {halfmove_clock} {fullmove_number}'
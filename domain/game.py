@@ -1,9 +1,23 @@
-from typing import List
+from typing import Callable, Dict, List, Optional, Sequence
 from config.config_wrapper import ConfigurationWrapper
+from config.rule_set import RuleSet
+from domain import instrumentation
+from domain.instrumentation import PhaseTimer
 from domain.special_move import SpecialMove
 from domain.chess_board import ChessBoard
+from domain.fen import STARTING_FEN
+from domain.game_status import GameStatusEnum
 from domain.move import Move
+from domain.move_history import MoveHistory
+from exception.illegal_move_exception import IllegalMoveException
+from logic.game_termination import has_legal_move
 from logic.move_validation_elector import get_validations_for
+from logic.move_validations import is_king_in_check
+from logic.special_move_registry import get_special_move_registry
+
+# Halfmove clock at which either player may claim a draw: fifty moves each without a capture or pawn move
+FIFTY_MOVE_RULE_PLIES = 100
+REPETITIONS_FOR_DRAW = 3
 
 
 class Game:
@@ -12,31 +26,130 @@ class Game:
     """
 
     chess_board: ChessBoard
-    move_history: List[Move]
+    move_history: MoveHistory
+    rule_set: RuleSet
+    on_move: Optional[Callable[[Move], None]]
+    status: GameStatusEnum
+    position_counts: Dict[int, int]
+
+    def __init__(self, rule_set: Optional[RuleSet] = None, chess_board: Optional[ChessBoard] = None,
+                 move_history: Optional[Sequence[Move]] = None, position_counts: Optional[Dict[int, int]] = None):
+        """
+        The game keeps the given rule set (the current config by default) for its whole life.
+        A new game starts from a copy of the cached starting position unless a board (and its history) is given,
+        with the repetition counts of a restored game if they are known
+        """
+        self.chess_board = chess_board if chess_board is not None else ChessBoard.from_fen(STARTING_FEN)
+        self.move_history = move_history if isinstance(move_history, MoveHistory) else MoveHistory(move_history)
+        self.rule_set = rule_set if rule_set is not None else ConfigurationWrapper.get_rule_set()
+        # Called with every move make_move has applied, e.g. to write it to a move log
+        self.on_move = None
+        # Times each position (by Zobrist hash) was reached since the last capture or pawn move,
+        # none before it can come back. Unless they are given, positions played before the given board are not known
+        self.position_counts = dict(position_counts) if position_counts else {self.chess_board.zobrist_hash: 1}
+        self.status = self._get_status()
 
-    def __init__(self):
-        self.chess_board = ChessBoard()
-        self.move_history = []
+    @classmethod
+    def from_fen(cls, fen: str, rule_set: Optional[RuleSet] = None) -> 'Game':
+        """
+        A game starting from the position, with an empty history
+        """
+        return cls(rule_set, ChessBoard.from_fen(fen))
+
+    def to_fen(self) -> str:
+        return self.chess_board.to_fen()
 
     def get_special_moves(self) -> List[SpecialMove]:
-        return [SpecialMove(move) for move in ConfigurationWrapper.get_config('special_moves') if move['enabled'] is True]
+        return get_special_move_registry(self.rule_set).special_moves
 
     def validate_move(self, move: Move):
+        if instrumentation.is_enabled():
+            for validate_function in get_validations_for(move, self.chess_board):
+                instrumentation.call_timed(f'validator.{validate_function.__name__}',
+                                           validate_function, move, self.chess_board)
+            return
         for validate_function in get_validations_for(move, self.chess_board):
             validate_function(move, self.chess_board)
 
     def make_move(self, move: Move):
+        timer = PhaseTimer() if instrumentation.is_enabled() else None
+        try:
+            self._make_move(move, timer)
+        except Exception as error:
+            if timer is not None:
+                timer.finish(type(error).__name__)
+            raise
+        if timer is not None:
+            timer.finish('ok')
 
-        is_special_move = False
-        for special_move in self.get_special_moves():
-            if special_move.is_being_executed_by(move):
-                special_move.validate(move)
-                execute_function = special_move.create_executor(move)
-                steps = execute_function(self.chess_board)
-                self.move_history += steps
-                is_special_move = True
+    def _make_move(self, move: Move, timer: Optional[PhaseTimer]):
+        if move.get_team() != self.chess_board.side_to_move:
+            raise IllegalMoveException('It is not your turn!')
+        # A move the history (and the move log) cannot record is rejected before anything touches the board
+        move.to_code()
 
-        if not is_special_move:
+        special_move = get_special_move_registry(self.rule_set).find(move, self.chess_board)
+        if timer is not None:
+            if special_move is not None:
+                timer.kind = special_move.name
+            timer.lap('identify')
+        if special_move is not None:
+            special_move.validate(move, self.chess_board)
+        else:
             self.validate_move(move)
+        if timer is not None:
+            timer.lap('validate')
+        self._play(move, special_move, timer)
+        if self.on_move is not None:
+            self.on_move(move)
+
+    def replay_move(self, move: Move):
+        """
+        Plays a move that was validated when it was first made (e.g. read back from a move log)
+        without validating it again
+        """
+        self._play(move, get_special_move_registry(self.rule_set).find(move, self.chess_board))
+
+    def _play(self, move: Move, special_move: Optional[SpecialMove], timer: Optional[PhaseTimer] = None):
+        if special_move is not None:
+            execute_function = special_move.create_executor(move)
+            if timer is not None:
+                timer.lap('construct')
+            steps = execute_function(self.chess_board)
+            self.move_history.append_special_steps(steps)
+        else:
             self.chess_board.apply_move(move)
             self.move_history.append(move)
+
+        self.chess_board.end_turn()
+        self._count_position()
+        if timer is not None:
+            timer.lap('apply')
+
+    def _count_position(self):
+        """
+        Updates the repetition counts and the status after a move, in constant time
+        """
+        chess_board = self.chess_board
+        if chess_board.halfmove_clock == 0:
+            self.position_counts.clear()
+        zobrist_hash = chess_board.zobrist_hash
+        self.position_counts[zobrist_hash] = self.position_counts.get(zobrist_hash, 0) + 1
+        self.status = self._get_status()
+
+    def _get_status(self) -> GameStatusEnum:
+        """
+        Checkmate or stalemate when the side to move has no legal move, else the draw the position allows, if any.
+        Draws other than stalemate are reported, not enforced: the game goes on if the players keep moving
+        """
+        chess_board = self.chess_board
+        team = chess_board.side_to_move
+        if not has_legal_move(team, chess_board, self.rule_set.get_enabled_special_move_names()):
+            return GameStatusEnum.CHECKMATE if is_king_in_check(team, chess_board) else GameStatusEnum.STALEMATE
+        if self.position_counts.get(chess_board.zobrist_hash, 0) >= REPETITIONS_FOR_DRAW:
+            return GameStatusEnum.THREEFOLD_REPETITION
+        if chess_board.halfmove_clock >= FIFTY_MOVE_RULE_PLIES:
+            return GameStatusEnum.FIFTY_MOVE_RULE
+        if chess_board.has_insufficient_material():
+            return GameStatusEnum.INSUFFICIENT_MATERIAL
+        return GameStatusEnum.ONGOING
@@ -0,0 +1,169 @@
+import mmap
+import os
+import struct
+from typing import Iterator, Optional
+from config.rule_set import RuleSet
+from domain.game import Game
+from domain.game_snapshot import SnapshotHeader, dumps, loads, read_header
+from exception.invalid_archive_exception import InvalidArchiveException
+from exception.no_such_game_exception import NoSuchGameException
+
+"""
+Append-only archive of game snapshots (see domain/game_snapshot.py), two files:
+<path>: header 'CSA', version, 4 reserved bytes, then the snapshots back to back
+<path>.idx: header 'CSI', version, 4 reserved bytes, then the end offset (u64) of each record
+Game ids are record numbers from 0, so a lookup reads two index entries.
+Records are written before their index entry: a record whose entry is missing after a crash is ignored
+"""
+
+ARCHIVE_VERSION = 1
+DATA_MAGIC = b'CSA'
+INDEX_MAGIC = b'CSI'
+INDEX_SUFFIX = '.idx'
+
+_FILE_HEADER = struct.Struct('<3sB4x')
+_OFFSET = struct.Struct('<Q')
+
+
+class GameRecord:
+    """
+    A record of a mapped archive. data is a view into the mapping, nothing is copied until load()
+    """
+
+    __slots__ = ('game_id', 'data')
+
+    game_id: int
+    data: memoryview
+
+    def __init__(self, game_id: int, data: memoryview):
+        self.game_id = game_id
+        self.data = data
+
+    def get_header(self) -> SnapshotHeader:
+        return read_header(self.data)
+
+    def load(self, rule_set: Optional[RuleSet] = None) -> Game:
+        return loads(self.data, rule_set)
+
+
+class GameArchive:
+    """
+    Appends go through the files, reads through read-only mappings that are remapped
+    when the files have grown. Records and their views must not outlive the archive
+    """
+
+    path: str
+    index_path: str
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index_path = path + INDEX_SUFFIX
+        for file_path, magic in [(self.path, DATA_MAGIC), (self.index_path, INDEX_MAGIC)]:
+            if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+                with open(file_path, 'wb') as archive_file:
+                    archive_file.write(_FILE_HEADER.pack(magic, ARCHIVE_VERSION))
+        self._data_file = open(self.path, 'r+b')
+        self._index_file = open(self.index_path, 'r+b')
+        try:
+            self._check_header(self._data_file, DATA_MAGIC)
+            self._check_header(self._index_file, INDEX_MAGIC)
+        except InvalidArchiveException:
+            self._data_file.close()
+            self._index_file.close()
+            raise
+        self._count = (os.path.getsize(self.index_path) - _FILE_HEADER.size) // _OFFSET.size
+        self._data_end = self._read_end(self._count - 1) if self._count else _FILE_HEADER.size
+        self._data_map: Optional[mmap.mmap] = None
+        self._index_map: Optional[mmap.mmap] = None
+        self._mapped_count = 0
+
+    @staticmethod
+    def _check_header(archive_file, magic: bytes):
+        archive_file.seek(0)
+        try:
+            file_magic, version = _FILE_HEADER.unpack(archive_file.read(_FILE_HEADER.size))
+        except struct.error:
+            raise InvalidArchiveException(f'Not a game archive: {archive_file.name}')
+        if file_magic != magic or version != ARCHIVE_VERSION:
+            raise InvalidArchiveException(f'Not a version {ARCHIVE_VERSION} game archive: {archive_file.name}')
+
+    def _read_end(self, game_id: int) -> int:
+        self._index_file.seek(_FILE_HEADER.size + game_id * _OFFSET.size)
+        return _OFFSET.unpack(self._index_file.read(_OFFSET.size))[0]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, game: Game) -> int:
+        """
+        Stores the game and returns its id
+        """
+        snapshot = dumps(game)
+        self._data_file.seek(self._data_end)
+        self._data_file.write(snapshot)
+        self._data_end += len(snapshot)
+        self._index_file.seek(_FILE_HEADER.size + self._count * _OFFSET.size)
+        self._index_file.write(_OFFSET.pack(self._data_end))
+        self._count += 1
+        return self._count - 1
+
+    def flush(self, sync: bool = False):
+        """
+        Hands the appended records to the OS, and with sync waits until they are on disk
+        """
+        for archive_file in [self._data_file, self._index_file]:
+            archive_file.flush()
+            if sync:
+                os.fsync(archive_file.fileno())
+
+    def _map(self):
+        """
+        Maps the files again if records were appended since they were last mapped.
+        The previous mappings are dropped, not closed, so records taken from them stay valid
+        """
+        if self._mapped_count == self._count:
+            return
+        self.flush()
+        self._data_map = mmap.mmap(self._data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._index_map = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapped_count = self._count
+
+    def _record(self, game_id: int, data: memoryview, index: memoryview) -> GameRecord:
+        start = _OFFSET.unpack_from(index, _FILE_HEADER.size + (game_id - 1) * _OFFSET.size)[0] \
+            if game_id else _FILE_HEADER.size
+        end = _OFFSET.unpack_from(index, _FILE_HEADER.size + game_id * _OFFSET.size)[0]
+        if not _FILE_HEADER.size <= start <= end <= len(data):
+            raise InvalidArchiveException(f'Index entry {game_id} is out of the archive')
+        return GameRecord(game_id, data[start:end])
+
+    def get_record(self, game_id: int) -> GameRecord:
+        if not 0 <= game_id < self._count:
+            raise NoSuchGameException(f'No such game: {game_id}')
+        self._map()
+        return self._record(game_id, memoryview(self._data_map), memoryview(self._index_map))
+
+    def load(self, game_id: int, rule_set: Optional[RuleSet] = None) -> Game:
+        return self.get_record(game_id).load(rule_set)
+
+    def scan(self, start: int = 0) -> Iterator[GameRecord]:
+        """
+        The records from start in id order, as of the call
+        """
+        if not self._count:
+            return
+        self._map()
+        data, index = memoryview(self._data_map), memoryview(self._index_map)
+        for game_id in range(start, self._mapped_count):
+            yield self._record(game_id, data, index)
+
+    def close(self):
+        self._data_map = self._index_map = None
+        self._mapped_count = 0
+        self._data_file.close()
+        self._index_file.close()
+
+    def __enter__(self) -> 'GameArchive':
+        return self
+
+    def __exit__(self, *exception_info):
+        self.close()
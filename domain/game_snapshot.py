@@ -0,0 +1,150 @@
+import struct
+import sys
+from array import array
+from typing import Dict, List, NamedTuple, Optional, Union
+from config.rule_set import RuleSet
+from domain.chess_board import BLACKS, WHITES, ChessBoard
+from domain.game import Game
+from domain.move import is_valid_code
+from domain.move_history import BLACKS_BIT, CODE_MASK, SPECIAL_STEP_BIT, MoveHistory
+from exception.invalid_snapshot_exception import InvalidSnapshotException
+
+"""
+Binary snapshot of a Game, little endian:
+header (16 bytes): magic 'CSG', version, side to move (0 whites, 1 blacks), castling rights,
+    en passant square (255 for none), reserved, halfmove clock (u16), fullmove number (u16),
+    number of history steps (u32)
+board (32 bytes): one nibble per square from a1 to h8, an index into PIECE_NIBBLES
+history: one u16 move code per step (see domain/move.py), then one team bit per step (1 for blacks),
+    then (since version 2) one bit per step set for the steps of special moves
+positions (since version 3): their number (u32), then the Zobrist hash (u64) and times reached (u16)
+    of every position since the last capture or pawn move, for the repetition draws
+Version 1 and 2 snapshots are still read, their games only count repetitions from the restored position
+"""
+
+SNAPSHOT_MAGIC = b'CSG'
+SNAPSHOT_VERSION = 3
+READABLE_VERSIONS = (1, 2, 3)
+PIECE_NIBBLES = '.PNBRQKpnbrqk'
+
+_HEADER = struct.Struct('<3sBBBBxHHI')
+_BOARD_SIZE = 32
+_POSITIONS_COUNT = struct.Struct('<I')
+_POSITION = struct.Struct('<QH')
+_NO_EN_PASSANT = 255
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+_NIBBLES = {piece: nibble for nibble, piece in enumerate(PIECE_NIBBLES)}
+# byte -> the pieces of its two squares
+_BYTE_PIECES = [
+    (PIECE_NIBBLES[byte & 15] if byte & 15 < len(PIECE_NIBBLES) else None,
+     PIECE_NIBBLES[byte >> 4] if byte >> 4 < len(PIECE_NIBBLES) else None)
+    for byte in range(256)
+]
+
+
+class SnapshotHeader(NamedTuple):
+    side_to_move: str
+    castling_rights: int
+    en_passant_square: Optional[int]
+    halfmove_clock: int
+    fullmove_number: int
+    steps: int
+    version: int
+
+
+def read_header(data: Union[bytes, bytearray, memoryview]) -> SnapshotHeader:
+    """
+    The position state and history length, without reading the board or the moves
+    """
+    try:
+        magic, version, side, castling_rights, en_passant_square, halfmove_clock, fullmove_number, steps = \
+            _HEADER.unpack_from(data)
+    except struct.error:
+        raise InvalidSnapshotException('Snapshot is truncated')
+    if magic != SNAPSHOT_MAGIC or version not in READABLE_VERSIONS:
+        raise InvalidSnapshotException(f'Not a version {SNAPSHOT_VERSION} game snapshot')
+    return SnapshotHeader(BLACKS if side else WHITES, castling_rights,
+                          None if en_passant_square == _NO_EN_PASSANT else en_passant_square,
+                          halfmove_clock, fullmove_number, steps, version)
+
+
+def dumps(game: Game) -> bytes:
+    chess_board = game.chess_board
+    squares = chess_board.squares
+    history = game.move_history
+    en_passant_square = chess_board.en_passant_square
+    header = _HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0 if chess_board.side_to_move == WHITES else 1,
+        chess_board.castling_rights, _NO_EN_PASSANT if en_passant_square is None else en_passant_square,
+        min(chess_board.halfmove_clock, 0xffff), min(chess_board.fullmove_number, 0xffff), len(history))
+    board = bytes(_NIBBLES[squares[square]] | _NIBBLES[squares[square + 1]] << 4 for square in range(0, 64, 2))
+
+    codes = array('H', [entry & CODE_MASK for entry in history.iter_entries()])
+    if not _LITTLE_ENDIAN:
+        codes.byteswap()
+    teams = bytearray((len(history) + 7) // 8)
+    special_steps = bytearray(len(teams))
+    for index, entry in enumerate(history.iter_entries()):
+        if entry & BLACKS_BIT:
+            teams[index >> 3] |= 1 << (index & 7)
+        if entry & SPECIAL_STEP_BIT:
+            special_steps[index >> 3] |= 1 << (index & 7)
+    positions = [_POSITIONS_COUNT.pack(len(game.position_counts))]
+    positions.extend(_POSITION.pack(zobrist_hash, min(count, 0xffff))
+                     for zobrist_hash, count in game.position_counts.items())
+    return b''.join([header, board, codes.tobytes(), teams, special_steps] + positions)
+
+
+def loads(data: Union[bytes, bytearray, memoryview], rule_set: Optional[RuleSet] = None) -> Game:
+    """
+    Restores the game without replaying it. The history codes are read straight from the
+    buffer into the game's packed history, no Move is built
+    """
+    view = memoryview(data)
+    side_to_move, castling_rights, en_passant_square, halfmove_clock, fullmove_number, steps, version = \
+        read_header(view)
+    history_offset = _HEADER.size + _BOARD_SIZE
+    teams_offset = history_offset + 2 * steps
+    bitset_size = (steps + 7) // 8
+    special_steps_offset = teams_offset + bitset_size
+    positions_offset = special_steps_offset + (bitset_size if version > 1 else 0)
+    if len(view) < positions_offset:
+        raise InvalidSnapshotException('Snapshot is truncated')
+    position_counts = _read_position_counts(view, positions_offset) if version > 2 else None
+
+    squares = [piece for byte in view[_HEADER.size:history_offset] for piece in _BYTE_PIECES[byte]]
+    if None in squares or en_passant_square is not None and en_passant_square > 63:
+        raise InvalidSnapshotException('Snapshot board is corrupted')
+    chess_board = ChessBoard.from_squares(
+        squares, side_to_move, castling_rights, en_passant_square, halfmove_clock, fullmove_number)
+
+    codes = view[history_offset:teams_offset]
+    codes = codes.cast('H') if _LITTLE_ENDIAN else _byteswapped(codes)
+    teams = view[teams_offset:special_steps_offset]
+    special_steps = view[special_steps_offset:positions_offset] if version > 1 else bytes(bitset_size)
+    for code in codes:
+        if not is_valid_code(code):
+            raise InvalidSnapshotException(f'Snapshot history is corrupted: Invalid move code: {code}')
+    history = MoveHistory.from_entries(
+        code | (BLACKS_BIT if teams[index >> 3] >> (index & 7) & 1 else 0)
+        | (SPECIAL_STEP_BIT if special_steps[index >> 3] >> (index & 7) & 1 else 0)
+        for index, code in enumerate(codes))
+    return Game(rule_set, chess_board, history, position_counts)
+
+
+def _read_position_counts(view: memoryview, offset: int) -> Dict[int, int]:
+    try:
+        positions, = _POSITIONS_COUNT.unpack_from(view, offset)
+        offset += _POSITIONS_COUNT.size
+        if len(view) < offset + positions * _POSITION.size:
+            raise InvalidSnapshotException('Snapshot is truncated')
+        return dict(_POSITION.iter_unpack(view[offset:offset + positions * _POSITION.size]))
+    except struct.error:
+        raise InvalidSnapshotException('Snapshot is truncated')
+
+
+def _byteswapped(codes: memoryview) -> List[int]:
+    swapped = array('H', codes.tobytes())
+    swapped.byteswap()
+    return swapped.tolist()
@@ -0,0 +1,21 @@
+from enum import Enum
+
+
+class GameStatusEnum(Enum):
+    ONGOING = "ONGOING"
+    CHECKMATE = "CHECKMATE"
+    STALEMATE = "STALEMATE"
+    THREEFOLD_REPETITION = "THREEFOLD_REPETITION"
+    FIFTY_MOVE_RULE = "FIFTY_MOVE_RULE"
+    INSUFFICIENT_MATERIAL = "INSUFFICIENT_MATERIAL"
+
+    def is_draw(self) -> bool:
+        return self in DRAWS
+
+
+DRAWS = frozenset([
+    GameStatusEnum.STALEMATE,
+    GameStatusEnum.THREEFOLD_REPETITION,
+    GameStatusEnum.FIFTY_MOVE_RULE,
+    GameStatusEnum.INSUFFICIENT_MATERIAL,
+])
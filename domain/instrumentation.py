@@ -0,0 +1,225 @@
+import functools
+import importlib
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Optional, Tuple
+
+"""
+Counters and latency histograms for the move pipeline, off by default.
+While disabled nothing is wrapped and Game.make_move only reads one flag, so it costs nothing measurable.
+enable() times the phases of Game.make_move (identify, validate, construct, apply, overall and per kind
+of move) and wraps the hot functions listed in INSTRUMENTED with counting or timing versions;
+disable() puts the originals back.
+Names are dotted, e.g. 'make_move.validate.Castle', 'special_move.identify.En Passant', 'board.cells_read'.
+Updates are not locked, counts from several threads at once may be slightly low
+"""
+
+# Histogram bucket i counts durations of less than 2 ** i nanoseconds, the last bucket everything above
+HISTOGRAM_BUCKETS = 40
+ORDINARY_MOVE = 'Ordinary'
+
+_enabled = False
+counters: Dict[str, int] = dict()
+histograms: Dict[str, 'Histogram'] = dict()
+
+
+class Histogram:
+    """
+    Durations in power of two nanosecond buckets
+    """
+
+    __slots__ = ('buckets', 'count', 'total_ns', 'max_ns')
+
+    buckets: List[int]
+    count: int
+    total_ns: int
+    max_ns: int
+
+    def __init__(self):
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, duration_ns: int):
+        self.buckets[min(duration_ns.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total_ns += duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+    def percentile_ns(self, fraction: float) -> int:
+        """
+        Upper bound of the bucket holding the percentile
+        """
+        rank = fraction * self.count
+        seen = 0
+        for bucket, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if bucket_count and seen >= rank:
+                return min(1 << bucket, self.max_ns)
+        return self.max_ns
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'total_ns': self.total_ns,
+            'max_ns': self.max_ns,
+            'p50_ns': self.percentile_ns(0.5),
+            'p99_ns': self.percentile_ns(0.99),
+            'buckets': {1 << bucket: bucket_count for bucket, bucket_count in enumerate(self.buckets) if bucket_count},
+        }
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def count(name: str, amount: int = 1):
+    counters[name] = counters.get(name, 0) + amount
+
+
+def record(name: str, duration_ns: int):
+    histogram = histograms.get(name)
+    if histogram is None:
+        histogram = histograms[name] = Histogram()
+    histogram.record(duration_ns)
+
+
+def call_timed(name: str, function: Callable, *arguments):
+    started = perf_counter_ns()
+    try:
+        return function(*arguments)
+    finally:
+        record(name, perf_counter_ns() - started)
+
+
+class PhaseTimer:
+    """
+    Records the time since the previous lap under make_move.<phase> and make_move.<phase>.<kind>
+    """
+
+    __slots__ = ('kind', '_started', '_last')
+
+    kind: str
+
+    def __init__(self):
+        self.kind = ORDINARY_MOVE
+        self._started = self._last = perf_counter_ns()
+
+    def lap(self, phase: str):
+        now = perf_counter_ns()
+        record(f'make_move.{phase}', now - self._last)
+        record(f'make_move.{phase}.{self.kind}', now - self._last)
+        self._last = now
+
+    def finish(self, outcome: str):
+        """
+        Records the whole move, outcome is 'ok' or the exception name
+        """
+        record(f'make_move.total.{self.kind}', perf_counter_ns() - self._started)
+        count(f'make_move.{outcome}.{self.kind}')
+
+
+def _counting(name: str, function: Callable) -> Callable:
+    @functools.wraps(function)
+    def counted(*arguments, **keywords):
+        counters[name] = counters.get(name, 0) + 1
+        return function(*arguments, **keywords)
+    return counted
+
+
+def _timing(name: str, function: Callable) -> Callable:
+    @functools.wraps(function)
+    def timed(*arguments, **keywords):
+        counters[name] = counters.get(name, 0) + 1
+        started = perf_counter_ns()
+        try:
+            return function(*arguments, **keywords)
+        finally:
+            record(name, perf_counter_ns() - started)
+    return timed
+
+
+def _timing_special_move(phase: str, function: Callable) -> Callable:
+    @functools.wraps(function)
+    def timed(special_move, *arguments):
+        started = perf_counter_ns()
+        try:
+            return function(special_move, *arguments)
+        finally:
+            record(f'special_move.{phase}.{special_move.name}', perf_counter_ns() - started)
+    return timed
+
+
+# (module, attribute path, wrapper factory, metric name)
+INSTRUMENTED: List[Tuple[str, str, Callable[[str, Callable], Callable], str]] = [
+    ('domain.chess_board', 'ChessBoard.get_square', _counting, 'board.cells_read'),
+    ('domain.chess_board', 'ChessBoard.get_cell', _counting, 'board.cells_read'),
+    ('domain.chess_board', 'ChessBoard._get_cell', _counting, 'board.cells_read'),
+    ('domain.chess_board', 'ChessBoard.set_square', _counting, 'board.cells_written'),
+    ('domain.attack_tables', 'ray_attacks', _counting, 'board.rays_walked'),
+    ('logic.move_validations', 'is_in_check', _timing, 'is_in_check'),
+    ('domain.special_move', 'SpecialMove.is_being_executed_by', _timing_special_move, 'identify'),
+    ('domain.special_move', 'SpecialMove.validate', _timing_special_move, 'validate'),
+    ('domain.special_move', 'SpecialMove.create_executor', _timing_special_move, 'construct'),
+]
+
+_originals: List[Tuple[object, str, Callable]] = []
+
+
+def _resolve(module_name: str, path: str) -> Tuple[object, str]:
+    owner = importlib.import_module(module_name)
+    *owners, attribute = path.split('.')
+    for name in owners:
+        owner = getattr(owner, name)
+    return owner, attribute
+
+
+def enable():
+    global _enabled
+    if _enabled:
+        return
+    for module_name, path, wrap, name in INSTRUMENTED:
+        owner, attribute = _resolve(module_name, path)
+        original = owner.__dict__[attribute]
+        _originals.append((owner, attribute, original))
+        setattr(owner, attribute, wrap(name, original))
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    while _originals:
+        owner, attribute, original = _originals.pop()
+        setattr(owner, attribute, original)
+    _enabled = False
+
+
+def reset():
+    counters.clear()
+    histograms.clear()
+
+
+def snapshot() -> dict:
+    """
+    A copy of every counter and histogram, safe to keep while recording goes on
+    """
+    return {
+        'enabled': _enabled,
+        'counters': dict(counters),
+        'histograms': {name: histogram.to_dict() for name, histogram in list(histograms.items())},
+    }
+
+
+def export_text(metrics: Optional[dict] = None) -> str:
+    """
+    One line per metric, sorted by name, microseconds for durations
+    """
+    metrics = metrics if metrics is not None else snapshot()
+    lines = [f'counter {name} {value}' for name, value in sorted(metrics['counters'].items())]
+    for name, histogram in sorted(metrics['histograms'].items()):
+        mean_us = histogram['total_ns'] / histogram['count'] / 1000 if histogram['count'] else 0.0
+        lines.append(f'histogram {name} count={histogram["count"]} mean_us={mean_us:.2f} '
+                     f'p50_us<={histogram["p50_ns"] / 1000:.2f} p99_us<={histogram["p99_ns"] / 1000:.2f} '
+                     f'max_us={histogram["max_ns"] / 1000:.2f}')
+    return '\n'.join(lines) + '\n'
@@ -1,30 +1,78 @@
-from typing import Tuple
+from typing import Optional, Tuple
 
+from domain.squares import NAMED_CELLS, SQUARE_CELLS, Square
 from exception.illegal_move_exception import IllegalMoveException
 
+"""
+Packed 16 bit move codes:
+bits 0-5 origin square, bits 6-11 destination square,
+bits 12-13 flag, bits 14-15 promotion piece.
+Castles and en passant are recognised from the board, as Game does, so only promotions need a flag.
+The team is not part of the code
+"""
+MOVE_FLAG_NONE = 0
+MOVE_FLAG_PROMOTION = 1
+
+PROMOTION_CODES = 'NBRQ'
+
 
 class Move:
     """
-    A move by a player
+    A move by a player.
+    Cells are the shared Square objects, so a move only holds references.
+    Moves compare by value, so a move decoded from its code equals the original
     """
 
+    __slots__ = ('team', 'from_cell', 'to_cell', 'additional_data')
+
     team: str
     from_cell: Tuple[str, int]
     to_cell: Tuple[str, int]
-    additional_data: str
+    additional_data: Optional[str]
 
-    def __init__(self, team, from_cell: str, to_cell: str, additional_data: str):
+    def __init__(self, team, from_cell: str, to_cell: str, additional_data: Optional[str]):
+        self.team = team
+        self.from_cell = _parse_cell(from_cell, 'origin')
+        self.to_cell = _parse_cell(to_cell, 'destination')
+        self.additional_data = additional_data
 
-        if len(from_cell) != 2 or from_cell[0].isnumeric() or not from_cell[1].isnumeric():
-            raise IllegalMoveException(f'Invalid move origin: {from_cell}')
+    @classmethod
+    def from_squares(cls, team: str, square_from: int, square_to: int,
+                     additional_data: Optional[str] = None) -> 'Move':
+        """
+        Builds a move from square ids without parsing any string
+        """
+        move = cls.__new__(cls)
+        move.team = team
+        move.from_cell = SQUARE_CELLS[square_from]
+        move.to_cell = SQUARE_CELLS[square_to]
+        move.additional_data = additional_data
+        return move
 
-        if len(to_cell) != 2 or to_cell[0].isnumeric() or not to_cell[1].isnumeric():
-            raise IllegalMoveException(f'Invalid move destination: {to_cell}')
+    @classmethod
+    def from_code(cls, code: int, team: str) -> 'Move':
+        """
+        Decodes a packed code. Raises IllegalMoveException for codes outside 16 bits or unknown flags
+        """
+        if not is_valid_code(code):
+            raise IllegalMoveException(f'Invalid move code: {code}')
+        additional_data = PROMOTION_CODES[code >> 14] if (code >> 12) & 3 == MOVE_FLAG_PROMOTION else None
+        return cls.from_squares(team, code & 63, (code >> 6) & 63, additional_data)
 
-        self.team = team
-        self.from_cell = tuple([from_cell[0].lower(), int(from_cell[1])])
-        self.to_cell = tuple([ to_cell[0].lower(), int(to_cell[1])])
-        self.additional_data = additional_data
+    def to_code(self) -> int:
+        """
+        The packed 16 bit code of an on-board move.
+        Raises IllegalMoveException for additional data other than a promotion piece
+        """
+        if not isinstance(self.from_cell, Square) or not isinstance(self.to_cell, Square):
+            raise IllegalMoveException(f'Cannot encode an off-board move: {self}')
+        code = self.from_cell.index | self.to_cell.index << 6
+        if self.additional_data:
+            promotion_code = PROMOTION_CODES.find(self.additional_data.upper())
+            if len(self.additional_data) != 1 or promotion_code < 0:
+                raise IllegalMoveException(f'Cannot encode additional data: {self.additional_data}')
+            code |= MOVE_FLAG_PROMOTION << 12 | promotion_code << 14
+        return code
 
     def get_team(self) -> str:
         return self.team
@@ -35,5 +83,37 @@ class Move:
     def get_cell_to(self) -> Tuple[str, int]:
         return self.to_cell
 
-    def get_additional_data(self) -> str:
+    def get_additional_data(self) -> Optional[str]:
         return self.additional_data
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Move):
+            return NotImplemented
+        return self.team == other.team and self.from_cell == other.from_cell \
+            and self.to_cell == other.to_cell and self.additional_data == other.additional_data
+
+    def __hash__(self) -> int:
+        return hash((self.team, self.from_cell, self.to_cell, self.additional_data))
+
+    def __repr__(self) -> str:
+        return f'Move({self.team!r}, {self.from_cell!r}, {self.to_cell!r}, {self.additional_data!r})'
+
+
+def is_valid_code(code: int) -> bool:
+    """
+    Whether Move.from_code can decode the code, checked without building the move
+    """
+    if not 0 <= code < 1 << 16:
+        return False
+    flag = (code >> 12) & 3
+    return flag == MOVE_FLAG_PROMOTION or flag == MOVE_FLAG_NONE and not code >> 14
+
+
+def _parse_cell(name: str, description: str) -> Tuple[str, int]:
+    cell = NAMED_CELLS.get(name)
+    if cell is not None:
+        return cell
+    if len(name) != 2 or name[0].isnumeric() or not name[1].isnumeric():
+        raise IllegalMoveException(f'Invalid move {description}: {name}')
+    # Off-board cells are kept, the board rejects them when the move is validated
+    return tuple([name[0].lower(), int(name[1])])
@@ -0,0 +1,159 @@
+from abc import abstractmethod
+from array import array
+from collections.abc import Sequence
+from typing import Iterable, Iterator, List, Optional, Union
+from domain.move import Move
+from domain.teams import TeamEnum
+
+"""
+A game's history packed into one array of 32 bit entries, one per step:
+bits 0-15 the move code (see domain/move.py), bit 16 the team (set for blacks),
+bit 17 set for the steps a special move executor produced (both halves of a castle, an en passant...).
+Moves are only built when an entry is read, so a long game costs 4 bytes per step
+"""
+CODE_MASK = 0xffff
+BLACKS_BIT = 1 << 16
+SPECIAL_STEP_BIT = 1 << 17
+
+_WHITES = TeamEnum.WHITES.value
+_BLACKS = TeamEnum.BLACKS.value
+
+
+def pack_step(move: Move, is_special_step: bool = False) -> int:
+    return move.to_code() | (BLACKS_BIT if move.get_team() == _BLACKS else 0) \
+        | (SPECIAL_STEP_BIT if is_special_step else 0)
+
+
+def unpack_step(entry: int) -> Move:
+    return Move.from_code(entry & CODE_MASK, _BLACKS if entry & BLACKS_BIT else _WHITES)
+
+
+class _PackedSteps(Sequence):
+    """
+    Read-only access shared by the history and its views, through get_entry and iter_entries.
+    Sequence is an ABC, so subclasses must implement them
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def get_entry(self, index: int) -> int:
+        """
+        The packed entry of a step
+        """
+
+    @abstractmethod
+    def iter_entries(self) -> Iterator[int]:
+        """
+        The packed entries in order
+        """
+
+    def __iter__(self) -> Iterator[Move]:
+        for entry in self.iter_entries():
+            yield unpack_step(entry)
+
+    def is_special_step(self, index: int) -> bool:
+        return bool(self.get_entry(index) & SPECIAL_STEP_BIT)
+
+    def __eq__(self, other) -> bool:
+        """
+        Equal to the same moves in a list, tuple or history, the special step flags aside
+        """
+        if isinstance(other, _PackedSteps):
+            return len(self) == len(other) and all(
+                not (entry ^ other_entry) & ~SPECIAL_STEP_BIT
+                for entry, other_entry in zip(self.iter_entries(), other.iter_entries()))
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(move == other_move for move, other_move in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({list(self)!r})'
+
+
+class MoveHistoryView(_PackedSteps):
+    """
+    Steps of a history, e.g. a slice of it. It reads the history's array, which only grows,
+    so taking a view copies nothing and the steps it covers never change
+    """
+
+    __slots__ = ('_entries', '_range')
+
+    _entries: array
+    _range: range
+
+    def __init__(self, entries: array, steps: range):
+        self._entries = entries
+        self._range = steps
+
+    def __len__(self) -> int:
+        return len(self._range)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Move, 'MoveHistoryView']:
+        if isinstance(index, slice):
+            return MoveHistoryView(self._entries, self._range[index])
+        return unpack_step(self._entries[self._range[index]])
+
+    def get_entry(self, index: int) -> int:
+        return self._entries[self._range[index]]
+
+    def iter_entries(self) -> Iterator[int]:
+        entries = self._entries
+        for position in self._range:
+            yield entries[position]
+
+
+class MoveHistory(_PackedSteps):
+    """
+    The history of a game. Appending writes at the end of the array without copying it,
+    indexing builds one Move and slicing gives a MoveHistoryView
+    """
+
+    __slots__ = ('_entries',)
+
+    _entries: array
+
+    def __init__(self, moves: Optional[Iterable[Move]] = None):
+        self._entries = array('I')
+        if moves is not None:
+            self.extend(moves)
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[int]) -> 'MoveHistory':
+        """
+        A history of packed entries, e.g. read back from a snapshot
+        """
+        history = cls()
+        history._entries.extend(entries)
+        return history
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Move, MoveHistoryView]:
+        if isinstance(index, slice):
+            return MoveHistoryView(self._entries, range(len(self._entries))[index])
+        return unpack_step(self._entries[index])
+
+    def get_entry(self, index: int) -> int:
+        return self._entries[index]
+
+    def iter_entries(self) -> Iterator[int]:
+        return iter(self._entries)
+
+    def append(self, move: Move):
+        self._entries.append(pack_step(move))
+
+    def extend(self, moves: Iterable[Move]):
+        self._entries.extend(pack_step(move) for move in moves)
+
+    def append_special_steps(self, steps: List[Move]):
+        """
+        The steps a special move executor returned, flagged as such
+        """
+        self._entries.extend(pack_step(step, True) for step in steps)
+
+    def __reduce__(self):
+        return MoveHistory.from_entries, (self._entries,)
@@ -0,0 +1,275 @@
+import enum
+import os
+import re
+import struct
+import threading
+import zlib
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+from config.rule_set import RuleSet
+from domain.chess_board import BLACKS, WHITES
+from domain.game import Game
+from domain.game_snapshot import dumps, loads
+from domain.move import Move
+from exception.invalid_move_log_exception import InvalidMoveLogException
+
+"""
+Write-ahead log of the moves of live games, kept as numbered segment files in a directory.
+A segment starts with 'CSL' and a version, then records framed as body length (u32), crc32 (u32), body.
+Bodies start with a kind byte and the game id (u8 length, utf-8):
+SNAPSHOT  the game as a game_snapshot, written when a game is tracked and at checkpoints
+MOVE      team (0 whites, 1 blacks) and the u16 code of a move given to Game.make_move
+CLOSE     the game is over, recovery drops it
+CHECKPOINT_DONE (no game id) every live game has a snapshot above it
+A checkpoint writes the snapshots to a new segment and then deletes the older ones.
+Recovery starts from the newest segment that is the first one or has a CHECKPOINT_DONE,
+and stops at the first torn record
+"""
+
+LOG_MAGIC = b'CSL'
+LOG_VERSION = 1
+
+SNAPSHOT = 1
+MOVE = 2
+CLOSE = 3
+CHECKPOINT_DONE = 4
+
+_SEGMENT_NAME = re.compile(r'^moves-(\d{6})\.log$')
+_FILE_HEADER = struct.Struct('<3sB')
+_FRAME = struct.Struct('<II')
+_MOVE = struct.Struct('<BH')
+
+
+class Durability(enum.Enum):
+    # Records reach the file from the writer thread, flushing to disk is left to the OS:
+    # a process crash loses only what was still queued, a power loss may lose more
+    OS = 'OS'
+    # The writer thread fsyncs every batch, make_move does not wait for it
+    BATCHED = 'BATCHED'
+    # make_move returns once the batch holding its move is fsynced. Moves made meanwhile
+    # by other threads join the next batch, so one fsync commits many games' moves
+    SYNC = 'SYNC'
+
+
+def _segment_path(directory: str, number: int) -> str:
+    return os.path.join(directory, f'moves-{number:06d}.log')
+
+
+def _segment_numbers(directory: str) -> List[int]:
+    return sorted(int(match.group(1)) for match in map(_SEGMENT_NAME.match, os.listdir(directory)) if match)
+
+
+def _frame(kind: int, game_id: Optional[str], payload: bytes = b'') -> bytes:
+    body = bytes([kind])
+    if game_id is not None:
+        encoded_id = game_id.encode()
+        body += bytes([len(encoded_id)]) + encoded_id
+    body += payload
+    return _FRAME.pack(len(body), zlib.crc32(body)) + body
+
+
+def _open_segment(path: str) -> BinaryIO:
+    segment = open(path, 'xb')
+    segment.write(_FILE_HEADER.pack(LOG_MAGIC, LOG_VERSION))
+    return segment
+
+
+class MoveLog:
+    """
+    Appends are queued and written by a background thread, which writes everything queued
+    as one batch: one write and, unless the durability is OS, one fsync per batch.
+    Games are tracked under an id; from then on each move they make is logged.
+    Opening a directory that already holds segments starts a new one after them, recover the
+    games first and track them again to keep them
+    """
+
+    directory: str
+    durability: Durability
+
+    def __init__(self, directory: str, durability: Durability = Durability.BATCHED):
+        self.directory = directory
+        self.durability = durability
+        os.makedirs(directory, exist_ok=True)
+        numbers = _segment_numbers(directory)
+        self._segment_number = numbers[-1] + 1 if numbers else 1
+        self._segment = _open_segment(_segment_path(directory, self._segment_number))
+        self._fsync(self._segment)
+
+        self._lock = threading.Lock()
+        self._queued = threading.Condition(self._lock)
+        self._written = threading.Condition(self._lock)
+        # Held by the writer while it writes, so a checkpoint can swap segments between batches
+        self._segment_lock = threading.Lock()
+        self._pending: List[bytes] = []
+        self._appended = 0
+        self._durable = 0
+        self._error: Optional[BaseException] = None
+        self._closing = False
+        self._games: Dict[str, Game] = dict()
+        self._writer = threading.Thread(target=self._run, name='move-log-writer', daemon=True)
+        self._writer.start()
+
+    def _fsync(self, segment: BinaryIO):
+        segment.flush()
+        os.fsync(segment.fileno())
+
+    def _append(self, record: bytes) -> int:
+        with self._lock:
+            if self._error is not None:
+                raise self._error
+            if self._closing:
+                raise ValueError('Move log is closed')
+            self._pending.append(record)
+            self._appended += 1
+            sequence = self._appended
+            self._queued.notify()
+        if self.durability == Durability.SYNC:
+            self.wait_for(sequence)
+        return sequence
+
+    def wait_for(self, sequence: int):
+        """
+        Blocks until the record with the sequence number (as returned by the appends) is written,
+        and fsynced unless the durability is OS
+        """
+        with self._lock:
+            while self._durable < sequence and self._error is None:
+                self._written.wait()
+            if self._error is not None:
+                raise self._error
+
+    def sync(self):
+        """
+        Blocks until everything appended so far is on disk, whatever the durability
+        """
+        with self._lock:
+            sequence = self._appended
+        self.wait_for(sequence)
+        if self.durability == Durability.OS:
+            with self._segment_lock:
+                self._fsync(self._segment)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._pending and not self._closing:
+                    self._queued.wait()
+                if not self._pending:
+                    return
+                batch, self._pending = self._pending, []
+                last_sequence = self._appended
+            try:
+                with self._segment_lock:
+                    self._segment.write(b''.join(batch))
+                    if self.durability == Durability.OS:
+                        self._segment.flush()
+                    else:
+                        self._fsync(self._segment)
+            except BaseException as error:
+                with self._lock:
+                    self._error = error
+                    self._written.notify_all()
+                return
+            with self._lock:
+                self._durable = last_sequence
+                self._written.notify_all()
+
+    def track(self, game_id: str, game: Game) -> int:
+        """
+        Logs the game as it is now and every move it makes from now on
+        """
+        self._games[game_id] = game
+        game.on_move = lambda move: self.log_move(game_id, move)
+        return self._append(_frame(SNAPSHOT, game_id, dumps(game)))
+
+    def log_move(self, game_id: str, move: Move) -> int:
+        return self._append(_frame(MOVE, game_id, _MOVE.pack(move.get_team() == BLACKS, move.to_code())))
+
+    def close_game(self, game_id: str) -> int:
+        game = self._games.pop(game_id, None)
+        if game is not None:
+            game.on_move = None
+        return self._append(_frame(CLOSE, game_id))
+
+    def checkpoint(self):
+        """
+        Starts a new segment from snapshots of the tracked games and deletes the older segments,
+        so recovery no longer replays their moves. The tracked games must not be making moves meanwhile
+        """
+        self.sync()
+        records = [_frame(SNAPSHOT, game_id, dumps(game)) for game_id, game in self._games.items()]
+        records.append(_frame(CHECKPOINT_DONE, None))
+        segment = _open_segment(_segment_path(self.directory, self._segment_number + 1))
+        segment.write(b''.join(records))
+        self._fsync(segment)
+        with self._segment_lock:
+            previous_segment, self._segment = self._segment, segment
+            self._segment_number += 1
+        previous_segment.close()
+        for number in _segment_numbers(self.directory):
+            if number < self._segment_number:
+                os.remove(_segment_path(self.directory, number))
+
+    def close(self):
+        with self._lock:
+            self._closing = True
+            self._queued.notify()
+        self._writer.join()
+        if self._error is None:
+            self._fsync(self._segment)
+        self._segment.close()
+        for game in self._games.values():
+            game.on_move = None
+        self._games.clear()
+
+    def __enter__(self) -> 'MoveLog':
+        return self
+
+    def __exit__(self, *exception_info):
+        self.close()
+
+
+def _read_records(path: str) -> Iterator[Tuple[int, Optional[str], memoryview]]:
+    with open(path, 'rb') as segment:
+        data = memoryview(segment.read())
+    try:
+        magic, version = _FILE_HEADER.unpack_from(data)
+    except struct.error:
+        return
+    if magic != LOG_MAGIC or version != LOG_VERSION:
+        raise InvalidMoveLogException(f'Not a version {LOG_VERSION} move log: {path}')
+    offset = _FILE_HEADER.size
+    while offset + _FRAME.size <= len(data):
+        length, checksum = _FRAME.unpack_from(data, offset)
+        body = data[offset + _FRAME.size:offset + _FRAME.size + length]
+        if len(body) != length or not length or zlib.crc32(body) != checksum:
+            return
+        offset += _FRAME.size + length
+        kind = body[0]
+        if kind == CHECKPOINT_DONE:
+            yield kind, None, body[1:]
+            continue
+        id_end = 2 + body[1]
+        yield kind, bytes(body[2:id_end]).decode(), body[id_end:]
+
+
+def recover(directory: str, rule_set: Optional[RuleSet] = None) -> Dict[str, Game]:
+    """
+    The games that were live when the log was last written, by id. Moves are replayed
+    without validation, they were validated before being logged
+    """
+    numbers = _segment_numbers(directory) if os.path.isdir(directory) else []
+    start = 0
+    for index, number in enumerate(numbers):
+        if index == 0 or any(kind == CHECKPOINT_DONE for kind, _, _ in _read_records(_segment_path(directory, number))):
+            start = index
+    games: Dict[str, Game] = dict()
+    for number in numbers[start:]:
+        for kind, game_id, payload in _read_records(_segment_path(directory, number)):
+            if kind == SNAPSHOT:
+                games[game_id] = loads(payload, rule_set)
+            elif kind == MOVE and game_id in games:
+                is_blacks, code = _MOVE.unpack(payload)
+                games[game_id].replay_move(Move.from_code(code, BLACKS if is_blacks else WHITES))
+            elif kind == CLOSE:
+                games.pop(game_id, None)
+    return games
@@ -1,6 +1,6 @@
 from domain.move import Move
 from domain.chess_board import ChessBoard
-from typing import Callable, List
+from typing import Callable, List, Mapping, Optional
 import logic.move_validations
 import logic.move_constructors
 import logic.move_identifiers
@@ -12,20 +12,24 @@ class SpecialMove:
     """
 
     name: str
+    moved_piece: Optional[str]
     identifier: Callable[[Move, ChessBoard], bool]
-    validator: Callable[[Move, ChessBoard, List[Move]], None]
+    validator: Callable[[Move, ChessBoard], None]
     creator: Callable[[Move], Callable[[ChessBoard], List[Move]]]
 
-    def __init__(self, configuration: dict):
+    def __init__(self, configuration: Mapping):
         self._init_from_params(
             configuration.get('name'),
+            configuration.get('moved_piece'),
             configuration.get('identifier_func'),
             configuration.get('validator_func'),
             configuration.get('creator_func')
         )
 
-    def _init_from_params(self, name: str, identifier_func: str, validator_func: str, creator_func: str):
+    def _init_from_params(self, name: str, moved_piece: Optional[str], identifier_func: str,
+                          validator_func: str, creator_func: str):
         self.name = name
+        self.moved_piece = moved_piece.lower() if moved_piece else None
         self.identifier = getattr(logic.move_identifiers, identifier_func)
         self.validator = getattr(logic.move_validations, validator_func)
         self.creator = getattr(logic.move_constructors, creator_func)
@@ -33,8 +37,12 @@ class SpecialMove:
     def is_being_executed_by(self, move: Move, chess_board: ChessBoard) -> bool:
         return self.identifier(move, chess_board)
 
-    def validate(self, move: Move, chess_board: ChessBoard, move_history: List[Move]):
-        self.validator(move, chess_board, move_history)
+    def validate(self, move: Move, chess_board: ChessBoard):
+        """
+        Raises IllegalMoveException if the move is not legal. Everything the rules need
+        (castling rights, en passant square...) is kept on the board
+        """
+        self.validator(move, chess_board)
 
     def create_executor(self, move: Move) -> Callable[[ChessBoard], List[Move]]:
         return self.creator(move)
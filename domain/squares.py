@@ -0,0 +1,73 @@
+from typing import Dict, List, Tuple
+
+from exception.illegal_move_exception import IllegalMoveException
+
+"""
+Integer square ids: a1 = 0, b1 = 1, ..., h1 = 7, a2 = 8, ..., h8 = 63
+"""
+
+BOARD_SIZE = 64
+COLUMNS = 'abcdefgh'
+
+
+class Square(tuple):
+    """
+    A (column, row) cell that also knows its square id.
+    It equals and hashes like the plain cell tuple, so it can be used wherever a cell is.
+    There is one shared instance per square, see SQUARE_CELLS
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, column: str, row: int):
+        return tuple.__new__(cls, (column, row))
+
+    @property
+    def index(self) -> int:
+        return ord(self[0]) - 97 + (self[1] - 1) * 8
+
+    @property
+    def name(self) -> str:
+        return SQUARE_NAMES[self.index]
+
+    def __reduce__(self):
+        # Unpickles to the shared instance of the receiving process
+        return to_cell, (self.index,)
+
+
+SQUARE_CELLS: List[Square] = [
+    Square(COLUMNS[square % 8], square // 8 + 1) for square in range(BOARD_SIZE)
+]
+SQUARE_NAMES: List[str] = [cell[0] + str(cell[1]) for cell in SQUARE_CELLS]
+
+CELL_SQUARES: Dict[Tuple[str, int], int] = dict()
+# 'e4' and 'E4' -> the shared Square
+NAMED_CELLS: Dict[str, Square] = dict()
+for _square, _cell in enumerate(SQUARE_CELLS):
+    CELL_SQUARES[_cell] = _square
+    CELL_SQUARES[tuple([_cell[0].upper(), _cell[1]])] = _square
+    NAMED_CELLS[SQUARE_NAMES[_square]] = _cell
+    NAMED_CELLS[SQUARE_NAMES[_square].upper()] = _cell
+
+
+def to_square(cell: Tuple[str, int]) -> int:
+    try:
+        return CELL_SQUARES[cell]
+    except (KeyError, TypeError):
+        raise IllegalMoveException(f'Invalid cell: {cell}')
+
+
+def to_cell(square: int) -> Square:
+    return SQUARE_CELLS[square]
+
+
+def square_of(col_index: int, row_index: int) -> int:
+    return row_index * 8 + col_index
+
+
+def col_of(square: int) -> int:
+    return square & 7
+
+
+def row_of(square: int) -> int:
+    return square >> 3
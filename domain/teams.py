@@ -47,3 +47,25 @@ class TeamEnum(Enum):
             return 'N'
         else:
             return 'n'
+
+    def get_opponent(self) -> 'TeamEnum':
+        if self.value == "WHITES":
+            return TeamEnum.BLACKS
+        else:
+            return TeamEnum.WHITES
+
+    def get_king_key(self) -> str:
+        if self.value == "WHITES":
+            return 'K'
+        else:
+            return 'k'
+
+    def get_piece_keys(self) -> str:
+        if self.value == "WHITES":
+            return 'PNBRQK'
+        else:
+            return 'pnbrqk'
+
+    @staticmethod
+    def of_piece(piece: str) -> 'TeamEnum':
+        return TeamEnum.WHITES if piece.isupper() else TeamEnum.BLACKS
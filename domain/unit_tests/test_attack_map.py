@@ -0,0 +1,49 @@
+import unittest
+from domain.chess_board import ChessBoard
+from domain.move import Move
+from domain.teams import TeamEnum
+from logic.move_generation.perft import PERFT_POSITIONS
+
+WHITES = TeamEnum.WHITES.value
+BLACKS = TeamEnum.BLACKS.value
+
+
+class TestAttackMap(unittest.TestCase):
+
+    def test_matches_attackers_of_every_square(self):
+        for name, (board_string, _, _) in PERFT_POSITIONS.items():
+            chess_board = ChessBoard(board_string)
+            for team in [WHITES, BLACKS]:
+                with self.subTest(position=name, team=team):
+                    attack_map = chess_board.get_attack_map(team)
+                    for square in range(64):
+                        attackers = chess_board.bitboards.attackers_to(square, team)
+                        self.assertEqual(bool(attackers), attack_map.is_attacked(square))
+                        self.assertEqual(bin(attackers).count('1'), attack_map.get_attacker_count(square))
+
+    def test_defending_king_does_not_block(self):
+        chess_board = ChessBoard.from_fen('8/8/8/8/r3K3/8/8/7k w - - 0 1')
+        attack_map = chess_board.get_attack_map(BLACKS)
+        self.assertTrue(attack_map.is_attacked(29))
+        self.assertFalse(attack_map.is_attacked(36))
+
+    def test_cached_until_the_board_is_written(self):
+        chess_board = ChessBoard()
+        attack_map = chess_board.get_attack_map(BLACKS)
+        self.assertIs(attack_map, chess_board.get_attack_map(BLACKS))
+        self.assertFalse(attack_map.is_attacked(28))
+
+        chess_board.apply_move(Move(WHITES, 'e2', 'e4', None))
+        chess_board.apply_move(Move(BLACKS, 'd7', 'd5', None))
+        self.assertIsNot(attack_map, chess_board.get_attack_map(BLACKS))
+        self.assertTrue(chess_board.get_attack_map(BLACKS).is_attacked(28))
+
+        with chess_board.probe():
+            chess_board.set_square(35, '.')
+            self.assertFalse(chess_board.get_attack_map(BLACKS).is_attacked(28))
+        self.assertTrue(chess_board.get_attack_map(BLACKS).is_attacked(28))
+        self.assertIsNone(chess_board.copy()._attack_maps)
+
+
+if __name__ == '__main__':
+    unittest.main()
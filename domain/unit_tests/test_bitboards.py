@@ -0,0 +1,64 @@
+import unittest
+from domain.attack_tables import KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS, diagonal_attacks, orthogonal_attacks
+from domain.bitboards import KING, PAWN
+from domain.chess_board import ChessBoard
+from domain.move import Move
+from domain.squares import to_square
+from domain.teams import TeamEnum
+
+
+def _mask(*names: str) -> int:
+    mask = 0
+    for name in names:
+        mask |= 1 << to_square(tuple([name[0], int(name[1])]))
+    return mask
+
+
+class TestAttackTables(unittest.TestCase):
+
+    def test_knight_corner(self):
+        self.assertEqual(_mask('b3', 'c2'), KNIGHT_ATTACKS[to_square(tuple(['a', 1]))])
+
+    def test_king_edge(self):
+        self.assertEqual(_mask('g1', 'g2', 'h2'), KING_ATTACKS[to_square(tuple(['h', 1]))])
+
+    def test_pawns_do_not_wrap(self):
+        self.assertEqual(_mask('b3'), PAWN_ATTACKS[TeamEnum.WHITES.value][to_square(tuple(['a', 2]))])
+        self.assertEqual(_mask('g6'), PAWN_ATTACKS[TeamEnum.BLACKS.value][to_square(tuple(['h', 7]))])
+
+    def test_sliding_attacks_stop_at_blockers(self):
+        occupied = _mask('d6', 'b4')
+        self.assertEqual(
+            _mask('d5', 'd6', 'd3', 'd2', 'd1', 'c4', 'b4', 'e4', 'f4', 'g4', 'h4'),
+            orthogonal_attacks(to_square(tuple(['d', 4])), occupied))
+        self.assertEqual(
+            _mask('b2', 'a1', 'd4', 'e5', 'b4', 'a5', 'd2', 'e1'),
+            diagonal_attacks(to_square(tuple(['c', 3])), _mask('e5')))
+
+
+class TestBitboardSync(unittest.TestCase):
+
+    def test_default_board(self):
+        chess_board = ChessBoard()
+        bitboards = chess_board.bitboards
+        self.assertEqual(0xFFFF, bitboards.occupancy[TeamEnum.WHITES.value])
+        self.assertEqual(0xFFFF << 48, bitboards.occupancy[TeamEnum.BLACKS.value])
+        self.assertEqual(0xFF00, bitboards.get_piece_bitboard(TeamEnum.WHITES.value, PAWN))
+        self.assertEqual(_mask('e8'), bitboards.get_piece_bitboard(TeamEnum.BLACKS.value, KING))
+
+    def test_set_cell_and_apply_move(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('e', 4, 'Q')
+        chess_board.apply_move(Move(TeamEnum.WHITES.value, 'e4', 'e7', None))
+        bitboards = chess_board.bitboards
+        self.assertEqual(0, bitboards.pieces['p'] & _mask('e7'))
+        self.assertEqual(_mask('d1', 'e7'), bitboards.pieces['Q'])
+        self.assertEqual(0, bitboards.occupied & _mask('e4'))
+
+    def test_rays_pass_through_defending_king_only(self):
+        chess_board = ChessBoard(". . . . . . . .;" * 7 + ". . . . . . . .")
+        chess_board._set_cell('a', 1, 'r')
+        chess_board._set_cell('c', 1, 'K')
+        self.assertTrue(chess_board.bitboards.is_attacked(to_square(tuple(['d', 1])), TeamEnum.BLACKS.value))
+        chess_board._set_cell('c', 1, 'N')
+        self.assertFalse(chess_board.bitboards.is_attacked(to_square(tuple(['d', 1])), TeamEnum.BLACKS.value))
@@ -0,0 +1,199 @@
+import unittest
+from domain.chess_board import ChessBoard
+from domain.list_chess_board import ListChessBoard
+from domain.move import Move
+from domain.squares import to_cell, to_square
+from domain.teams import TeamEnum
+from exception.illegal_move_exception import IllegalMoveException
+from exception.no_king_exception import NoKingException
+
+"""""""""""""""""""""""
+UPPERCASE: whites
+lowercase: blacks
+ 8   r n b q k b n r
+ 7   p p p p p p p p
+ 6   . . . . . . . .
+ 5   . . . . . . . .
+ 4   . . . . . . . .
+ 3   . . . . . . . .
+ 2   P P P P P P P P
+ 1   R N B Q K B N R
+
+     A B C D E F G H
+"""""""""""""""""""""""
+
+
+class TestSquares(unittest.TestCase):
+
+    def test_corner_squares(self):
+        self.assertEqual(0, to_square(tuple(['a', 1])))
+        self.assertEqual(7, to_square(tuple(['h', 1])))
+        self.assertEqual(56, to_square(tuple(['a', 8])))
+        self.assertEqual(63, to_square(tuple(['h', 8])))
+
+    def test_round_trip(self):
+        for square in range(64):
+            self.assertEqual(square, to_square(to_cell(square)))
+
+    def test_uppercase_column(self):
+        self.assertEqual(to_square(tuple(['e', 4])), to_square(tuple(['E', 4])))
+
+    def test_out_of_bounds(self):
+        with self.assertRaises(IllegalMoveException):
+            to_square(tuple(['i', 1]))
+        with self.assertRaises(IllegalMoveException):
+            to_square(tuple(['a', 9]))
+
+
+class TestChessBoard(unittest.TestCase):
+
+    def test_default_board_cells(self):
+        chess_board = ChessBoard()
+        self.assertEqual('R', chess_board._get_cell('a', 1))
+        self.assertEqual('K', chess_board._get_cell('e', 1))
+        self.assertEqual('k', chess_board._get_cell('e', 8))
+        self.assertEqual('.', chess_board._get_cell('d', 4))
+
+    def test_square_and_cell_api_agree(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('d', 4, 'Q')
+        self.assertEqual('Q', chess_board.get_square(to_square(tuple(['d', 4]))))
+        chess_board.set_square(to_square(tuple(['h', 5])), 'n')
+        self.assertEqual('n', chess_board.get_cell(tuple(['h', 5])))
+
+    def test_is_in_bounds(self):
+        chess_board = ChessBoard()
+        self.assertTrue(chess_board.is_in_bounds(tuple(['h', 8])))
+        self.assertFalse(chess_board.is_in_bounds(tuple(['i', 8])))
+        self.assertFalse(chess_board.is_in_bounds(tuple(['a', 0])))
+
+    def test_invalid_cell_raises(self):
+        chess_board = ChessBoard()
+        with self.assertRaises(IllegalMoveException):
+            chess_board._get_cell('a', 9)
+
+    def test_apply_move(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('d', 7, 'P')
+        captured = chess_board.apply_move(Move(TeamEnum.WHITES.value, 'd7', 'e8', None))
+        self.assertEqual('k', captured)
+        self.assertEqual('P', chess_board._get_cell('e', 8))
+        self.assertEqual('.', chess_board._get_cell('d', 7))
+
+    def test_matches_list_backend(self):
+        chess_board = ChessBoard()
+        list_chess_board = ListChessBoard()
+        for board in [chess_board, list_chess_board]:
+            board._set_cell('e', 4, 'P')
+            board._set_cell('e', 2, '.')
+            board.apply_move(Move(TeamEnum.BLACKS.value, 'g8', 'f6', None))
+        self.assertEqual(list_chess_board.to_string(), chess_board.to_string())
+
+    def test_board_string_round_trip(self):
+        chess_board = ChessBoard()
+        chess_board.apply_move(Move(TeamEnum.WHITES.value, 'b1', 'c3', None))
+        self.assertEqual(chess_board.to_string(), ChessBoard(chess_board.to_board_string()).to_string())
+
+    def test_ply_counts_moves_not_steps(self):
+        self.assertEqual(0, ChessBoard().get_ply())
+        self.assertEqual(1, ChessBoard.from_fen('r3k2r/8/8/8/8/8/8/R4RK1 b kq - 1 1').get_ply())
+        self.assertEqual(20, ChessBoard.from_fen('4k3/8/8/8/8/8/8/4K3 w - - 0 11').get_ply())
+
+
+class TestPieceLists(unittest.TestCase):
+
+    def test_default_board(self):
+        chess_board = ChessBoard()
+        self.assertEqual(set(range(16)), chess_board.get_team_squares(TeamEnum.WHITES.value))
+        self.assertEqual(set(range(48, 64)), chess_board.get_team_squares(TeamEnum.BLACKS.value))
+        self.assertEqual(to_square(tuple(['e', 1])), chess_board.get_king_square(TeamEnum.WHITES.value))
+
+    def test_capture_updates_both_teams(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('d', 7, 'P')
+        chess_board.apply_move(Move(TeamEnum.WHITES.value, 'd7', 'c8', None))
+        self.assertIn(to_square(tuple(['c', 8])), chess_board.get_team_squares(TeamEnum.WHITES.value))
+        self.assertNotIn(to_square(tuple(['c', 8])), chess_board.get_team_squares(TeamEnum.BLACKS.value))
+        self.assertEqual(14, len(chess_board.get_team_squares(TeamEnum.BLACKS.value)))
+
+    def test_king_on_h_file(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('e', 8, '.')
+        chess_board._set_cell('h', 6, 'k')
+        self.assertEqual(to_square(tuple(['h', 6])), chess_board.get_king_square(TeamEnum.BLACKS.value))
+
+    def test_no_king(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('e', 1, '.')
+        with self.assertRaises(NoKingException):
+            chess_board.get_king_square(TeamEnum.WHITES.value)
+
+
+class TestMaterial(unittest.TestCase):
+
+    def test_piece_counts_follow_captures_and_unmake(self):
+        chess_board = ChessBoard()
+        self.assertEqual(8, chess_board.piece_counts['p'])
+        self.assertEqual(2, chess_board.piece_counts['N'])
+        chess_board._set_cell('d', 7, 'P')
+        self.assertEqual(7, chess_board.piece_counts['p'])
+        chess_board.make_move(Move(TeamEnum.WHITES.value, 'd7', 'c8', None))
+        self.assertEqual(1, chess_board.piece_counts['b'])
+        self.assertEqual(9, chess_board.piece_counts['P'])
+        chess_board.unmake_move()
+        self.assertEqual(2, chess_board.piece_counts['b'])
+        self.assertEqual(chess_board.piece_counts, chess_board.copy().piece_counts)
+
+    def test_insufficient_material(self):
+        for fen, expected in [
+            ('8/8/8/4k3/8/8/8/4K3 w - - 0 1', True),
+            ('8/8/8/4k3/8/8/8/4KN2 w - - 0 1', True),
+            ('8/8/8/4k3/8/8/8/4KB2 w - - 0 1', True),
+            ('8/8/4b3/4k3/8/8/8/4KB2 w - - 0 1', True),
+            ('8/8/5b2/4k3/8/8/8/4KB2 w - - 0 1', False),
+            ('8/8/8/4k3/8/8/8/3NKN2 w - - 0 1', False),
+            ('8/8/8/4k3/8/8/8/4KBn1 w - - 0 1', False),
+            ('8/8/8/4k3/8/8/P7/4K3 w - - 0 1', False),
+            ('8/8/8/4k3/8/8/8/r3K3 w - - 0 1', False),
+        ]:
+            with self.subTest(fen=fen):
+                self.assertEqual(expected, ChessBoard.from_fen(fen).has_insufficient_material())
+
+
+class TestMakeUnmake(unittest.TestCase):
+
+    def test_unmake_restores_capture(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('d', 7, 'P')
+        before = chess_board.to_string()
+        captured = chess_board.make_move(Move(TeamEnum.WHITES.value, 'd7', 'e8', None))
+        self.assertEqual('k', captured)
+        chess_board.unmake_move()
+        self.assertEqual(before, chess_board.to_string())
+        self.assertEqual(to_square(tuple(['e', 8])), chess_board.get_king_square(TeamEnum.BLACKS.value))
+        self.assertEqual(15, len(chess_board.get_team_squares(TeamEnum.BLACKS.value)))
+
+    def test_nested_moves_unmake_in_order(self):
+        chess_board = ChessBoard()
+        before = chess_board.to_string()
+        chess_board.make_move(Move(TeamEnum.WHITES.value, 'e2', 'e4', None))
+        after_first = chess_board.to_string()
+        chess_board.make_move(Move(TeamEnum.BLACKS.value, 'd7', 'd5', None))
+        chess_board.make_move(Move(TeamEnum.WHITES.value, 'e4', 'd5', None))
+        chess_board.unmake_move()
+        chess_board.unmake_move()
+        self.assertEqual(after_first, chess_board.to_string())
+        chess_board.unmake_move()
+        self.assertEqual(before, chess_board.to_string())
+        self.assertEqual([], chess_board.undo_log)
+
+    def test_probe_reverts_on_exit(self):
+        chess_board = ChessBoard()
+        bitboards_before = dict(chess_board.bitboards.pieces)
+        with chess_board.probe():
+            chess_board.apply_move(Move(TeamEnum.WHITES.value, 'g1', 'f3', None))
+            chess_board._set_cell('a', 8, '.')
+            self.assertEqual('N', chess_board._get_cell('f', 3))
+        self.assertEqual('.', chess_board._get_cell('f', 3))
+        self.assertEqual('r', chess_board._get_cell('a', 8))
+        self.assertEqual(bitboards_before, chess_board.bitboards.pieces)
@@ -0,0 +1,81 @@
+import unittest
+from domain.castling_rights import ALL_CASTLING_RIGHTS, BLACK_KINGSIDE, WHITE_QUEENSIDE
+from domain.chess_board import ChessBoard, _get_template
+from domain.fen import STARTING_FEN, parse_fen
+from domain.game import Game
+from domain.move import Move
+from domain.teams import TeamEnum
+from exception.illegal_move_exception import IllegalMoveException
+
+KIWIPETE = 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1'
+EN_PASSANT = 'rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3'
+ENDGAME = '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 b Qk - 12 40'
+
+
+class TestFen(unittest.TestCase):
+
+    def test_round_trip(self):
+        for fen in [STARTING_FEN, KIWIPETE, EN_PASSANT, ENDGAME]:
+            with self.subTest(fen=fen):
+                self.assertEqual(fen, ChessBoard.from_fen(fen).to_fen())
+
+    def test_starting_position_matches_default_board(self):
+        chess_board = ChessBoard.from_fen(STARTING_FEN)
+        default_board = ChessBoard()
+        self.assertEqual(default_board.squares, chess_board.squares)
+        self.assertEqual(default_board.get_state(), chess_board.get_state())
+        self.assertEqual(STARTING_FEN, default_board.to_fen())
+
+    def test_state_fields(self):
+        chess_board = ChessBoard.from_fen(ENDGAME)
+        self.assertEqual(TeamEnum.BLACKS.value, chess_board.side_to_move)
+        self.assertEqual(WHITE_QUEENSIDE | BLACK_KINGSIDE, chess_board.castling_rights)
+        self.assertIsNone(chess_board.en_passant_square)
+        self.assertEqual(12, chess_board.halfmove_clock)
+        self.assertEqual(40, chess_board.fullmove_number)
+        self.assertEqual(chess_board.compute_zobrist_hash(), chess_board.zobrist_hash)
+
+        chess_board = ChessBoard.from_fen(EN_PASSANT)
+        self.assertEqual(45, chess_board.en_passant_square)
+        self.assertEqual(ALL_CASTLING_RIGHTS, chess_board.castling_rights)
+
+    def test_clocks_are_optional(self):
+        position = parse_fen('8/8/8/8/8/8/8/K6k w - -')
+        self.assertEqual(0, position.halfmove_clock)
+        self.assertEqual(1, position.fullmove_number)
+
+    def test_invalid_fen(self):
+        for fen in ['', 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP w KQkq - 0 1',
+                    'rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+                    'rnbqkbnr/ppppxppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+                    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR x KQkq - 0 1',
+                    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KX - 0 1',
+                    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq e9 0 1',
+                    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - a 1']:
+            with self.subTest(fen=fen):
+                with self.assertRaises(IllegalMoveException):
+                    ChessBoard.from_fen(fen)
+
+    def test_templates_are_cached_and_copied(self):
+        first = ChessBoard.from_fen(KIWIPETE)
+        hits = _get_template.cache_info().hits
+        second = ChessBoard.from_fen(KIWIPETE)
+        self.assertEqual(hits + 1, _get_template.cache_info().hits)
+
+        first.apply_move(Move(TeamEnum.WHITES.value, 'e5', 'f7', None))
+        first.end_turn()
+        self.assertEqual(KIWIPETE, second.to_fen())
+        self.assertEqual(KIWIPETE, _get_template(KIWIPETE).to_fen())
+        self.assertNotIn(53, second.get_team_squares(TeamEnum.WHITES.value))
+        self.assertEqual(second.compute_zobrist_hash(), second.zobrist_hash)
+        self.assertEqual(first.compute_zobrist_hash(), first.zobrist_hash)
+
+    def test_game_from_fen(self):
+        game = Game.from_fen(KIWIPETE)
+        self.assertEqual(KIWIPETE, game.to_fen())
+        self.assertEqual([], game.move_history)
+        self.assertEqual(STARTING_FEN, Game().to_fen())
+
+
+if __name__ == '__main__':
+    unittest.main()
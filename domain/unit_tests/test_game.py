@@ -0,0 +1,110 @@
+import unittest
+from domain.fen import STARTING_FEN
+from domain.game import Game
+from domain.game_status import GameStatusEnum
+from domain.move import Move
+from domain.teams import TeamEnum
+from exception.illegal_move_exception import IllegalMoveException
+
+
+class TestGameSpecialMoves(unittest.TestCase):
+
+    def test_castle(self):
+        game = Game()
+        game.chess_board._set_cell('f', 1, '.')
+        game.chess_board._set_cell('g', 1, '.')
+        game.make_move(Move(TeamEnum.WHITES.value, 'e1', 'h1', None))
+        self.assertEqual('K', game.chess_board._get_cell('g', 1))
+        self.assertEqual('R', game.chess_board._get_cell('f', 1))
+        self.assertEqual(2, len(game.move_history))
+        self.assertEqual(TeamEnum.BLACKS.value, game.chess_board.side_to_move)
+
+    def test_ordinary_moves(self):
+        game = Game()
+        game.make_move(Move(TeamEnum.WHITES.value, 'e2', 'e4', None))
+        game.make_move(Move(TeamEnum.BLACKS.value, 'g8', 'f6', None))
+        with self.assertRaises(IllegalMoveException):
+            game.make_move(Move(TeamEnum.WHITES.value, 'f1', 'g2', None))
+        game.make_move(Move(TeamEnum.WHITES.value, 'f1', 'b5', None))
+        self.assertEqual('rnbqkb1r/pppppppp/5n2/1B6/4P3/8/PPPP1PPP/RNBQK1NR b KQkq - 2 2', game.to_fen())
+        self.assertEqual(3, len(game.move_history))
+
+    def test_unrecordable_move_leaves_game_untouched(self):
+        for fen, cell_from, cell_to, additional_data in [
+            (STARTING_FEN, 'e2', 'e4', 'hello'),
+            (STARTING_FEN, 'e2', 'e4', 'Q'),
+            ('r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1', 'e1', 'h1', 'hello'),
+        ]:
+            with self.subTest(move=(cell_from, cell_to, additional_data)):
+                game = Game.from_fen(fen)
+                fen_before = game.to_fen()
+                with self.assertRaises(IllegalMoveException):
+                    game.make_move(Move(TeamEnum.WHITES.value, cell_from, cell_to, additional_data))
+                self.assertEqual(fen_before, game.to_fen())
+                self.assertEqual([], game.move_history)
+
+    def test_illegal_castle_leaves_game_untouched(self):
+        game = Game()
+        board_before = game.chess_board.to_board_string()
+        with self.assertRaises(IllegalMoveException):
+            game.make_move(Move(TeamEnum.WHITES.value, 'e1', 'h1', None))
+        self.assertEqual(board_before, game.chess_board.to_board_string())
+        self.assertEqual([], game.move_history)
+
+    def test_move_out_of_turn_is_rejected(self):
+        game = Game()
+        game.chess_board._set_cell('f', 8, '.')
+        game.chess_board._set_cell('g', 8, '.')
+        board_before = game.chess_board.to_board_string()
+        with self.assertRaises(IllegalMoveException):
+            game.make_move(Move(TeamEnum.BLACKS.value, 'e8', 'h8', None))
+        self.assertEqual(board_before, game.chess_board.to_board_string())
+        self.assertEqual(TeamEnum.WHITES.value, game.chess_board.side_to_move)
+        self.assertEqual(1, game.chess_board.fullmove_number)
+
+
+class TestGameStatus(unittest.TestCase):
+
+    def play(self, game: Game, moves: str):
+        for index, move in enumerate(moves.split()):
+            team = TeamEnum.WHITES.value if index % 2 == 0 else TeamEnum.BLACKS.value
+            game.make_move(Move(team, move[:2], move[2:], None))
+
+    def test_threefold_repetition(self):
+        game = Game()
+        self.play(game, 'g1f3 g8f6 f3g1 f6g8 g1f3 g8f6 f3g1')
+        self.assertEqual(GameStatusEnum.ONGOING, game.status)
+        game.make_move(Move(TeamEnum.BLACKS.value, 'f6', 'g8', None))
+        self.assertEqual(GameStatusEnum.THREEFOLD_REPETITION, game.status)
+        self.assertTrue(game.status.is_draw())
+        game.make_move(Move(TeamEnum.WHITES.value, 'e2', 'e4', None))
+        self.assertEqual(GameStatusEnum.ONGOING, game.status)
+        self.assertEqual(1, len(game.position_counts))
+
+    def test_fifty_move_rule(self):
+        game = Game.from_fen('4k3/8/8/8/8/8/8/R3K3 w - - 98 60')
+        self.play(game, 'a1a2')
+        self.assertEqual(GameStatusEnum.ONGOING, game.status)
+        game.make_move(Move(TeamEnum.BLACKS.value, 'e8', 'd8', None))
+        self.assertEqual(GameStatusEnum.FIFTY_MOVE_RULE, game.status)
+
+    def test_insufficient_material(self):
+        game = Game.from_fen('4k3/8/8/8/8/8/3r4/4KB2 w - - 0 1')
+        self.assertEqual(GameStatusEnum.ONGOING, game.status)
+        self.play(game, 'e1d2')
+        self.assertEqual(GameStatusEnum.INSUFFICIENT_MATERIAL, game.status)
+
+    def test_checkmate(self):
+        game = Game()
+        self.play(game, 'f2f3 e7e5 g2g4')
+        self.assertEqual(GameStatusEnum.ONGOING, game.status)
+        game.make_move(Move(TeamEnum.BLACKS.value, 'd8', 'h4', None))
+        self.assertEqual(GameStatusEnum.CHECKMATE, game.status)
+        self.assertFalse(game.status.is_draw())
+
+    def test_stalemate(self):
+        game = Game.from_fen('7k/8/5Q2/6K1/8/8/8/8 w - - 0 1')
+        game.make_move(Move(TeamEnum.WHITES.value, 'f6', 'f7', None))
+        self.assertEqual(GameStatusEnum.STALEMATE, game.status)
+        self.assertTrue(game.status.is_draw())
+        self.assertEqual(GameStatusEnum.CHECKMATE, Game.from_fen('7k/6Q1/6K1/8/8/8/8/8 b - - 0 1').status)
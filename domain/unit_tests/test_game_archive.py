@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from domain.game import Game
+from domain.game_archive import GameArchive
+from domain.unit_tests.test_game_snapshot import _play_random_game
+from exception.invalid_archive_exception import InvalidArchiveException
+from exception.no_such_game_exception import NoSuchGameException
+from logic.move_generation.perft import PERFT_POSITIONS
+
+
+class TestGameArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'games.csa')
+        self.games = [_play_random_game(PERFT_POSITIONS['initial'][0], 10 + seed, seed) for seed in range(5)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertSameGame(self, expected: Game, actual: Game):
+        self.assertEqual(expected.chess_board.squares, actual.chess_board.squares)
+        self.assertEqual(expected.chess_board.get_state(), actual.chess_board.get_state())
+        self.assertEqual(expected.move_history, actual.move_history)
+
+    def test_lookup_by_id(self):
+        with GameArchive(self.path) as archive:
+            self.assertEqual([0, 1, 2, 3, 4], [archive.append(game) for game in self.games])
+            self.assertSameGame(self.games[3], archive.load(3))
+            self.assertSameGame(self.games[0], archive.load(0))
+            self.assertEqual(len(self.games[4].move_history), archive.get_record(4).get_header().steps)
+
+    def test_reopen_and_append(self):
+        with GameArchive(self.path) as archive:
+            for game in self.games[:3]:
+                archive.append(game)
+        with GameArchive(self.path) as archive:
+            self.assertEqual(3, len(archive))
+            self.assertSameGame(self.games[2], archive.load(2))
+            for game in self.games[3:]:
+                archive.append(game)
+            self.assertSameGame(self.games[4], archive.load(4))
+            self.assertSameGame(self.games[1], archive.load(1))
+
+    def test_scan(self):
+        with GameArchive(self.path) as archive:
+            for game in self.games:
+                archive.append(game)
+            records = list(archive.scan())
+            self.assertEqual([0, 1, 2, 3, 4], [record.game_id for record in records])
+            for game, record in zip(self.games, records):
+                self.assertIsInstance(record.data, memoryview)
+                self.assertSameGame(game, record.load())
+            self.assertEqual([3, 4], [record.game_id for record in archive.scan(3)])
+            del records, record
+
+    def test_unindexed_record_is_ignored(self):
+        with GameArchive(self.path) as archive:
+            archive.append(self.games[0])
+        with open(self.path, 'ab') as data_file:
+            data_file.write(b'torn record')
+        with open(self.path + '.idx', 'ab') as index_file:
+            index_file.write(b'\x01\x02')
+        with GameArchive(self.path) as archive:
+            self.assertEqual(1, len(archive))
+            archive.append(self.games[1])
+            self.assertSameGame(self.games[1], archive.load(1))
+
+    def test_errors(self):
+        with GameArchive(self.path) as archive:
+            archive.append(self.games[0])
+            for game_id in [-1, 1]:
+                with self.assertRaises(NoSuchGameException):
+                    archive.get_record(game_id)
+        with open(self.path, 'r+b') as data_file:
+            data_file.write(b'XYZ')
+        with self.assertRaises(InvalidArchiveException):
+            GameArchive(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import random
+import unittest
+from domain.chess_board import ChessBoard
+from domain.game import Game
+from domain.game_status import GameStatusEnum
+from domain.game_snapshot import dumps, loads
+from domain.move import Move
+from domain.teams import TeamEnum
+from exception.invalid_snapshot_exception import InvalidSnapshotException
+from logic.move_generation.move_generator import STANDARD_SPECIAL_MOVES, generate_legal_moves
+from logic.move_generation.perft import PERFT_POSITIONS
+from logic.special_move_registry import get_special_move_registry
+
+WHITES = TeamEnum.WHITES.value
+BLACKS = TeamEnum.BLACKS.value
+
+
+def _play_random_game(board_string: str, plies: int, seed: int) -> Game:
+    """
+    Plays generated legal moves without going through the elector
+    """
+    game = Game(chess_board=ChessBoard(board_string))
+    randomizer = random.Random(seed)
+    for _ in range(plies):
+        chess_board = game.chess_board
+        moves = generate_legal_moves(chess_board.side_to_move, chess_board, STANDARD_SPECIAL_MOVES)
+        if not moves:
+            break
+        move = randomizer.choice(moves)
+        special_move = get_special_move_registry(game.rule_set).find(move, chess_board)
+        if special_move is not None:
+            game.move_history.append_special_steps(special_move.create_executor(move)(chess_board))
+        else:
+            chess_board.apply_move(move)
+            game.move_history.append(move)
+        chess_board.end_turn()
+    return game
+
+
+class TestGameSnapshot(unittest.TestCase):
+
+    def assertSameGame(self, expected: Game, actual: Game):
+        self.assertEqual(expected.chess_board.squares, actual.chess_board.squares)
+        self.assertEqual(expected.chess_board.get_state(), actual.chess_board.get_state())
+        self.assertEqual(expected.move_history, actual.move_history)
+        self.assertEqual(expected.position_counts, actual.position_counts)
+
+    def test_round_trip(self):
+        for seed, (board_string, _, _) in enumerate(PERFT_POSITIONS.values()):
+            with self.subTest(seed=seed):
+                game = _play_random_game(board_string, 60, seed)
+                self.assertSameGame(game, loads(dumps(game)))
+
+    def test_special_steps_are_kept(self):
+        game = Game.from_fen('r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1')
+        game.make_move(Move(WHITES, 'e1', 'h1', None))
+        game.make_move(Move(BLACKS, 'a8', 'b8', None))
+        restored = loads(dumps(game))
+        self.assertEqual([True, True, False],
+                         [restored.move_history.is_special_step(index) for index in range(3)])
+
+    def test_repetitions_are_kept(self):
+        game = Game()
+        for _ in range(2):
+            for move in [Move(WHITES, 'g1', 'f3', None), Move(BLACKS, 'g8', 'f6', None),
+                         Move(WHITES, 'f3', 'g1', None), Move(BLACKS, 'f6', 'g8', None)]:
+                game.make_move(move)
+        restored = loads(dumps(game))
+        self.assertSameGame(game, restored)
+        self.assertEqual(GameStatusEnum.THREEFOLD_REPETITION, restored.status)
+
+    def test_reads_version_2(self):
+        game = _play_random_game(PERFT_POSITIONS['kiwipete'][0], 20, 1)
+        snapshot = dumps(game)
+        version_2 = snapshot[:3] + b'\x02' + snapshot[4:-(4 + 10 * len(game.position_counts))]
+        # Older snapshots only know the restored position
+        game.position_counts = {game.chess_board.zobrist_hash: 1}
+        self.assertSameGame(game, loads(version_2))
+
+    def test_reads_version_1(self):
+        game = _play_random_game(PERFT_POSITIONS['kiwipete'][0], 20, 1)
+        snapshot = dumps(game)
+        version_1 = snapshot[:3] + b'\x01' + \
+            snapshot[4:-((len(game.move_history) + 7) // 8 + 4 + 10 * len(game.position_counts))]
+        restored = loads(version_1)
+        game.position_counts = {game.chess_board.zobrist_hash: 1}
+        self.assertSameGame(game, restored)
+        self.assertFalse(any(restored.move_history.is_special_step(index)
+                             for index in range(len(restored.move_history))))
+
+    def test_new_game_is_compact(self):
+        snapshot = dumps(Game())
+        self.assertEqual(62, len(snapshot))
+        self.assertSameGame(Game(), loads(snapshot))
+
+    def test_loads_from_memoryview_slice(self):
+        games = [_play_random_game(PERFT_POSITIONS['kiwipete'][0], 20, seed) for seed in range(3)]
+        snapshots = [dumps(game) for game in games]
+        buffer = memoryview(b''.join(snapshots))
+        offset = len(snapshots[0])
+        restored = loads(buffer[offset:offset + len(snapshots[1])])
+        self.assertSameGame(games[1], restored)
+
+    def test_restored_game_keeps_playing(self):
+        game = loads(dumps(_play_random_game(PERFT_POSITIONS['initial'][0], 10, 3)))
+        self.assertEqual(game.chess_board.compute_zobrist_hash(), game.chess_board.zobrist_hash)
+        self.assertTrue(generate_legal_moves(game.chess_board.side_to_move, game.chess_board))
+
+    def test_invalid_snapshots(self):
+        snapshot = dumps(_play_random_game(PERFT_POSITIONS['initial'][0], 10, 3))
+        for data in [b'', b'XYZ' + snapshot[3:], snapshot[:-3], snapshot[:20] + b'\xff' + snapshot[21:]]:
+            with self.assertRaises(InvalidSnapshotException):
+                loads(data)
@@ -0,0 +1,67 @@
+import unittest
+from domain import attack_tables, instrumentation
+from domain.chess_board import ChessBoard
+from domain.game import Game
+from domain.instrumentation import Histogram
+from domain.move import Move
+from domain.teams import TeamEnum
+from exception.illegal_move_exception import IllegalMoveException
+
+CASTLES = 'r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1'
+WHITES = TeamEnum.WHITES.value
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def test_disabled_records_nothing_and_wraps_nothing(self):
+        get_square, ray_attacks = ChessBoard.get_square, attack_tables.ray_attacks
+        instrumentation.enable()
+        self.assertIsNot(get_square, ChessBoard.get_square)
+        instrumentation.disable()
+        self.assertIs(get_square, ChessBoard.get_square)
+        self.assertIs(ray_attacks, attack_tables.ray_attacks)
+
+        Game.from_fen(CASTLES).make_move(Move(WHITES, 'e1', 'h1', None))
+        self.assertEqual({'enabled': False, 'counters': {}, 'histograms': {}}, instrumentation.snapshot())
+
+    def test_phases_per_special_move(self):
+        instrumentation.enable()
+        Game.from_fen(CASTLES).make_move(Move(WHITES, 'e1', 'h1', None))
+        with self.assertRaises(IllegalMoveException):
+            Game.from_fen('r3k2r/8/8/8/8/8/8/R3K2R w - - 0 1').make_move(Move(WHITES, 'e1', 'h1', None))
+
+        metrics = instrumentation.snapshot()
+        self.assertEqual(1, metrics['counters']['make_move.ok.Castle'])
+        self.assertEqual(1, metrics['counters']['make_move.IllegalMoveException.Castle'])
+        self.assertEqual(3, metrics['counters']['is_in_check'])
+        self.assertGreater(metrics['counters']['board.cells_read'], 0)
+        self.assertEqual(2, metrics['histograms']['make_move.identify.Castle']['count'])
+        for phase in ['validate', 'construct', 'apply']:
+            self.assertEqual(1, metrics['histograms'][f'make_move.{phase}.Castle']['count'])
+        self.assertEqual(2, metrics['histograms']['make_move.total.Castle']['count'])
+        self.assertEqual(2, metrics['histograms']['special_move.validate.Castle']['count'])
+        self.assertIn('histogram make_move.total.Castle count=2 ', instrumentation.export_text(metrics))
+
+    def test_rays_walked(self):
+        instrumentation.enable()
+        chess_board = ChessBoard.from_fen('4k3/8/8/8/Q7/8/8/4K3 w - - 0 1')
+        self.assertTrue(chess_board.bitboards.is_attacked(60, WHITES))
+        self.assertEqual(4, instrumentation.snapshot()['counters']['board.rays_walked'])
+
+    def test_histogram(self):
+        histogram = Histogram()
+        for duration_ns in [100] * 98 + [5000, 70000]:
+            histogram.record(duration_ns)
+        self.assertEqual(100, histogram.count)
+        self.assertEqual(70000, histogram.max_ns)
+        self.assertEqual(128, histogram.percentile_ns(0.5))
+        self.assertEqual(8192, histogram.percentile_ns(0.99))
+        self.assertEqual(70000, histogram.percentile_ns(1.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import pickle
+import unittest
+from domain.move import Move
+from domain.squares import SQUARE_CELLS, SQUARE_NAMES, to_cell
+from domain.teams import TeamEnum
+from exception.illegal_move_exception import IllegalMoveException
+
+
+class TestMove(unittest.TestCase):
+
+    def test_cells_are_shared_squares(self):
+        move = Move(TeamEnum.WHITES.value, 'E2', 'e4', None)
+        self.assertIs(SQUARE_CELLS[12], move.get_cell_from())
+        self.assertEqual(tuple(['e', 4]), move.get_cell_to())
+        self.assertEqual(28, move.get_cell_to().index)
+
+    def test_code_round_trip_for_every_square_pair(self):
+        for square_from, name_from in enumerate(SQUARE_NAMES):
+            for square_to, name_to in enumerate(SQUARE_NAMES):
+                move = Move(TeamEnum.BLACKS.value, name_from, name_to, None)
+                code = move.to_code()
+                self.assertLess(code, 1 << 16)
+                self.assertEqual(move, Move.from_code(code, TeamEnum.BLACKS.value))
+
+    def test_code_round_trip_for_promotions(self):
+        for piece in ['Q', 'R', 'B', 'N']:
+            move = Move(TeamEnum.WHITES.value, 'g7', 'g8', piece)
+            self.assertEqual(move, Move.from_code(move.to_code(), TeamEnum.WHITES.value))
+        lowercase = Move(TeamEnum.BLACKS.value, 'b2', 'b1', 'n')
+        self.assertEqual('N', Move.from_code(lowercase.to_code(), TeamEnum.BLACKS.value).get_additional_data())
+
+    def test_to_code_rejects_unencodable_moves(self):
+        with self.assertRaises(IllegalMoveException):
+            Move(TeamEnum.WHITES.value, 'e8', 'e9', None).to_code()
+        with self.assertRaises(IllegalMoveException):
+            Move(TeamEnum.WHITES.value, 'g7', 'g8', 'K').to_code()
+        with self.assertRaises(IllegalMoveException):
+            Move(TeamEnum.WHITES.value, 'g7', 'g8', 'QQ').to_code()
+
+    def test_from_code_rejects_invalid_codes(self):
+        for code in [-1, 1 << 16, 2 << 12, 3 << 12, 1 << 14]:
+            with self.assertRaises(IllegalMoveException):
+                Move.from_code(code, TeamEnum.WHITES.value)
+
+    def test_moves_compare_by_value(self):
+        move = Move(TeamEnum.WHITES.value, 'e2', 'e4', None)
+        self.assertEqual(move, Move.from_squares(TeamEnum.WHITES.value, 12, 28))
+        self.assertNotEqual(move, Move(TeamEnum.BLACKS.value, 'e2', 'e4', None))
+        self.assertEqual(1, len({move, Move(TeamEnum.WHITES.value, 'e2', 'e4', None)}))
+
+    def test_pickling_keeps_shared_squares(self):
+        self.assertIs(to_cell(63), pickle.loads(pickle.dumps(to_cell(63))))
+        move = pickle.loads(pickle.dumps(Move(TeamEnum.WHITES.value, 'a1', 'h8', None)))
+        self.assertIs(SQUARE_CELLS[0], move.get_cell_from())
+        self.assertIs(SQUARE_CELLS[63], move.get_cell_to())
+
+    def test_invalid_cells(self):
+        with self.assertRaises(IllegalMoveException):
+            Move(TeamEnum.WHITES.value, '2e', 'e4', None)
+        with self.assertRaises(IllegalMoveException):
+            Move(TeamEnum.WHITES.value, 'e2', 'e44', None)
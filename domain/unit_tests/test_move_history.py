@@ -0,0 +1,65 @@
+import pickle
+import unittest
+from domain.move import Move
+from domain.move_history import MoveHistory, MoveHistoryView
+from domain.teams import TeamEnum
+
+WHITES = TeamEnum.WHITES.value
+BLACKS = TeamEnum.BLACKS.value
+MOVES = [
+    Move(WHITES, 'e2', 'e4', None),
+    Move(BLACKS, 'e7', 'e5', None),
+    Move(WHITES, 'g1', 'f3', None),
+    Move(BLACKS, 'b7', 'b1', 'Q'),
+]
+
+
+class TestMoveHistory(unittest.TestCase):
+
+    def test_behaves_as_a_list_of_moves(self):
+        history = MoveHistory(MOVES)
+        self.assertEqual(4, len(history))
+        self.assertEqual(MOVES[1], history[1])
+        self.assertEqual(MOVES[3], history[-1])
+        self.assertEqual(MOVES, list(history))
+        self.assertEqual(MOVES, history)
+        self.assertEqual(history, MOVES)
+        self.assertNotEqual(MOVES[:3], history)
+        self.assertIn(MOVES[2], history)
+        self.assertEqual(2, history.index(MOVES[2]))
+        self.assertEqual([], MoveHistory())
+        with self.assertRaises(IndexError):
+            history[4]
+
+    def test_slices_are_views(self):
+        history = MoveHistory(MOVES)
+        view = history[1:]
+        self.assertIsInstance(view, MoveHistoryView)
+        self.assertEqual(MOVES[1:], view)
+        self.assertEqual(MOVES[1::2], view[::2])
+        self.assertEqual(MOVES[-1], view[-1])
+        self.assertEqual(history[:-1], MoveHistory(MOVES[:-1]))
+
+        history.append(Move(WHITES, 'f1', 'c4', None))
+        self.assertEqual(MOVES[1:], view)
+        self.assertEqual(5, len(history))
+
+    def test_special_steps(self):
+        history = MoveHistory(MOVES[:1])
+        steps = [Move(BLACKS, 'e8', 'g8', None), Move(BLACKS, 'h8', 'f8', None)]
+        history.append_special_steps(steps)
+        self.assertEqual([False, True, True], [history.is_special_step(index) for index in range(3)])
+        self.assertTrue(history[1:].is_special_step(0))
+        self.assertEqual(MOVES[:1] + steps, history)
+        self.assertEqual(MoveHistory(MOVES[:1] + steps), history)
+
+    def test_pickles(self):
+        history = MoveHistory(MOVES)
+        history.append_special_steps([Move(WHITES, 'e1', 'g1', None)])
+        restored = pickle.loads(pickle.dumps(history))
+        self.assertEqual(history, restored)
+        self.assertTrue(restored.is_special_step(4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import random
+import tempfile
+import threading
+import unittest
+from domain.game import Game
+from domain.move import Move
+from domain.move_log import Durability, MoveLog, recover
+from domain.teams import TeamEnum
+from logic.move_generation.move_generator import STANDARD_SPECIAL_MOVES, generate_legal_moves
+
+CASTLES = 'r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1'
+
+
+def _play_random_moves(log: MoveLog, game_id: str, game: Game, plies: int, seed: int):
+    """
+    Plays generated legal moves without going through the elector and logs them as make_move would
+    """
+    randomizer = random.Random(seed)
+    for _ in range(plies):
+        chess_board = game.chess_board
+        moves = generate_legal_moves(chess_board.side_to_move, chess_board, STANDARD_SPECIAL_MOVES)
+        if not moves:
+            break
+        move = randomizer.choice(moves)
+        game.replay_move(move)
+        log.log_move(game_id, move)
+
+
+class TestMoveLog(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertSameGames(self, expected: dict, actual: dict):
+        self.assertEqual(sorted(expected), sorted(actual))
+        for game_id, game in expected.items():
+            self.assertEqual(game.chess_board.squares, actual[game_id].chess_board.squares)
+            self.assertEqual(game.chess_board.get_state(), actual[game_id].chess_board.get_state())
+            self.assertEqual(game.move_history, actual[game_id].move_history)
+
+    def test_recover_at_every_durability(self):
+        for durability in Durability:
+            with self.subTest(durability=durability):
+                path = os.path.join(self.path, durability.value)
+                games = {str(number): Game() for number in range(3)}
+                with MoveLog(path, durability) as log:
+                    for game_id, game in games.items():
+                        log.track(game_id, game)
+                        _play_random_moves(log, game_id, game, 30, int(game_id))
+                self.assertSameGames(games, recover(path))
+
+    def test_make_move_is_logged(self):
+        game = Game.from_fen(CASTLES)
+        with MoveLog(self.path) as log:
+            log.track('castles', game)
+            game.make_move(Move(TeamEnum.WHITES.value, 'e1', 'h1', None))
+            game.make_move(Move(TeamEnum.BLACKS.value, 'e8', 'a8', None))
+        recovered = recover(self.path)['castles']
+        self.assertEqual('2kr3r/8/8/8/8/8/8/R4RK1 w - - 2 2', recovered.to_fen())
+        self.assertEqual(game.move_history, recovered.move_history)
+
+    def test_closed_games_are_dropped(self):
+        games = {'1': Game(), '2': Game()}
+        with MoveLog(self.path) as log:
+            for game_id, game in games.items():
+                log.track(game_id, game)
+            _play_random_moves(log, '1', games['1'], 10, 1)
+            log.close_game('2')
+        del games['2']
+        self.assertSameGames(games, recover(self.path))
+
+    def test_checkpoint(self):
+        games = {'1': Game(), '2': Game()}
+        with MoveLog(self.path) as log:
+            for game_id, game in games.items():
+                log.track(game_id, game)
+                _play_random_moves(log, game_id, game, 20, int(game_id))
+            log.checkpoint()
+            self.assertEqual(['moves-000002.log'], os.listdir(self.path))
+            self.assertSameGames(games, recover(self.path))
+            _play_random_moves(log, '2', games['2'], 20, 5)
+        self.assertSameGames(games, recover(self.path))
+
+    def test_reopened_log_keeps_recovered_games(self):
+        games = {'1': Game()}
+        with MoveLog(self.path) as log:
+            log.track('1', games['1'])
+            _play_random_moves(log, '1', games['1'], 10, 1)
+        recovered = recover(self.path)
+        with MoveLog(self.path) as log:
+            for game_id, game in recovered.items():
+                log.track(game_id, game)
+            _play_random_moves(log, '1', recovered['1'], 10, 2)
+            log.checkpoint()
+        self.assertEqual(['moves-000003.log'], os.listdir(self.path))
+        self.assertSameGames(recovered, recover(self.path))
+
+    def test_torn_tail_is_ignored(self):
+        game = Game()
+        with MoveLog(self.path) as log:
+            log.track('1', game)
+            _play_random_moves(log, '1', game, 10, 1)
+        segment = os.path.join(self.path, 'moves-000001.log')
+        with open(segment, 'rb+') as segment_file:
+            segment_file.truncate(os.path.getsize(segment) - 2)
+        recovered = recover(self.path)['1']
+        self.assertEqual(game.move_history[:-1], recovered.move_history)
+
+    def test_group_commit_from_many_threads(self):
+        games = {str(number): Game() for number in range(8)}
+        with MoveLog(self.path, Durability.SYNC) as log:
+            for game_id, game in games.items():
+                log.track(game_id, game)
+            threads = [threading.Thread(target=_play_random_moves, args=(log, game_id, game, 20, int(game_id)))
+                       for game_id, game in games.items()]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertSameGames(games, recover(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
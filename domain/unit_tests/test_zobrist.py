@@ -0,0 +1,104 @@
+import subprocess
+import sys
+import unittest
+from domain.castling_rights import ALL_CASTLING_RIGHTS, BLACK_KINGSIDE, BLACK_QUEENSIDE, WHITE_QUEENSIDE
+from domain.chess_board import ChessBoard
+from domain.move import Move
+from domain.squares import to_square
+from domain.teams import TeamEnum
+from logic.move_constructors import create_castle_steps, create_en_passant_steps
+
+
+def _play(chess_board: ChessBoard, *moves: str):
+    for move in moves:
+        team = chess_board.side_to_move
+        chess_board.apply_move(Move(team, move[:2], move[2:], None))
+        chess_board.end_turn()
+
+
+class TestZobristHash(unittest.TestCase):
+
+    def test_incremental_hash_matches_recomputed_hash(self):
+        chess_board = ChessBoard()
+        _play(chess_board, 'e2e4', 'd7d5', 'e4d5', 'g8f6', 'f1b5', 'c7c6')
+        self.assertEqual(chess_board.compute_zobrist_hash(), chess_board.zobrist_hash)
+
+    def test_transpositions_hash_equal(self):
+        first_board = ChessBoard()
+        second_board = ChessBoard()
+        _play(first_board, 'g1f3', 'g8f6', 'b1c3', 'b8c6')
+        _play(second_board, 'b1c3', 'b8c6', 'g1f3', 'g8f6')
+        self.assertEqual(first_board.zobrist_hash, second_board.zobrist_hash)
+
+    def test_side_to_move_changes_hash(self):
+        self.assertNotEqual(
+            ChessBoard(side_to_move=TeamEnum.WHITES.value).zobrist_hash,
+            ChessBoard(side_to_move=TeamEnum.BLACKS.value).zobrist_hash)
+
+    def test_en_passant_file_changes_hash(self):
+        first_board = ChessBoard()
+        second_board = ChessBoard()
+        _play(first_board, 'e2e4')
+        _play(second_board, 'e2e4')
+        self.assertEqual(to_square(tuple(['e', 3])), first_board.en_passant_square)
+        second_board.set_en_passant_square(None)
+        self.assertEqual(first_board.squares, second_board.squares)
+        self.assertNotEqual(first_board.zobrist_hash, second_board.zobrist_hash)
+        _play(first_board, 'a7a6')
+        self.assertIsNone(first_board.en_passant_square)
+        self.assertEqual(first_board.compute_zobrist_hash(), first_board.zobrist_hash)
+
+    def test_castling_rights_follow_moves(self):
+        chess_board = ChessBoard()
+        self.assertEqual(ALL_CASTLING_RIGHTS, chess_board.castling_rights)
+        _play(chess_board, 'b1c3', 'h7h5', 'a1b1', 'h8h6')
+        self.assertEqual(ALL_CASTLING_RIGHTS & ~WHITE_QUEENSIDE & ~BLACK_KINGSIDE, chess_board.castling_rights)
+        self.assertEqual(chess_board.compute_zobrist_hash(), chess_board.zobrist_hash)
+
+    def test_special_moves_keep_hash_in_sync(self):
+        chess_board = ChessBoard()
+        for col in ['b', 'c', 'd']:
+            chess_board._set_cell(col, 8, '.')
+        chess_board._set_cell('e', 4, 'p')
+        chess_board._set_cell('d', 4, 'P')
+        create_castle_steps(Move(TeamEnum.BLACKS.value, 'e8', 'a8', None))(chess_board)
+        self.assertEqual(ALL_CASTLING_RIGHTS & ~BLACK_KINGSIDE & ~BLACK_QUEENSIDE, chess_board.castling_rights)
+        create_en_passant_steps(Move(TeamEnum.BLACKS.value, 'e4', 'd3', None))(chess_board)
+        self.assertEqual(chess_board.compute_zobrist_hash(), chess_board.zobrist_hash)
+
+    def test_unmake_restores_hash_and_state(self):
+        chess_board = ChessBoard()
+        hash_before = chess_board.zobrist_hash
+        chess_board.make_move(Move(TeamEnum.WHITES.value, 'e2', 'e4', None))
+        chess_board.switch_side_to_move()
+        self.assertNotEqual(hash_before, chess_board.zobrist_hash)
+        chess_board.unmake_move()
+        self.assertEqual(hash_before, chess_board.zobrist_hash)
+        self.assertEqual(TeamEnum.WHITES.value, chess_board.side_to_move)
+        self.assertIsNone(chess_board.en_passant_square)
+
+    def test_clocks_follow_moves(self):
+        chess_board = ChessBoard()
+        _play(chess_board, 'g1f3', 'g8f6', 'f3g1')
+        self.assertEqual(3, chess_board.halfmove_clock)
+        self.assertEqual(2, chess_board.fullmove_number)
+        _play(chess_board, 'e7e5')
+        self.assertEqual(0, chess_board.halfmove_clock)
+        self.assertEqual(3, chess_board.fullmove_number)
+        _play(chess_board, 'b1c3', 'f6e4', 'c3e4')
+        self.assertEqual(0, chess_board.halfmove_clock)
+
+    def test_unmake_restores_clocks(self):
+        chess_board = ChessBoard()
+        _play(chess_board, 'g1f3', 'g8f6')
+        state = chess_board.get_state()
+        chess_board.make_move(Move(TeamEnum.WHITES.value, 'e2', 'e4', None))
+        chess_board.end_turn()
+        chess_board.unmake_move()
+        self.assertEqual(state, chess_board.get_state())
+        self.assertEqual(2, chess_board.halfmove_clock)
+
+    def test_hash_is_stable_across_processes(self):
+        output = subprocess.check_output(
+            [sys.executable, '-c', 'from domain.chess_board import ChessBoard; print(ChessBoard().zobrist_hash)'])
+        self.assertEqual(ChessBoard().zobrist_hash, int(output))
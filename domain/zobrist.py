@@ -0,0 +1,22 @@
+import random
+from typing import Dict, List
+
+from domain.bitboards import PIECE_KEYS
+from domain.squares import BOARD_SIZE
+from domain.teams import TeamEnum
+
+"""
+Zobrist keys. The seed is fixed so hashes are the same in every process and run
+"""
+
+ZOBRIST_SEED = 0x5EED_C4E55
+
+_random = random.Random(ZOBRIST_SEED)
+
+PIECE_SQUARE_KEYS: Dict[str, List[int]] = {
+    piece: [_random.getrandbits(64) for _ in range(BOARD_SIZE)]
+    for piece in PIECE_KEYS[TeamEnum.WHITES.value] + PIECE_KEYS[TeamEnum.BLACKS.value]
+}
+BLACKS_TO_MOVE_KEY: int = _random.getrandbits(64)
+CASTLING_KEYS: List[int] = [_random.getrandbits(64) for _ in range(16)]
+EN_PASSANT_FILE_KEYS: List[int] = [_random.getrandbits(64) for _ in range(8)]
@@ -0,0 +1,3 @@
+class InvalidSnapshotException(Exception):
+    def __init__(self, message):
+        super().__init__(message)
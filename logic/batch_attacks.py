@@ -0,0 +1,141 @@
+from typing import Dict, Iterable
+
+import numpy as np
+
+from domain.bitboards import BISHOP, KING, KNIGHT, OPPONENTS, PAWN, PIECE_KEYS, QUEEN, ROOK
+from domain.chess_board import ChessBoard
+from domain.teams import TeamEnum
+
+"""
+Attack maps and check flags for many positions at once (needs NumPy).
+A batch is an int8 array of shape (N, 64) or (N, 8, 8) indexed by square id (a1 = 0, row * 8 + col):
+0 is an empty square, 1..6 white pawn..king and -1..-6 black pawn..king.
+Each piece type is packed into one uint64 bitboard per position and attacks are computed with
+whole-array shifts, so the Python overhead is paid once per batch, not once per position.
+Attacks follow is_in_check: the defending king never blocks a ray
+"""
+
+PIECE_CODES: Dict[str, int] = {'.': 0}
+for _team, _sign in [(TeamEnum.WHITES.value, 1), (TeamEnum.BLACKS.value, -1)]:
+    for _piece_type, _piece in enumerate(PIECE_KEYS[_team]):
+        PIECE_CODES[_piece] = _sign * (_piece_type + 1)
+
+TEAM_SIGNS: Dict[str, int] = {TeamEnum.WHITES.value: 1, TeamEnum.BLACKS.value: -1}
+
+_CODE_TABLE = np.zeros(256, dtype=np.int8)
+for _piece, _code in PIECE_CODES.items():
+    _CODE_TABLE[ord(_piece)] = _code
+
+_NOT_A_FILE = np.uint64(0xfefefefefefefefe)
+_NOT_H_FILE = np.uint64(0x7f7f7f7f7f7f7f7f)
+_ALL_SQUARES = np.uint64(0xffffffffffffffff)
+
+# (square step, mask of the squares a piece can land on without wrapping around the board)
+NORTH = (8, _ALL_SQUARES)
+SOUTH = (-8, _ALL_SQUARES)
+EAST = (1, _NOT_A_FILE)
+WEST = (-1, _NOT_H_FILE)
+NORTH_EAST = (9, _NOT_A_FILE)
+NORTH_WEST = (7, _NOT_H_FILE)
+SOUTH_EAST = (-7, _NOT_A_FILE)
+SOUTH_WEST = (-9, _NOT_H_FILE)
+ORTHOGONAL_DIRECTIONS = [NORTH, SOUTH, EAST, WEST]
+DIAGONAL_DIRECTIONS = [NORTH_EAST, NORTH_WEST, SOUTH_EAST, SOUTH_WEST]
+KING_DIRECTIONS = ORTHOGONAL_DIRECTIONS + DIAGONAL_DIRECTIONS
+
+_NOT_AB_FILES = np.uint64(0xfcfcfcfcfcfcfcfc)
+_NOT_GH_FILES = np.uint64(0x3f3f3f3f3f3f3f3f)
+KNIGHT_DIRECTIONS = [
+    (17, _NOT_A_FILE), (15, _NOT_H_FILE), (10, _NOT_AB_FILES), (6, _NOT_GH_FILES),
+    (-6, _NOT_AB_FILES), (-10, _NOT_GH_FILES), (-15, _NOT_A_FILE), (-17, _NOT_H_FILE),
+]
+
+
+def encode_boards(chess_boards: Iterable[ChessBoard]) -> np.ndarray:
+    """
+    (N, 64) batch of the boards, decoded from their squares in one table lookup
+    """
+    text = ''.join(''.join(chess_board.squares) for chess_board in chess_boards)
+    return _CODE_TABLE[np.frombuffer(text.encode('ascii'), dtype=np.uint8)].reshape(-1, 64)
+
+
+def _as_squares(positions: np.ndarray) -> np.ndarray:
+    return np.asarray(positions, dtype=np.int8).reshape(-1, 64)
+
+
+def _to_bitboards(bits: np.ndarray) -> np.ndarray:
+    """
+    (N, 64) bool array to one uint64 bitboard per position
+    """
+    return np.packbits(bits, axis=1, bitorder='little').view('<u8').ravel()
+
+
+def _shift(bitboards: np.ndarray, step: int) -> np.ndarray:
+    if step > 0:
+        return bitboards << np.uint64(step)
+    return bitboards >> np.uint64(-step)
+
+
+def _slide(sliders: np.ndarray, empty: np.ndarray, directions: list) -> np.ndarray:
+    """
+    Kogge-Stone fills: every ray of every position in three shifts per direction
+    """
+    attacked = np.zeros_like(sliders)
+    for step, landing_mask in directions:
+        generator = sliders
+        propagator = empty & landing_mask
+        generator = generator | propagator & _shift(generator, step)
+        propagator = propagator & _shift(propagator, step)
+        generator = generator | propagator & _shift(generator, 2 * step)
+        propagator = propagator & _shift(propagator, 2 * step)
+        generator = generator | propagator & _shift(generator, 4 * step)
+        attacked |= _shift(generator, step) & landing_mask
+    return attacked
+
+
+def _attack_bitboards(squares: np.ndarray, attacking_team: str) -> np.ndarray:
+    sign = TEAM_SIGNS[attacking_team]
+    pieces = squares * np.int8(sign)
+
+    def piece_bitboard(piece_type: int) -> np.ndarray:
+        return _to_bitboards(pieces == piece_type + 1)
+
+    # The defending king is transparent to rays
+    empty = _to_bitboards((squares == 0) | (pieces == -(KING + 1)))
+
+    pawns = piece_bitboard(PAWN)
+    if sign > 0:
+        attacked = _shift(pawns, 9) & _NOT_A_FILE | _shift(pawns, 7) & _NOT_H_FILE
+    else:
+        attacked = _shift(pawns, -7) & _NOT_A_FILE | _shift(pawns, -9) & _NOT_H_FILE
+    knights = piece_bitboard(KNIGHT)
+    for step, landing_mask in KNIGHT_DIRECTIONS:
+        attacked |= _shift(knights, step) & landing_mask
+    king = piece_bitboard(KING)
+    for step, landing_mask in KING_DIRECTIONS:
+        attacked |= _shift(king, step) & landing_mask
+    queens = piece_bitboard(QUEEN)
+    attacked |= _slide(piece_bitboard(BISHOP) | queens, empty, DIAGONAL_DIRECTIONS)
+    attacked |= _slide(piece_bitboard(ROOK) | queens, empty, ORTHOGONAL_DIRECTIONS)
+    return attacked
+
+
+def attack_maps(positions: np.ndarray, attacking_team: str) -> np.ndarray:
+    """
+    (N, 8, 8) bool array of the squares attacked by the team in each position
+    """
+    attacked = _attack_bitboards(_as_squares(positions), attacking_team)
+    bits = np.unpackbits(attacked.astype('<u8').view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+    return bits.reshape(-1, 8, 8).astype(bool)
+
+
+def check_flags(positions: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Per team (N,) bool array of whether its king is in check. A position without the king is not in check
+    """
+    squares = _as_squares(positions)
+    flags = dict()
+    for team, sign in TEAM_SIGNS.items():
+        king = _to_bitboards(squares == sign * (KING + 1))
+        flags[team] = (_attack_bitboards(squares, OPPONENTS[team]) & king) != 0
+    return flags
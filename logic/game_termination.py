@@ -0,0 +1,122 @@
+from typing import Collection
+from domain.attack_tables import BETWEEN, KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS, diagonal_attacks, \
+    iterate_bits, orthogonal_attacks
+from domain.bitboards import OPPONENTS, PAWN, PIECE_KEYS
+from domain.chess_board import ChessBoard
+from domain.move import Move
+from domain.squares import BOARD_SIZE, row_of
+from domain.teams import TeamEnum
+from exception.illegal_move_exception import IllegalMoveException
+from logic.move_generation.move_generator import EN_PASSANT, IL_VATICANO, generate_legal_moves
+from logic.move_validations import validate_en_passant, validate_king_safety
+
+
+def _pseudo_targets(square: int, piece_type: str, team: str, chess_board: ChessBoard) -> int:
+    """
+    Squares the piece reaches by its own movement, pins and checks aside
+    """
+    bitboards = chess_board.bitboards
+    occupied = bitboards.occupied
+    if piece_type == 'P':
+        targets = PAWN_ATTACKS[team][square] & bitboards.occupancy[OPPONENTS[team]]
+        pawn_push = 8 if team == TeamEnum.WHITES.value else -8
+        single_push = square + pawn_push
+        if not occupied >> single_push & 1:
+            targets |= 1 << single_push
+            double_push = single_push + pawn_push
+            if row_of(square) == (1 if team == TeamEnum.WHITES.value else 6) and not occupied >> double_push & 1:
+                targets |= 1 << double_push
+        return targets
+    if piece_type == 'N':
+        return KNIGHT_ATTACKS[square] & ~bitboards.occupancy[team]
+    if piece_type == 'B':
+        targets = diagonal_attacks(square, occupied)
+    elif piece_type == 'R':
+        targets = orthogonal_attacks(square, occupied)
+    else:
+        targets = diagonal_attacks(square, occupied) | orthogonal_attacks(square, occupied)
+    return targets & ~bitboards.occupancy[team]
+
+
+def _keeps_king_safe(team: str, square_from: int, square_to: int, chess_board: ChessBoard) -> bool:
+    try:
+        validate_king_safety(Move.from_squares(team, square_from, square_to), chess_board)
+    except IllegalMoveException:
+        return False
+    return True
+
+
+def _can_capture_or_block(team: str, king_square: int, checker: int, chess_board: ChessBoard) -> bool:
+    """
+    Whether a piece other than the king can take the only checker or step between it and the king.
+    Only the pieces reaching those few squares are looked at
+    """
+    bitboards = chess_board.bitboards
+    king = 1 << king_square
+    pawns = bitboards.pieces[PIECE_KEYS[team][PAWN]]
+    for square_from in iterate_bits(bitboards.attackers_to(checker, team) & ~king):
+        if _keeps_king_safe(team, square_from, checker, chess_board):
+            return True
+    pawn_push = 8 if team == TeamEnum.WHITES.value else -8
+    double_push_row = 3 if team == TeamEnum.WHITES.value else 4
+    for square_to in iterate_bits(BETWEEN[king_square][checker]):
+        blockers = bitboards.attackers_to(square_to, team) & ~king & ~pawns
+        single_push = square_to - pawn_push
+        if 0 <= single_push < BOARD_SIZE:
+            if pawns >> single_push & 1:
+                blockers |= 1 << single_push
+            elif row_of(square_to) == double_push_row and not bitboards.occupied >> single_push & 1 \
+                    and pawns >> (single_push - pawn_push) & 1:
+                blockers |= 1 << (single_push - pawn_push)
+        for square_from in iterate_bits(blockers):
+            if _keeps_king_safe(team, square_from, square_to, chess_board):
+                return True
+    return False
+
+
+def has_legal_move(team: str, chess_board: ChessBoard, special_moves: Collection[str]) -> bool:
+    """
+    Whether the team has any legal move, stopping at the first one found:
+    1. A king step to a square the opponent does not attack
+    2. In double check nothing else helps
+    3. In check, a piece capturing the checker or blocking it: only those few squares are tried
+    4. Otherwise any piece move that does not uncover the king, usually the first one tried
+    5. En passant, and Il Vaticano when enabled, which can be the only way out
+    Castling is never the only legal move, the king's first step would be legal too
+    """
+    bitboards = chess_board.bitboards
+    opponent = OPPONENTS[team]
+    own_pieces = bitboards.occupancy[team]
+    king_square = chess_board.get_king_square(team)
+    for square_to in iterate_bits(KING_ATTACKS[king_square] & ~own_pieces):
+        if not bitboards.is_attacked(square_to, opponent):
+            return True
+
+    checkers = bitboards.attackers_to(king_square, opponent)
+    if checkers & (checkers - 1):
+        return False
+    if checkers:
+        checker = checkers.bit_length() - 1
+        if _can_capture_or_block(team, king_square, checker, chess_board):
+            return True
+    else:
+        squares = chess_board.squares
+        for square in list(chess_board.get_team_squares(team)):
+            if square == king_square:
+                continue
+            for square_to in iterate_bits(_pseudo_targets(square, squares[square].upper(), team, chess_board)):
+                if _keeps_king_safe(team, square, square_to, chess_board):
+                    return True
+
+    en_passant_square = chess_board.en_passant_square
+    if EN_PASSANT in special_moves and en_passant_square is not None:
+        pawns = bitboards.pieces[PIECE_KEYS[team][PAWN]]
+        for square in iterate_bits(PAWN_ATTACKS[opponent][en_passant_square] & pawns):
+            try:
+                validate_en_passant(Move.from_squares(team, square, en_passant_square), chess_board)
+            except IllegalMoveException:
+                continue
+            return True
+    if IL_VATICANO in special_moves:
+        return bool(generate_legal_moves(team, chess_board, [IL_VATICANO]))
+    return False
@@ -1,6 +1,14 @@
-from typing import List, Callable, Tuple
+from typing import List, Callable
 from domain.chess_board import ChessBoard
 from domain.move import Move
+from domain.squares import col_of, row_of, square_of, to_square
+from domain.teams import TeamEnum
+
+"""
+The returned executors only write through the board, so running one
+between ChessBoard.push_undo_frame/pop_undo_frame (or with make_steps and
+unmake_move, or inside ChessBoard.probe) reverts it exactly
+"""
 
 
 def create_castle_steps(move: Move) -> Callable[[ChessBoard], List[Move]]:
@@ -8,26 +16,14 @@ def create_castle_steps(move: Move) -> Callable[[ChessBoard], List[Move]]:
     1. Create move from king to rook - 1
     2. Create move from rook to king - 1
     """
+    team = move.get_team()
+    king_square = to_square(move.get_cell_from())
+    rook_square = to_square(move.get_cell_to())
+    king_direction = 1 if rook_square > king_square else -1
+    king_final_square = king_square + 2 * king_direction
 
-    cell_from = move.get_cell_from()
-    cell_to = move.get_cell_to()
-    column_diff = ord(cell_from[0]) - ord(cell_to[0])
-    king_direction = int(column_diff/abs(column_diff))
-    king_final_position =  chr(ord(cell_from[0]) - (2 * king_direction)) + str(cell_from[1])
-    rook_final_position = chr(ord(king_final_position[0]) + king_direction) + str(cell_to[1])
-
-    king_move = Move(
-        move.get_team(),
-        cell_from[0] + str(cell_from[1]),
-        king_final_position,
-        None
-    )
-    rook_move = Move(
-        move.get_team(),
-        cell_to[0] + str(cell_to[1]),
-        rook_final_position,
-        None
-    )
+    king_move = Move.from_squares(team, king_square, king_final_square)
+    rook_move = Move.from_squares(team, rook_square, king_final_square - king_direction)
 
     def perform_castle(chess_board: ChessBoard) -> List[Move]:
         chess_board.apply_move(king_move)
@@ -41,25 +37,14 @@ def create_en_passant_steps(move: Move) -> Callable[[ChessBoard], List[Move]]:
     """
     1. Create move from original source to captured pawn's position
     2. Create move from captured position to original destination
-    """    
-    cell_from = move.get_cell_from()
-    cell_to = move.get_cell_to()
-    column_diff = ord(cell_from[0]) - ord(cell_to[0])
-    pawn_horizontal_direction = int(column_diff/abs(column_diff))
-    captured_pawn_position =  chr(ord(cell_from[0]) - pawn_horizontal_direction) + str(cell_from[1])
-
-    capture_move = Move(
-        move.get_team(),
-        cell_from[0] + str(cell_from[1]),
-        captured_pawn_position,
-        None
-    )
-    correct_destination_move = Move(
-        move.get_team(),
-        captured_pawn_position,
-        cell_to[0] + str(cell_to[1]),
-        None
-    )
+    """
+    team = move.get_team()
+    square_from = to_square(move.get_cell_from())
+    square_to = to_square(move.get_cell_to())
+    captured_pawn_square = square_of(col_of(square_to), row_of(square_from))
+
+    capture_move = Move.from_squares(team, square_from, captured_pawn_square)
+    correct_destination_move = Move.from_squares(team, captured_pawn_square, square_to)
 
     def perform_en_passant(chess_board: ChessBoard) -> List[Move]:
         chess_board.apply_move(capture_move)
@@ -71,9 +56,19 @@ def create_en_passant_steps(move: Move) -> Callable[[ChessBoard], List[Move]]:
 
 def create_pawn_promotion_steps(move: Move) -> Callable[[ChessBoard], List[Move]]:
     """
-    1. change piece to 
+    1. Move pawn to the last row
+    2. change piece to the one chosen in the move's additional data
     """
-    raise NotImplementedError()
+    promoted_piece = move.get_additional_data().upper() \
+        if move.get_team() == TeamEnum.WHITES.value \
+        else move.get_additional_data().lower()
+
+    def perform_pawn_promotion(chess_board: ChessBoard) -> List[Move]:
+        chess_board.apply_move(move)
+        chess_board.set_cell(move.get_cell_to(), promoted_piece)
+        return [move]
+
+    return perform_pawn_promotion
 
 def create_il_vaticano_steps(move: Move) -> Callable[[ChessBoard], List[Move]]:
     """
@@ -85,22 +80,23 @@ def create_il_vaticano_steps(move: Move) -> Callable[[ChessBoard], List[Move]]:
     Steps 1-2, capture the pawns
     Steps 3-4, swap bishops original position ()
     """
-    cell_from = move.get_cell_from()
-    cell_to = move.get_cell_to()    
-    is_vertical:bool = False
-    is_horizontal:bool = False
-    #check if is vertical il vaticano
-    if cell_from[0] == cell_to[0]:
-        is_vertical = True
-    #check if is horizontal il vaticano
-    if cell_from[1] == cell_to[1]:
-        is_horizontal = True
-
-    raise NotImplementedError()
-    
+    team = move.get_team()
+    square_from = to_square(move.get_cell_from())
+    square_to = to_square(move.get_cell_to())
+    step = (square_to - square_from) // 3
+    first_pawn_square = square_from + step
+    second_pawn_square = square_from + 2 * step
+
+    first_capture_move = Move.from_squares(team, square_from, first_pawn_square)
+    second_capture_move = Move.from_squares(team, first_pawn_square, second_pawn_square)
+    other_bishop_move = Move.from_squares(team, square_to, square_from)
+    capturing_bishop_move = Move.from_squares(team, second_pawn_square, square_to)
+
     def perform_il_vaticano(chess_board: ChessBoard) -> List[Move]:
-        pass
+        chess_board.apply_move(first_capture_move)
+        chess_board.apply_move(second_capture_move)
+        chess_board.apply_move(other_bishop_move)
+        chess_board.apply_move(capturing_bishop_move)
+        return [first_capture_move, second_capture_move, other_bishop_move, capturing_bishop_move]
 
     return perform_il_vaticano
-
-
@@ -0,0 +1,167 @@
+from typing import Collection, List, Optional, Set
+from config.config_wrapper import ConfigurationWrapper
+from domain.attack_tables import BETWEEN, KING_ATTACKS, KNIGHT_ATTACKS, ORTHOGONAL_DIRECTIONS, PAWN_ATTACKS, \
+    RAY_SQUARES, diagonal_attacks, iterate_bits, orthogonal_attacks
+from domain.bitboards import BISHOP, OPPONENTS, PAWN, PIECE_KEYS, ROOK
+from domain.castling_rights import ROOK_CASTLING_RIGHTS, TEAM_CASTLING_RIGHTS
+from domain.chess_board import ChessBoard
+from domain.move import Move
+from domain.squares import row_of
+from domain.teams import TeamEnum
+from logic.move_constructors import create_en_passant_steps, create_il_vaticano_steps
+from logic.move_generation.position_analysis import PositionAnalysis
+
+CASTLE = 'Castle'
+EN_PASSANT = 'En Passant'
+PAWN_PROMOTION = 'Pawn Promotion'
+IL_VATICANO = 'Il Vaticano'
+STANDARD_SPECIAL_MOVES = frozenset([CASTLE, EN_PASSANT, PAWN_PROMOTION])
+
+PROMOTION_PIECES = ['Q', 'R', 'B', 'N']
+
+
+def get_enabled_special_moves() -> Set[str]:
+    return set(ConfigurationWrapper.get_rule_set().get_enabled_special_move_names())
+
+
+def _create_move(team: str, square_from: int, square_to: int, additional_data: Optional[str] = None) -> Move:
+    return Move.from_squares(team, square_from, square_to, additional_data)
+
+
+def generate_legal_moves(team: str, chess_board: ChessBoard,
+                         special_moves: Optional[Collection[str]] = None) -> List[Move]:
+    """
+    Every legal move of the team. Castles are king to rook moves and promotions carry the chosen
+    piece as additional data, as Game.make_move expects them.
+    Checks and pins are computed once, so only en passant and Il Vaticano are probed on the board.
+    Castling rights and the en passant square are read from the board, not the move history
+    """
+    if special_moves is None:
+        special_moves = get_enabled_special_moves()
+
+    analysis = PositionAnalysis(team, chess_board)
+    moves: List[Move] = []
+    _generate_king_moves(team, chess_board, analysis, moves)
+    if analysis.is_in_double_check():
+        return moves
+
+    _generate_piece_moves(team, chess_board, analysis, moves, PAWN_PROMOTION in special_moves)
+    if EN_PASSANT in special_moves:
+        _generate_en_passant_moves(team, chess_board, analysis, moves)
+    if CASTLE in special_moves and not analysis.is_in_check():
+        _generate_castle_moves(team, chess_board, analysis, moves)
+    if IL_VATICANO in special_moves:
+        _generate_il_vaticano_moves(team, chess_board, analysis, moves)
+    return moves
+
+
+def _generate_king_moves(team: str, chess_board: ChessBoard, analysis: PositionAnalysis, moves: List[Move]):
+    bitboards = chess_board.bitboards
+    opponent = OPPONENTS[team]
+    king_square = analysis.king_square
+    for target in iterate_bits(KING_ATTACKS[king_square] & ~bitboards.occupancy[team]):
+        if not bitboards.is_attacked(target, opponent):
+            moves.append(_create_move(team, king_square, target))
+
+
+def _generate_piece_moves(team: str, chess_board: ChessBoard, analysis: PositionAnalysis,
+                          moves: List[Move], promotions: bool):
+    bitboards = chess_board.bitboards
+    squares = chess_board.squares
+    own_pieces = bitboards.occupancy[team]
+    opponent_pieces = bitboards.occupancy[OPPONENTS[team]]
+    occupied = bitboards.occupied
+    pawn_push = 8 if team == TeamEnum.WHITES.value else -8
+    pawn_start_row = 1 if team == TeamEnum.WHITES.value else 6
+    last_row = 7 if team == TeamEnum.WHITES.value else 0
+
+    for square in list(chess_board.get_team_squares(team)):
+        piece_type = squares[square].upper()
+        if piece_type == 'K':
+            continue
+        allowed = analysis.get_allowed_targets(square)
+        if not allowed:
+            continue
+
+        if piece_type == 'P':
+            targets = PAWN_ATTACKS[team][square] & opponent_pieces
+            single_push = square + pawn_push
+            if not occupied & (1 << single_push):
+                targets |= 1 << single_push
+                double_push = single_push + pawn_push
+                if row_of(square) == pawn_start_row and not occupied & (1 << double_push):
+                    targets |= 1 << double_push
+            for target in iterate_bits(targets & allowed):
+                if promotions and row_of(target) == last_row:
+                    for promotion_piece in PROMOTION_PIECES:
+                        moves.append(_create_move(team, square, target, promotion_piece))
+                else:
+                    moves.append(_create_move(team, square, target))
+            continue
+
+        if piece_type == 'N':
+            targets = KNIGHT_ATTACKS[square]
+        elif piece_type == 'B':
+            targets = diagonal_attacks(square, occupied)
+        elif piece_type == 'R':
+            targets = orthogonal_attacks(square, occupied)
+        else:
+            targets = diagonal_attacks(square, occupied) | orthogonal_attacks(square, occupied)
+        for target in iterate_bits(targets & ~own_pieces & allowed):
+            moves.append(_create_move(team, square, target))
+
+
+def _generate_en_passant_moves(team: str, chess_board: ChessBoard, analysis: PositionAnalysis, moves: List[Move]):
+    en_passant_square = chess_board.en_passant_square
+    if en_passant_square is None:
+        return
+    bitboards = chess_board.bitboards
+    pawns = bitboards.pieces[PIECE_KEYS[team][PAWN]]
+    opponent = OPPONENTS[team]
+    for square in iterate_bits(PAWN_ATTACKS[opponent][en_passant_square] & pawns):
+        move = _create_move(team, square, en_passant_square)
+        with chess_board.probe():
+            create_en_passant_steps(move)(chess_board)
+            is_legal = not bitboards.is_attacked(analysis.king_square, opponent)
+        if is_legal:
+            moves.append(move)
+
+
+def _generate_castle_moves(team: str, chess_board: ChessBoard, analysis: PositionAnalysis, moves: List[Move]):
+    castling_rights = chess_board.castling_rights & TEAM_CASTLING_RIGHTS[team]
+    if not castling_rights:
+        return
+    king_square = analysis.king_square
+    bitboards = chess_board.bitboards
+    opponent = OPPONENTS[team]
+    rook_key = PIECE_KEYS[team][ROOK]
+    for rook_square, castling_right in ROOK_CASTLING_RIGHTS.items():
+        if not castling_rights & castling_right or chess_board.get_square(rook_square) != rook_key:
+            continue
+        if BETWEEN[king_square][rook_square] & bitboards.occupied:
+            continue
+        step = 1 if rook_square > king_square else -1
+        if bitboards.is_attacked(king_square + step, opponent) \
+                or bitboards.is_attacked(king_square + 2 * step, opponent):
+            continue
+        moves.append(_create_move(team, king_square, rook_square))
+
+
+def _generate_il_vaticano_moves(team: str, chess_board: ChessBoard, analysis: PositionAnalysis, moves: List[Move]):
+    squares = chess_board.squares
+    bitboards = chess_board.bitboards
+    opponent = OPPONENTS[team]
+    bishop_key = PIECE_KEYS[team][BISHOP]
+    opponent_pawn_key = PIECE_KEYS[opponent][PAWN]
+    for square in iterate_bits(bitboards.pieces[bishop_key]):
+        for direction in ORTHOGONAL_DIRECTIONS:
+            ray = RAY_SQUARES[direction][square]
+            if len(ray) < 3 or squares[ray[2]] != bishop_key \
+                    or squares[ray[0]] != opponent_pawn_key or squares[ray[1]] != opponent_pawn_key:
+                continue
+            move = _create_move(team, square, ray[2])
+            with chess_board.probe():
+                create_il_vaticano_steps(move)(chess_board)
+                is_legal = not bitboards.is_attacked(analysis.king_square, opponent)
+            if is_legal:
+                moves.append(move)
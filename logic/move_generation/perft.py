@@ -0,0 +1,122 @@
+from multiprocessing import Pool
+from typing import Callable, Collection, Dict, List, Optional, Tuple
+from domain.chess_board import ChessBoard, DEFAULT_CHESS_BOARD
+from domain.move import Move
+from domain.teams import TeamEnum
+from logic.move_generation.move_generator import STANDARD_SPECIAL_MOVES, generate_legal_moves
+from logic.special_move_registry import get_special_move_registry_for
+
+"""
+Published perft counts (https://www.chessprogramming.org/Perft_Results).
+Each position is a board in ChessBoard's format, the team to move and the leaf counts for depth 1, 2, ...
+Castling availability is implied by kings and rooks standing on their starting cells.
+The side to move, castling rights and en passant square are read from the board itself
+"""
+PERFT_POSITIONS: Dict[str, Tuple[str, str, List[int]]] = {
+    'initial': (
+        DEFAULT_CHESS_BOARD,
+        TeamEnum.WHITES.value,
+        [20, 400, 8902, 197281, 4865609]
+    ),
+    'kiwipete': (
+        'R . . . K . . R;P P P B B P P P;. . N . . Q . p;. p . . P . . .;'
+        '. . . P N . . .;b n . . p n p .;p . p p q p b .;r . . . k . . r',
+        TeamEnum.WHITES.value,
+        [48, 2039, 97862, 4085603]
+    ),
+    'endgame': (
+        '. . . . . . . .;. . . . P . P .;. . . . . . . .;. R . . . p . k;'
+        'K P . . . . . r;. . . p . . . .;. . p . . . . .;. . . . . . . .',
+        TeamEnum.WHITES.value,
+        [14, 191, 2812, 43238, 674624]
+    ),
+    'promotions': (
+        'R . . Q . R K .;P p . P . . P P;q . . . . N . .;B B P . P . . .;'
+        'n P . . . . . .;. b . . . n b N;P p p p . p p p;r . . . k . . r',
+        TeamEnum.WHITES.value,
+        [6, 264, 9467, 422333]
+    ),
+    'discovered_checks': (
+        'R N B Q K . . R;P P P . N n P P;. . . . . . . .;. . B . . . . .;'
+        '. . . . . . . .;. . p . . . . .;p p . P b p p p;r n b q . k . r',
+        TeamEnum.WHITES.value,
+        [44, 1486, 62379, 2103487]
+    ),
+    'middlegame': (
+        'R . . . . R K .;. P P . Q P P P;P . N P . N . .;. . B . P . b .;'
+        '. . b . p . B .;p . n p . n . .;. p p . q p p p;r . . . . r k .',
+        TeamEnum.WHITES.value,
+        [46, 2079, 89890, 3894594]
+    ),
+}
+
+
+def get_move_name(move: Move) -> str:
+    cell_from = move.get_cell_from()
+    cell_to = move.get_cell_to()
+    return cell_from[0] + str(cell_from[1]) + cell_to[0] + str(cell_to[1]) + (move.get_additional_data() or '')
+
+
+def _create_executor(move: Move, chess_board: ChessBoard,
+                     special_moves: Collection[str]) -> Callable[[ChessBoard], List[Move]]:
+    special_move = get_special_move_registry_for(special_moves).find(move, chess_board)
+    if special_move is not None:
+        return special_move.create_executor(move)
+
+    def perform_move(board: ChessBoard) -> List[Move]:
+        board.apply_move(move)
+        return [move]
+
+    return perform_move
+
+
+def _make_move(move: Move, chess_board: ChessBoard, special_moves: Collection[str]):
+    chess_board.make_steps(_create_executor(move, chess_board, special_moves))
+    chess_board.end_turn()
+
+
+def perft(chess_board: ChessBoard, depth: int, special_moves: Collection[str] = STANDARD_SPECIAL_MOVES) -> int:
+    """
+    Number of leaf positions reached from the position after depth plies of the side to move.
+    The board and its state are restored before returning
+    """
+    moves = generate_legal_moves(chess_board.side_to_move, chess_board, special_moves)
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+
+    nodes = 0
+    for move in moves:
+        _make_move(move, chess_board, special_moves)
+        nodes += perft(chess_board, depth - 1, special_moves)
+        chess_board.unmake_move()
+    return nodes
+
+
+def _divide_worker(arguments: tuple) -> Tuple[str, int]:
+    chess_board, move, depth, special_moves = arguments
+    _make_move(move, chess_board, special_moves)
+    return get_move_name(move), perft(chess_board, depth - 1, special_moves)
+
+
+def divide(chess_board: ChessBoard, depth: int, special_moves: Collection[str] = STANDARD_SPECIAL_MOVES,
+           processes: Optional[int] = None) -> Dict[str, int]:
+    """
+    Leaf counts per root move. The root moves are split across a process pool
+    (all cores when processes is None, in this process when it is 1).
+    Workers get a pickled copy of the board, state included
+    """
+    moves = generate_legal_moves(chess_board.side_to_move, chess_board, special_moves)
+    if depth <= 1:
+        return {get_move_name(move): 1 for move in moves}
+
+    special_moves = frozenset(special_moves)
+    if processes == 1:
+        results = dict()
+        for move in moves:
+            _make_move(move, chess_board, special_moves)
+            results[get_move_name(move)] = perft(chess_board, depth - 1, special_moves)
+            chess_board.unmake_move()
+        return results
+    work = [(chess_board, move, depth, special_moves) for move in moves]
+    with Pool(processes) as pool:
+        return dict(pool.imap_unordered(_divide_worker, work))
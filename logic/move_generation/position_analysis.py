@@ -0,0 +1,86 @@
+from typing import Dict
+
+from domain.attack_tables import BETWEEN, DIAGONAL_DIRECTIONS, ORTHOGONAL_DIRECTIONS, POSITIVE_DIRECTIONS, RAYS
+from domain.bitboards import BISHOP, OPPONENTS, PIECE_KEYS, QUEEN, ROOK
+from domain.chess_board import ChessBoard
+
+ALL_SQUARES = (1 << 64) - 1
+
+
+def _nearest(blockers: int, direction: int) -> int:
+    if direction in POSITIVE_DIRECTIONS:
+        return (blockers & -blockers).bit_length() - 1
+    return blockers.bit_length() - 1
+
+
+class PositionAnalysis:
+    """
+    Check and pin information for one team's king, computed once per position.
+    check_mask holds the squares a non-king move must land on (everything when not in check,
+    the checker and the squares between it and the king when in single check, nothing in double check).
+    pin_masks holds, for every pinned piece, the squares it can move to without leaving its pin line
+    """
+
+    team: str
+    king_square: int
+    checkers: int
+    check_mask: int
+    pin_masks: Dict[int, int]
+
+    def __init__(self, team: str, chess_board: ChessBoard):
+        bitboards = chess_board.bitboards
+        opponent = OPPONENTS[team]
+        self.team = team
+        self.king_square = chess_board.get_king_square(team)
+        self.checkers = bitboards.attackers_to(self.king_square, opponent)
+
+        if not self.checkers:
+            self.check_mask = ALL_SQUARES
+        elif self.checkers & (self.checkers - 1):
+            self.check_mask = 0
+        else:
+            checker_square = self.checkers.bit_length() - 1
+            self.check_mask = self.checkers | BETWEEN[self.king_square][checker_square]
+
+        self.pin_masks = dict()
+        opponent_keys = PIECE_KEYS[opponent]
+        queens = bitboards.pieces[opponent_keys[QUEEN]]
+        orthogonal_sliders = bitboards.pieces[opponent_keys[ROOK]] | queens
+        diagonal_sliders = bitboards.pieces[opponent_keys[BISHOP]] | queens
+        if orthogonal_sliders:
+            self._find_pins(ORTHOGONAL_DIRECTIONS, orthogonal_sliders, chess_board)
+        if diagonal_sliders:
+            self._find_pins(DIAGONAL_DIRECTIONS, diagonal_sliders, chess_board)
+
+    def _find_pins(self, directions: list, sliders: int, chess_board: ChessBoard):
+        bitboards = chess_board.bitboards
+        own_pieces = bitboards.occupancy[self.team]
+        occupied = bitboards.occupied
+        for direction in directions:
+            ray = RAYS[direction][self.king_square]
+            if not ray & sliders:
+                continue
+            blockers = ray & occupied
+            if not blockers:
+                continue
+            first_blocker = _nearest(blockers, direction)
+            if not (1 << first_blocker) & own_pieces:
+                continue
+            beyond = RAYS[direction][first_blocker] & occupied
+            if not beyond:
+                continue
+            pinner = _nearest(beyond, direction)
+            if (1 << pinner) & sliders:
+                self.pin_masks[first_blocker] = BETWEEN[self.king_square][pinner] | (1 << pinner)
+
+    def is_in_check(self) -> bool:
+        return self.checkers != 0
+
+    def is_in_double_check(self) -> bool:
+        return bool(self.checkers & (self.checkers - 1))
+
+    def get_allowed_targets(self, square: int) -> int:
+        """
+        Squares a non-king piece on the square may move to, given checks and pins
+        """
+        return self.check_mask & self.pin_masks.get(square, ALL_SQUARES)
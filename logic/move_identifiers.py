@@ -60,3 +60,29 @@ def is_pawn_promotion(move: Move, chess_board: ChessBoard) -> bool:
         and not ((direction > 0 and cell_to[1] < 8) or (direction < 0 and cell_to[1] > 1)) \
         and not (eaten_piece != '.' and lateral_distance == 0) \
         and not (lateral_distance > 1 or vertical_distance > 1)
+
+
+def is_il_vaticano(move: Move, chess_board: ChessBoard) -> bool:
+    """
+    1.Is a bishop move
+    2.Destination holds an ally bishop three squares away in the same row or column
+    3.The two cells in between hold opponent pawns
+    """
+    cell_from = move.get_cell_from()
+    cell_to = move.get_cell_to()
+    moved_piece = chess_board.get_cell(cell_from)
+    lateral_distance = abs(ord(cell_from[0]) - ord(cell_to[0]))
+    vertical_distance = abs(cell_from[1] - cell_to[1])
+    if moved_piece.lower() != 'b' or chess_board.get_cell(cell_to) != moved_piece:
+        return False
+    if not ((lateral_distance == 3 and vertical_distance == 0)
+            or (lateral_distance == 0 and vertical_distance == 3)):
+        return False
+
+    col_step = (ord(cell_to[0]) - ord(cell_from[0])) // 3
+    row_step = (cell_to[1] - cell_from[1]) // 3
+    opponent_pawn = 'p' if moved_piece.isupper() else 'P'
+    return all(
+        chess_board.get_cell(tuple([chr(ord(cell_from[0]) + col_step * distance),
+                                    cell_from[1] + row_step * distance])) == opponent_pawn
+        for distance in [1, 2])
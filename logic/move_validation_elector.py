@@ -1,10 +1,27 @@
-from typing import List, Callable
+from typing import Dict, List, Callable
 from domain.move import Move
 from domain.chess_board import ChessBoard
+from logic.move_validations import validate_bishop_geometry, validate_destination, validate_king_geometry, \
+    validate_king_safety, validate_knight_geometry, validate_moved_piece, validate_no_additional_data, \
+    validate_path_is_clear, validate_pawn_geometry, validate_queen_geometry, validate_rook_geometry
+
+# Cheapest checks first: no additional data, ownership and destination, then geometry and path, king safety last
+_COMMON_VALIDATIONS: List[Callable[[Move, ChessBoard], None]] = [
+    validate_no_additional_data, validate_moved_piece, validate_destination]
+VALIDATIONS_BY_PIECE: Dict[str, List[Callable[[Move, ChessBoard], None]]] = {
+    'p': _COMMON_VALIDATIONS + [validate_pawn_geometry, validate_king_safety],
+    'n': _COMMON_VALIDATIONS + [validate_knight_geometry, validate_king_safety],
+    'b': _COMMON_VALIDATIONS + [validate_bishop_geometry, validate_path_is_clear, validate_king_safety],
+    'r': _COMMON_VALIDATIONS + [validate_rook_geometry, validate_path_is_clear, validate_king_safety],
+    'q': _COMMON_VALIDATIONS + [validate_queen_geometry, validate_path_is_clear, validate_king_safety],
+    'k': _COMMON_VALIDATIONS + [validate_king_geometry, validate_king_safety],
+}
+EMPTY_CELL_VALIDATIONS: List[Callable[[Move, ChessBoard], None]] = [validate_moved_piece]
 
 
 def get_validations_for(move: Move, chess_board: ChessBoard) -> List[Callable[[Move, ChessBoard], None]]:
     """
-    Get the relevant validations for this move
+    Get the relevant validations for this move: the chain of the moved piece.
+    Special moves (castle, en passant, promotion...) are validated by their own validator instead
     """
-    raise NotImplementedError()
+    return VALIDATIONS_BY_PIECE.get(chess_board.get_cell(move.get_cell_from()).lower(), EMPTY_CELL_VALIDATIONS)
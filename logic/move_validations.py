@@ -1,122 +1,31 @@
-import copy
-from typing import List, Tuple
+from typing import Tuple
+from domain.attack_tables import BETWEEN, DIAGONAL_DIRECTIONS, DIAGONAL_RAYS, DIRECTION_TO, KING_ATTACKS, \
+    KNIGHT_ATTACKS, NO_DIRECTION, ORTHOGONAL_RAYS, PAWN_ATTACKS, POSITIVE_DIRECTIONS, RAYS
+from domain.bitboards import BISHOP, OPPONENTS, PIECE_KEYS, QUEEN, ROOK
+from domain.castling_rights import NO_CASTLING_RIGHTS, ROOK_CASTLING_RIGHTS, TEAM_CASTLING_RIGHTS
 from domain.chess_board import ChessBoard
 from domain.move import Move
+from domain.squares import row_of, to_cell, to_square
 from domain.teams import TeamEnum
 from exception.illegal_move_exception import IllegalMoveException
-from exception.no_king_exception import NoKingException
-from logic.move_constructors import create_en_passant_steps
-
-def _is_safe_diagonally(cell: Tuple[str, int], team: str, chess_board: ChessBoard) -> bool:
-    diagonal_threats = TeamEnum[team].get_diagonal_threats()
-    direction_operations = [[-1, -1], [-1, 1], [1, -1], [1, 1]]
-
-    for direction in direction_operations:
-        checked_cell = cell
-        while chess_board.is_in_bounds(checked_cell):
-            piece = chess_board.get_cell(checked_cell)
-            if piece != '.' and piece.lower() != 'k':
-                if piece in diagonal_threats:
-                    return False
-                else:
-                    break
-            checked_cell = tuple(
-                [chr(ord(checked_cell[0]) + direction[0]),
-                 checked_cell[1] + direction[1]]
-            )
-
-    return True
-
-
-def _is_safe_orthogonally(cell: Tuple[str, int], team: str, chess_board: ChessBoard) -> bool:
-    orthogonal_threats = TeamEnum[team].get_orthogonal_threats()
-    direction_operations = [[-1, 0], [1, 0], [0, -1], [0, 1]]
-
-    for direction in direction_operations:
-        checked_cell = cell
-        while chess_board.is_in_bounds(checked_cell):
-            piece = chess_board.get_cell(checked_cell)
-            if piece != '.' and piece.lower() != 'k':
-                if piece in orthogonal_threats:
-                    return False
-                else:
-                    break
-            checked_cell = tuple(
-                [chr(ord(checked_cell[0]) + direction[0]),
-                 checked_cell[1] + direction[1]]
-            )
-
-    return True
-
-
-def _is_safe_from_pawns(cell: Tuple[str, int], team: str, chess_board: ChessBoard) -> bool:
-    front = TeamEnum[team].get_front_direction()
-    direction_operations = [[front, -1], [front, 1]]
-    checked_cell = cell
-    for direction in direction_operations:
-        checked_cell = tuple(
-            [chr(ord(cell[0]) + direction[0]), cell[1] + direction[1] ]
-        )
-        if chess_board.is_in_bounds(checked_cell) \
-                and chess_board.get_cell(checked_cell) == TeamEnum[team].get_opponent_pawn_key():
-            return False
-
-    return True
-
-
-def _is_safe_from_knights(cell: Tuple[str, int], team: str, chess_board: ChessBoard) -> bool:
-    direction_operations = [[2, -1], [2, 1], [-2, -1], [-2, 1],
-                            [1, -2], [1, 2], [-1, -2], [-1, 2]]
-
-    checked_cell = cell
-    for direction in direction_operations:
-        checked_cell = tuple(
-            [chr(ord(cell[0]) + direction[0]), cell[1] + direction[1]]
-        )
-        if chess_board.is_in_bounds(checked_cell) \
-                and chess_board.get_cell(checked_cell) == TeamEnum[team].get_opponent_knight_key():
-            return False
-
-    return True
-
+from logic.move_constructors import create_en_passant_steps, create_il_vaticano_steps, create_pawn_promotion_steps
 
 def is_in_check(cell: Tuple[str, int], team: str, chess_board: ChessBoard) -> bool:
     """
-    To verify if piece is in check:
-    1. Check if orthogonally there are any rooks/queens
-    2. Check if diagonally there are any bishops/queens
-    3. Check if in 'front' diagonally there are any pawns
-    4. Check if in L there are any knights
+    Whether any opponent piece attacks the cell: pawns diagonally in front, knights in L,
+    the king when adjacent, bishops/queens diagonally and rooks/queens orthogonally.
+    The opponent's attacks are read from the board's cached attack map, so asking about
+    several cells of one position (castling) computes them once.
+    The team's own king never blocks a ray, so the squares it moves over are checked correctly
     """
+    return chess_board.get_attack_map(OPPONENTS[team]).is_attacked(to_square(cell))
 
-    return not (
-        _is_safe_diagonally(cell, team, chess_board)
-        and _is_safe_orthogonally(cell, team, chess_board)
-        and _is_safe_from_pawns(cell, team, chess_board)
-        and _is_safe_from_knights(cell, team, chess_board))
-
-def _get_king_cell(team:str, chess_board:ChessBoard):
-    if team == TeamEnum.BLACKS.value:
-        king_piece = 'k'
-    else:
-        king_piece = 'K'
-    columns = ['a','b','c','d','e','f','g']
-    rows = [1,2,3,4,5,6,7,8]
-    for row in rows:
-        for column in columns:
-            cell = tuple([column,row])
-            piece = chess_board.get_cell(cell)
-            if piece == king_piece:
-                return cell
-        
-    #I dont know if is possible to get here
-    raise NoKingException(f'There is no {team} king on the board')
 
 def is_king_in_check(team, chess_board:ChessBoard):
-    cell = _get_king_cell(team,chess_board)
+    cell = to_cell(chess_board.get_king_square(team))
     return is_in_check(cell,team,chess_board)
 
-def validate_castle(move: Move, chess_board: ChessBoard, move_history: List[Move]):
+def validate_castle(move: Move, chess_board: ChessBoard):
     """
     Castle conditions:
     1. King cannot have moved
@@ -124,88 +33,234 @@ def validate_castle(move: Move, chess_board: ChessBoard, move_history: List[Move
     3. King cannot be in check
     4. King cannot pass over check
     5. No pieces in between
+    The first two are read from the board's castling rights, which moves keep up to date
     """
-    king_starting_cell = TeamEnum[move.get_team()].get_starting_king_cell()
-    rook_starting_cell = move.get_cell_to()
+    team = move.get_team()
     cell_from = move.get_cell_from()
     cell_to = move.get_cell_to()
+    king_square = to_square(cell_from)
+    rook_square = to_square(cell_to)
 
-    king_moved = len(
-        [move for move in move_history if move.get_cell_from() == king_starting_cell]
-    ) > 0
-    if king_moved:
+    castling_rights = chess_board.castling_rights & TEAM_CASTLING_RIGHTS[team]
+    if not castling_rights:
         raise IllegalMoveException(
             'King has already moved, you cannot castle!')
-
-    rook_moved = len(
-        [move for move in move_history if move.get_cell_from() == rook_starting_cell]
-    ) > 0
-    if rook_moved:
+    if not castling_rights & ROOK_CASTLING_RIGHTS.get(rook_square, NO_CASTLING_RIGHTS):
         raise IllegalMoveException(
             'Rook has already moved, you cannot castle!')
 
-    if is_in_check(cell_from, move.get_team(), chess_board):
-        raise IllegalMoveException('You are in check, you cannot castle!')
-
-    starting_cell = cell_from \
-        if ord(cell_from[0]) < ord(cell_to[0]) \
-        else cell_to
+    if BETWEEN[king_square][rook_square] & chess_board.bitboards.occupied:
+        raise IllegalMoveException(
+            'There are pieces in the way, you cannot castle!')
 
-    ending_cell = cell_from \
-        if ord(cell_from[0]) > ord(cell_to[0]) \
-        else cell_to
+    if is_in_check(cell_from, team, chess_board):
+        raise IllegalMoveException('You are in check, you cannot castle!')
 
-    for column in range(ord(starting_cell[0]) + 1, ord(ending_cell[0])):
-        if abs(ord(cell_from[0]) - column) <= 2:
-            checked_cell = tuple([chr(column), starting_cell[1]])
-            if chess_board.get_cell(checked_cell) != '.':
-                raise IllegalMoveException(
-                    'There are pieces in the way, you cannot castle!')
-            if is_in_check(checked_cell, move.get_team(), chess_board):
-                raise IllegalMoveException(
-                    'You are passing over check, you cannot castle!')
+    step = 1 if rook_square > king_square else -1
+    for square in [king_square + step, king_square + 2 * step]:
+        if is_in_check(to_cell(square), team, chess_board):
+            raise IllegalMoveException(
+                'You are passing over check, you cannot castle!')
 
 
-def validate_en_passant(move: Move, chess_board: ChessBoard, move_history: List[Move]):
+def validate_en_passant(move: Move, chess_board: ChessBoard):
     """
     En passant conditions:
     1. Capturing pawn moved 3 rank forward
     2. Captured pawn moved two squares in one move
     3. Captured pawn must have moved in the previous move
-    (I think the first condition will be a consequence of the second and third condition)
+    The board records the square skipped by the last two square pawn push,
+    which covers the three conditions at once
     """
-    cell_from = move.get_cell_from()
-    cell_to = move.get_cell_to()
-    captured_pawn_position:Tuple[str,int] = tuple([cell_to[0],  cell_from[1]]) 
-    try:
-        last_move = move_history[-1]
-    except:
-        raise IllegalMoveException('Pawn to be captured did not move in the previous move')
-    if last_move.get_cell_to() != captured_pawn_position:
-        raise IllegalMoveException('Pawn to be captured did not move in the previous move')
-    moved_squares_by_captured_pawn_last_move = abs(last_move.get_cell_to()[1] - last_move.get_cell_from()[1])
-    captured_pawn_moved_two_squares:bool = moved_squares_by_captured_pawn_last_move == 2
-    if not captured_pawn_moved_two_squares:
-        raise IllegalMoveException('Pawn to be captured did not move two squares in previous move')
-    chess_board_after_en_passant = copy.deepcopy(chess_board) 
+    if to_square(move.get_cell_to()) != chess_board.en_passant_square:
+        raise IllegalMoveException('Pawn to be captured did not move two squares in the previous move')
     execute_en_passant = create_en_passant_steps(move)
-    execute_en_passant(chess_board_after_en_passant)
-    if is_king_in_check(move.get_team(),chess_board_after_en_passant):
+    with chess_board.probe():
+        execute_en_passant(chess_board)
+        puts_king_in_check = is_king_in_check(move.get_team(), chess_board)
+    if puts_king_in_check:
         raise IllegalMoveException('You will put yourself in check, you cannot en passant')
 
 
-
-def validate_pawn_promotion(move: Move, chess_board: ChessBoard, move_history: List[Move]):
+def validate_pawn_promotion(move: Move, chess_board: ChessBoard):
     """
     Pawn promotion conditions:
-    1. Pawn must be reaching last row
-    2. Chosen piece must be provided in the move's additional data
+    1. The pawn must belong to the moving team and move one row forward
+    2. Pawn must be reaching last row
+    3. Chosen piece must be provided in the move's additional data
+    4. Diagonal moves must capture an opponent piece
+    5. The promotion cannot leave the king in check
     """
-
-    raise NotImplementedError()
-
-def validate_il_vaticano(move: Move, chess_board: ChessBoard, move_history: List[Move]):
+    cell_from = move.get_cell_from()
+    cell_to = move.get_cell_to()
+    team = TeamEnum[move.get_team()]
+    if TeamEnum.of_piece(chess_board.get_cell(cell_from)) != team:
+        raise IllegalMoveException('You can only promote your own pawns')
+    if cell_to[1] - cell_from[1] != team.get_front_direction():
+        raise IllegalMoveException('Pawn must move one row forward to promote')
+    last_row = 8 if move.get_team() == TeamEnum.WHITES.value else 1
+    if cell_to[1] != last_row:
+        raise IllegalMoveException('Pawn is not reaching the last row')
+
+    chosen_piece = move.get_additional_data()
+    if chosen_piece is None or chosen_piece.lower() not in ['q', 'r', 'b', 'n']:
+        raise IllegalMoveException('You must choose a queen, rook, bishop or knight to promote to')
+
+    eaten_piece = chess_board.get_cell(cell_to)
+    if cell_from[0] != cell_to[0] \
+            and (eaten_piece == '.' or TeamEnum.of_piece(eaten_piece).value == move.get_team()):
+        raise IllegalMoveException('Pawn can only move diagonally to capture an opponent piece')
+
+    execute_promotion = create_pawn_promotion_steps(move)
+    with chess_board.probe():
+        execute_promotion(chess_board)
+        puts_king_in_check = is_king_in_check(move.get_team(), chess_board)
+    if puts_king_in_check:
+        raise IllegalMoveException('You will put yourself in check, you cannot promote')
+
+
+def validate_il_vaticano(move: Move, chess_board: ChessBoard):
     """
     Il Vaticano conditions:
     1. Two enemy pawns between two ally bishops vertically or horizontally
-    """
\ No newline at end of file
+    2. The bishops must belong to the moving team
+    3. The captures cannot leave the king in check
+    """
+    if TeamEnum.of_piece(chess_board.get_cell(move.get_cell_from())).value != move.get_team():
+        raise IllegalMoveException('You can only perform Il Vaticano with your own bishops')
+
+    execute_il_vaticano = create_il_vaticano_steps(move)
+    with chess_board.probe():
+        execute_il_vaticano(chess_board)
+        puts_king_in_check = is_king_in_check(move.get_team(), chess_board)
+    if puts_king_in_check:
+        raise IllegalMoveException('You will put yourself in check, you cannot perform Il Vaticano')
+
+
+"""
+Ordinary move validators, chained per moved piece by logic/move_validation_elector.py.
+Geometry and paths are read from the precomputed attack tables, so each is a few lookups
+"""
+
+
+def validate_no_additional_data(move: Move, chess_board: ChessBoard):
+    """
+    Only special moves (promotions) carry additional data
+    """
+    if move.get_additional_data() is not None:
+        raise IllegalMoveException(f'This move takes no additional data: {move.get_additional_data()}')
+
+
+def validate_moved_piece(move: Move, chess_board: ChessBoard):
+    piece = chess_board.get_cell(move.get_cell_from())
+    if piece == '.' or (piece.isupper()) != (move.get_team() == TeamEnum.WHITES.value):
+        raise IllegalMoveException('You can only move your own pieces')
+
+
+def validate_destination(move: Move, chess_board: ChessBoard):
+    """
+    The destination must be another cell, empty or holding an opponent piece
+    """
+    cell_from = move.get_cell_from()
+    cell_to = move.get_cell_to()
+    if cell_from == cell_to:
+        raise IllegalMoveException('You have to move the piece to another cell')
+    if to_square(cell_to) in chess_board.get_team_squares(move.get_team()):
+        raise IllegalMoveException('You cannot capture your own piece')
+
+
+def validate_knight_geometry(move: Move, chess_board: ChessBoard):
+    if not KNIGHT_ATTACKS[to_square(move.get_cell_from())] >> to_square(move.get_cell_to()) & 1:
+        raise IllegalMoveException('Knights can only move in an L')
+
+
+def validate_bishop_geometry(move: Move, chess_board: ChessBoard):
+    if not DIAGONAL_RAYS[to_square(move.get_cell_from())] >> to_square(move.get_cell_to()) & 1:
+        raise IllegalMoveException('Bishops can only move diagonally')
+
+
+def validate_rook_geometry(move: Move, chess_board: ChessBoard):
+    if not ORTHOGONAL_RAYS[to_square(move.get_cell_from())] >> to_square(move.get_cell_to()) & 1:
+        raise IllegalMoveException('Rooks can only move vertically or horizontally')
+
+
+def validate_queen_geometry(move: Move, chess_board: ChessBoard):
+    square_from = to_square(move.get_cell_from())
+    if not (DIAGONAL_RAYS[square_from] | ORTHOGONAL_RAYS[square_from]) >> to_square(move.get_cell_to()) & 1:
+        raise IllegalMoveException('Queens can only move in a straight line')
+
+
+def validate_king_geometry(move: Move, chess_board: ChessBoard):
+    if not KING_ATTACKS[to_square(move.get_cell_from())] >> to_square(move.get_cell_to()) & 1:
+        raise IllegalMoveException('Kings can only move one cell')
+
+
+def validate_path_is_clear(move: Move, chess_board: ChessBoard):
+    if BETWEEN[to_square(move.get_cell_from())][to_square(move.get_cell_to())] & chess_board.bitboards.occupied:
+        raise IllegalMoveException('There are pieces in the way')
+
+
+def validate_pawn_geometry(move: Move, chess_board: ChessBoard):
+    """
+    Pawn moves (en passant and promotions are special moves):
+    1. One cell forward to an empty cell
+    2. Two cells forward from the starting row, over and to empty cells
+    3. One cell diagonally forward to capture an opponent piece
+    """
+    team = move.get_team()
+    square_from = to_square(move.get_cell_from())
+    square_to = to_square(move.get_cell_to())
+    occupied = chess_board.bitboards.occupied
+    push = 8 if team == TeamEnum.WHITES.value else -8
+    if PAWN_ATTACKS[team][square_from] >> square_to & 1:
+        if not occupied >> square_to & 1:
+            raise IllegalMoveException('Pawn can only move diagonally to capture an opponent piece')
+    elif square_to == square_from + push:
+        if occupied >> square_to & 1:
+            raise IllegalMoveException('Pawn can only capture diagonally')
+    elif square_to == square_from + 2 * push:
+        if row_of(square_from) != (1 if team == TeamEnum.WHITES.value else 6):
+            raise IllegalMoveException('Pawn can only move two cells from its starting row')
+        if occupied & (1 << square_to | 1 << (square_from + push)):
+            raise IllegalMoveException('There are pieces in the way')
+    else:
+        raise IllegalMoveException('Pawn can only move forward')
+
+
+def validate_king_safety(move: Move, chess_board: ChessBoard):
+    """
+    The move cannot leave the team's king attacked:
+    1. The king cannot move to a cell the opponent attacks (read from the attack map, where the king does not block)
+    2. Other pieces pinned to the king must stay on the pin line
+    3. In check, other pieces must capture the checker or block it; in double check only the king can move
+    """
+    team = move.get_team()
+    opponent = OPPONENTS[team]
+    square_from = to_square(move.get_cell_from())
+    square_to = to_square(move.get_cell_to())
+    bitboards = chess_board.bitboards
+    king_square = chess_board.get_king_square(team)
+    if square_from == king_square:
+        if chess_board.get_attack_map(opponent).is_attacked(square_to):
+            raise IllegalMoveException('You will put yourself in check')
+        return
+
+    direction = DIRECTION_TO[king_square][square_from]
+    if direction != NO_DIRECTION and DIRECTION_TO[king_square][square_to] != direction \
+            and not BETWEEN[king_square][square_from] & bitboards.occupied:
+        beyond = RAYS[direction][square_from] & bitboards.occupied
+        if beyond:
+            pinner = (beyond & -beyond).bit_length() - 1 if direction in POSITIVE_DIRECTIONS \
+                else beyond.bit_length() - 1
+            keys = PIECE_KEYS[opponent]
+            sliders = (BISHOP, QUEEN) if direction in DIAGONAL_DIRECTIONS else (ROOK, QUEEN)
+            if chess_board.get_square(pinner) in (keys[sliders[0]], keys[sliders[1]]):
+                raise IllegalMoveException('That piece is pinned, you will put yourself in check')
+
+    checkers = bitboards.attackers_to(king_square, opponent)
+    if checkers:
+        if checkers & (checkers - 1):
+            raise IllegalMoveException('You are in double check, only the king can move')
+        checker = checkers.bit_length() - 1
+        if not ((1 << checker) | BETWEEN[king_square][checker]) >> square_to & 1:
+            raise IllegalMoveException('You are in check')
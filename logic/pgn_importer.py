@@ -0,0 +1,298 @@
+import os
+import re
+import time
+from multiprocessing import Pool
+from typing import Collection, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from config.rule_set import RuleSet
+from domain.chess_board import ChessBoard
+from domain.fen import STARTING_FEN
+from domain.game import Game
+from domain.move import Move
+from domain.squares import COLUMNS, NAMED_CELLS, SQUARE_NAMES, col_of, row_of, to_square
+from exception.illegal_move_exception import IllegalMoveException
+from exception.no_king_exception import NoKingException
+from logic.move_generation.move_generator import generate_legal_moves
+
+"""
+Streaming PGN import. read_games tokenises line by line, so a collection is never held in memory.
+Moves in Standard Algebraic Notation are resolved against the legal moves of the position and
+replayed through Game.make_move, castles as king to rook moves like the rest of the engine.
+import_pgn splits a file into chunks at game starts ('[Event' lines) and replays them in a process pool
+"""
+
+RESULTS = frozenset(['1-0', '0-1', '1/2-1/2', '*'])
+CASTLES = {'O-O': True, 'O-O-O': False, '0-0': True, '0-0-0': False}
+
+_TAG = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+_TOKEN = re.compile(r'[{}();]|\$\d+|[^\s{}();]+')
+_MOVE_NUMBER = re.compile(r'^\d+\.*')
+_SAN = re.compile(r'^([NBRQK])?([a-h])?([1-8])?(x)?([a-h][1-8])(?:=?([NBRQ]))?$')
+_GAME_START = b'[Event '
+
+
+class PgnGame(NamedTuple):
+    tags: Dict[str, str]
+    moves: List[str]
+    result: str
+
+
+class ReplayFailure(NamedTuple):
+    ply: int
+    san: str
+    message: str
+
+
+class GameFailure(NamedTuple):
+    """
+    The first illegal move of a game (ply 0 when its FEN tag is not playable), game_number counts from 1 in file order
+    """
+    game_number: int
+    tags: Dict[str, str]
+    ply: int
+    san: str
+    message: str
+
+
+class ImportReport(NamedTuple):
+    games: int
+    plies: int
+    failures: List[GameFailure]
+    seconds: float
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.seconds if self.seconds else 0.0
+
+
+def read_games(lines: Iterable[str]) -> Iterator[PgnGame]:
+    """
+    Yields the games of a PGN text as they are read, from any iterable of lines (a file, a stream).
+    Comments, variations, NAGs and move numbers are dropped
+    """
+    tags: Dict[str, str] = dict()
+    moves: List[str] = []
+    in_comment = False
+    variation_depth = 0
+    for line in lines:
+        if not in_comment and not variation_depth:
+            stripped = line.lstrip()
+            if stripped.startswith('%'):
+                continue
+            if stripped.startswith('['):
+                if moves:
+                    yield PgnGame(tags, moves, '*')
+                    tags, moves = dict(), []
+                for name, value in _TAG.findall(stripped):
+                    tags[name] = value.replace('\\"', '"').replace('\\\\', '\\')
+                continue
+        for match in _TOKEN.finditer(line):
+            token = match.group()
+            if in_comment:
+                in_comment = token != '}'
+            elif token == '{':
+                in_comment = True
+            elif token == ';':
+                break
+            elif token == '(':
+                variation_depth += 1
+            elif token == ')':
+                variation_depth = max(variation_depth - 1, 0)
+            elif variation_depth or token.startswith('$'):
+                continue
+            elif token in RESULTS:
+                yield PgnGame(tags, moves, token)
+                tags, moves = dict(), []
+            else:
+                san = _MOVE_NUMBER.sub('', token)
+                if san:
+                    moves.append(san)
+    if moves or tags:
+        yield PgnGame(tags, moves, '*')
+
+
+def _is_castle(move: Move, chess_board: ChessBoard) -> bool:
+    squares = chess_board.squares
+    piece = squares[to_square(move.get_cell_from())]
+    target = squares[to_square(move.get_cell_to())]
+    return piece.upper() == 'K' and target.upper() == 'R' and piece.isupper() == target.isupper()
+
+
+def resolve_san(san: str, chess_board: ChessBoard, legal_moves: List[Move]) -> Move:
+    """
+    The legal move written as san. Raises IllegalMoveException if there is none or more than one
+    """
+    notation = san.rstrip('+#!?')
+    if notation in CASTLES:
+        kingside = CASTLES[notation]
+        castles = [move for move in legal_moves if _is_castle(move, chess_board)
+                   and (to_square(move.get_cell_to()) > to_square(move.get_cell_from())) == kingside]
+        if len(castles) != 1:
+            raise IllegalMoveException(f'Illegal move: {san}')
+        return castles[0]
+
+    match = _SAN.match(notation)
+    if match is None:
+        raise IllegalMoveException(f'Invalid SAN: {san}')
+    piece_type, from_column, from_row, _, target, promotion = match.groups()
+    piece_type = piece_type or 'P'
+    square_to = NAMED_CELLS[target].index
+    squares = chess_board.squares
+    candidates = []
+    for move in legal_moves:
+        square_from = to_square(move.get_cell_from())
+        if to_square(move.get_cell_to()) != square_to or squares[square_from].upper() != piece_type \
+                or _is_castle(move, chess_board):
+            continue
+        if from_column and COLUMNS[col_of(square_from)] != from_column \
+                or from_row and row_of(square_from) + 1 != int(from_row):
+            continue
+        additional_data = move.get_additional_data()
+        if (additional_data.upper() if additional_data else None) != promotion:
+            continue
+        candidates.append(move)
+    if not candidates:
+        raise IllegalMoveException(f'Illegal move: {san}')
+    if len(candidates) > 1:
+        raise IllegalMoveException(f'Ambiguous move: {san}')
+    return candidates[0]
+
+
+def move_to_san(move: Move, chess_board: ChessBoard, legal_moves: List[Move]) -> str:
+    """
+    The SAN of a legal move, before it is played. Check and mate marks are not written
+    """
+    square_from = to_square(move.get_cell_from())
+    square_to = to_square(move.get_cell_to())
+    if _is_castle(move, chess_board):
+        return 'O-O' if square_to > square_from else 'O-O-O'
+    squares = chess_board.squares
+    piece_type = squares[square_from].upper()
+    target = SQUARE_NAMES[square_to]
+    if piece_type == 'P':
+        if col_of(square_from) == col_of(square_to):
+            san = target
+        else:
+            san = COLUMNS[col_of(square_from)] + 'x' + target
+        additional_data = move.get_additional_data()
+        return san + '=' + additional_data.upper() if additional_data else san
+
+    rivals = [to_square(other.get_cell_from()) for other in legal_moves
+              if to_square(other.get_cell_to()) == square_to and to_square(other.get_cell_from()) != square_from
+              and squares[to_square(other.get_cell_from())].upper() == piece_type]
+    disambiguation = ''
+    if rivals:
+        if all(col_of(rival) != col_of(square_from) for rival in rivals):
+            disambiguation = COLUMNS[col_of(square_from)]
+        elif all(row_of(rival) != row_of(square_from) for rival in rivals):
+            disambiguation = str(row_of(square_from) + 1)
+        else:
+            disambiguation = SQUARE_NAMES[square_from]
+    capture = 'x' if squares[square_to] != '.' else ''
+    return piece_type + disambiguation + capture + target
+
+
+def replay_game(pgn_game: PgnGame,
+                rule_set: Optional[RuleSet] = None) -> Tuple[Optional[Game], Optional[ReplayFailure]]:
+    """
+    Plays the game from its FEN tag (the starting position by default) and stops at the first illegal move.
+    A FEN tag that gives no playable position fails at ply 0, without a game
+    """
+    fen = pgn_game.tags.get('FEN', STARTING_FEN)
+    try:
+        game = Game.from_fen(fen, rule_set)
+    except (IllegalMoveException, NoKingException) as error:
+        return None, ReplayFailure(0, '', str(error))
+    special_moves = game.rule_set.get_enabled_special_move_names()
+    for ply, san in enumerate(pgn_game.moves, 1):
+        chess_board = game.chess_board
+        try:
+            legal_moves = generate_legal_moves(chess_board.side_to_move, chess_board, special_moves)
+            game.make_move(resolve_san(san, chess_board, legal_moves))
+        except IllegalMoveException as error:
+            return game, ReplayFailure(ply, san, str(error))
+    return game, None
+
+
+def _read_lines(path: str, start: int, end: int) -> Iterator[str]:
+    with open(path, 'rb') as pgn_file:
+        pgn_file.seek(start)
+        position = start
+        while position < end:
+            line = pgn_file.readline()
+            if not line:
+                break
+            position += len(line)
+            yield line.decode('utf-8', errors='replace')
+
+
+def _import_chunk(arguments: Tuple[str, int, int]) -> Tuple[int, int, List[GameFailure]]:
+    """
+    Games, plies and failures of a chunk, failures numbered within the chunk
+    """
+    path, start, end = arguments
+    games = plies = 0
+    failures = []
+    for pgn_game in read_games(_read_lines(path, start, end)):
+        games += 1
+        _, failure = replay_game(pgn_game)
+        if failure is None:
+            plies += len(pgn_game.moves)
+        else:
+            plies += max(failure.ply - 1, 0)
+            failures.append(GameFailure(games, pgn_game.tags, *failure))
+    return games, plies, failures
+
+
+def find_chunks(path: str, chunks: int) -> List[Tuple[int, int]]:
+    """
+    Byte ranges of about equal size that start at a game start.
+    A file without '[Event' tags is a single chunk
+    """
+    size = os.path.getsize(path)
+    bounds = {0, size}
+    with open(path, 'rb') as pgn_file:
+        for chunk in range(1, chunks):
+            pgn_file.seek(size * chunk // chunks)
+            pgn_file.readline()
+            while True:
+                position = pgn_file.tell()
+                line = pgn_file.readline()
+                if not line or line.startswith(_GAME_START):
+                    bounds.add(position)
+                    break
+    bounds = sorted(bounds)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def import_pgn(path: str, processes: Optional[int] = None, chunks_per_process: int = 4) -> ImportReport:
+    """
+    Replays every game of the file over a process pool (all cores when processes is None,
+    in this process when it is 1). Workers use their own current rule set
+    """
+    started = time.perf_counter()
+    processes = processes or os.cpu_count() or 1
+    work = [(path, start, end) for start, end in find_chunks(path, processes * chunks_per_process)]
+    if processes == 1:
+        results: Iterable[Tuple[int, int, List[GameFailure]]] = map(_import_chunk, work)
+        return _merge(results, started)
+    with Pool(processes) as pool:
+        return _merge(pool.imap(_import_chunk, work), started)
+
+
+def _merge(results: Iterable[Tuple[int, int, List[GameFailure]]], started: float) -> ImportReport:
+    games = plies = 0
+    failures: List[GameFailure] = []
+    for chunk_games, chunk_plies, chunk_failures in results:
+        failures += [failure._replace(game_number=games + failure.game_number) for failure in chunk_failures]
+        games += chunk_games
+        plies += chunk_plies
+    return ImportReport(games, plies, failures, time.perf_counter() - started)
+
+
+def write_game(moves: Collection[str], tags: Dict[str, str], result: str = '*') -> str:
+    """
+    A PGN game of SAN moves, starting with white
+    """
+    header = ''.join(f'[{name} "{value}"]\n' for name, value in tags.items())
+    numbered = [f'{index // 2 + 1}. {san}' if index % 2 == 0 else san for index, san in enumerate(moves)]
+    return f'{header}\n{" ".join(numbered + [result])}\n\n'
@@ -0,0 +1,73 @@
+from typing import Collection, Dict, FrozenSet, List, Mapping, Optional
+from weakref import WeakKeyDictionary
+from config.config_wrapper import ConfigurationWrapper
+from config.rule_set import RuleSet
+from domain.chess_board import ChessBoard
+from domain.move import Move
+from domain.special_move import SpecialMove
+
+PIECE_TYPES = 'pnbrqk'
+
+
+class SpecialMoveRegistry:
+    """
+    Special moves compiled once from a rule set and indexed by the type of the moved piece,
+    so an ordinary move costs one board read and one dict lookup.
+    A special move without a configured moved_piece is tried for every piece
+    """
+
+    special_moves: List[SpecialMove]
+    special_moves_by_piece: Dict[str, List[SpecialMove]]
+
+    def __init__(self, configurations: List[Mapping]):
+        self.special_moves = [SpecialMove(configuration) for configuration in configurations]
+        self.special_moves_by_piece = dict()
+        for special_move in self.special_moves:
+            piece_types = special_move.moved_piece or PIECE_TYPES
+            for piece_type in piece_types:
+                self.special_moves_by_piece.setdefault(piece_type, []).append(special_move)
+
+    def find(self, move: Move, chess_board: ChessBoard) -> Optional[SpecialMove]:
+        """
+        The first special move being executed by the move, None for ordinary moves
+        """
+        candidates = self.special_moves_by_piece.get(chess_board.get_cell(move.get_cell_from()).lower())
+        if candidates:
+            for special_move in candidates:
+                if special_move.is_being_executed_by(move, chess_board):
+                    return special_move
+        return None
+
+
+_registries: 'WeakKeyDictionary[RuleSet, SpecialMoveRegistry]' = WeakKeyDictionary()
+_registries_by_names: 'WeakKeyDictionary[RuleSet, Dict[FrozenSet[str], SpecialMoveRegistry]]' = WeakKeyDictionary()
+
+
+def get_special_move_registry(rule_set: Optional[RuleSet] = None) -> SpecialMoveRegistry:
+    """
+    Registry of the special moves enabled in the rule set (the current one by default),
+    compiled once per rule set
+    """
+    if rule_set is None:
+        rule_set = ConfigurationWrapper.get_rule_set()
+    registry = _registries.get(rule_set)
+    if registry is None:
+        registry = SpecialMoveRegistry(list(rule_set.enabled_special_moves))
+        _registries[rule_set] = registry
+    return registry
+
+
+def get_special_move_registry_for(names: Collection[str], rule_set: Optional[RuleSet] = None) -> SpecialMoveRegistry:
+    """
+    Registry of the named special moves, whether or not they are enabled in the rule set
+    """
+    if rule_set is None:
+        rule_set = ConfigurationWrapper.get_rule_set()
+    names = frozenset(names)
+    registries = _registries_by_names.setdefault(rule_set, dict())
+    registry = registries.get(names)
+    if registry is None:
+        registry = SpecialMoveRegistry(
+            [configuration for configuration in rule_set.special_moves if configuration['name'] in names])
+        registries[names] = registry
+    return registry
@@ -0,0 +1,58 @@
+import random
+import unittest
+from domain.bitboards import OPPONENTS
+from domain.chess_board import ChessBoard
+from domain.squares import SQUARE_CELLS
+from domain.teams import TeamEnum
+from logic.move_generation.move_generator import STANDARD_SPECIAL_MOVES, generate_legal_moves
+from logic.move_generation.perft import PERFT_POSITIONS, _make_move
+from logic.move_validations import is_in_check
+
+try:
+    import numpy
+    from logic.batch_attacks import attack_maps, check_flags, encode_boards
+except ImportError:
+    numpy = None
+
+
+def _sample_boards() -> list:
+    boards = [ChessBoard(board_string, team) for board_string, team, _ in PERFT_POSITIONS.values()]
+    randomizer = random.Random(7)
+    for board_string, team, _ in PERFT_POSITIONS.values():
+        chess_board = ChessBoard(board_string, team)
+        for _ in range(12):
+            moves = generate_legal_moves(chess_board.side_to_move, chess_board, STANDARD_SPECIAL_MOVES)
+            if not moves:
+                break
+            _make_move(randomizer.choice(moves), chess_board, STANDARD_SPECIAL_MOVES)
+            boards.append(ChessBoard(chess_board.to_board_string(), chess_board.side_to_move))
+    return boards
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class TestBatchAttacks(unittest.TestCase):
+
+    def test_encode_boards(self):
+        positions = encode_boards([ChessBoard()])
+        self.assertEqual((1, 64), positions.shape)
+        self.assertEqual(5, positions[0, 3])
+        self.assertEqual(-6, positions[0, 60])
+        self.assertEqual(0, positions[0, 30])
+
+    def test_attack_maps_match_is_in_check(self):
+        boards = _sample_boards()
+        positions = encode_boards(boards)
+        for team in TeamEnum:
+            attacked = attack_maps(positions, OPPONENTS[team.value]).reshape(-1, 64)
+            for index, chess_board in enumerate(boards):
+                expected = [is_in_check(cell, team.value, chess_board) for cell in SQUARE_CELLS]
+                self.assertEqual(expected, attacked[index].tolist())
+
+    def test_check_flags_match_is_king_in_check(self):
+        boards = _sample_boards()
+        flags = check_flags(encode_boards(boards).reshape(-1, 8, 8))
+        for team in TeamEnum:
+            expected = [is_in_check(SQUARE_CELLS[chess_board.get_king_square(team.value)], team.value, chess_board)
+                        for chess_board in boards]
+            self.assertEqual(expected, flags[team.value].tolist())
+        self.assertTrue(any(flags[TeamEnum.WHITES.value]) or any(flags[TeamEnum.BLACKS.value]))
@@ -0,0 +1,70 @@
+import random
+import unittest
+from domain.chess_board import ChessBoard
+from logic.game_termination import has_legal_move
+from logic.move_generation.move_generator import EN_PASSANT, IL_VATICANO, STANDARD_SPECIAL_MOVES, \
+    generate_legal_moves
+from logic.move_generation.perft import PERFT_POSITIONS
+from logic.special_move_registry import get_special_move_registry_for
+
+# Black is in check from the pawn that just moved two squares, taking it en passant is the only way out
+EN_PASSANT_ONLY = '1RB5/8/8/k7/1Pp5/8/8/3QK3 b - b3 0 1'
+
+
+class TestHasLegalMove(unittest.TestCase):
+
+    def assertAgreesWithGenerator(self, chess_board: ChessBoard, special_moves=STANDARD_SPECIAL_MOVES):
+        team = chess_board.side_to_move
+        self.assertEqual(bool(generate_legal_moves(team, chess_board, special_moves)),
+                         has_legal_move(team, chess_board, special_moves))
+
+    def test_terminal_positions(self):
+        for fen, expected in [
+            ('rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3', False),
+            ('7k/5Q2/6K1/8/8/8/8/8 b - - 0 1', False),
+            ('k7/8/1Q6/8/8/8/8/7K b - - 0 1', False),
+            ('6rk/6pp/8/8/8/8/8/R6K w - - 0 1', True),
+            ('6rk/5Npp/8/8/8/8/8/7K b - - 0 1', False),
+            ('K7/1q6/2k5/8/8/8/8/8 w - - 0 1', False),
+            ('K7/1q6/2k5/8/8/8/8/1R6 w - - 0 1', True),
+            (EN_PASSANT_ONLY, True),
+            ('k7/8/8/r7/r6K/7P/1P6/6r1 w - - 0 1', True),
+            ('6R1/1p6/R7/R6k/7p/8/8/K7 b - - 0 1', True),
+            ('k7/8/8/r7/r6K/7P/8/6r1 w - - 0 1', False),
+            ('4k3/8/8/8/8/8/8/4K2R w K - 0 1', True),
+        ]:
+            with self.subTest(fen=fen):
+                chess_board = ChessBoard.from_fen(fen)
+                self.assertEqual(expected, has_legal_move(chess_board.side_to_move, chess_board,
+                                                          STANDARD_SPECIAL_MOVES))
+                self.assertAgreesWithGenerator(chess_board)
+
+    def test_en_passant_disabled(self):
+        chess_board = ChessBoard.from_fen(EN_PASSANT_ONLY)
+        self.assertFalse(has_legal_move(chess_board.side_to_move, chess_board, []))
+        self.assertAgreesWithGenerator(chess_board, [IL_VATICANO])
+        self.assertAgreesWithGenerator(chess_board, [EN_PASSANT, IL_VATICANO])
+
+    def test_agrees_with_the_generator_in_random_games(self):
+        registry = get_special_move_registry_for(STANDARD_SPECIAL_MOVES)
+        for name, (board_string, team, _) in PERFT_POSITIONS.items():
+            randomizer = random.Random(name)
+            for game_number in range(10):
+                chess_board = ChessBoard(board_string, team)
+                for _ in range(120):
+                    with self.subTest(position=name, game=game_number, fen=chess_board.to_fen()):
+                        self.assertAgreesWithGenerator(chess_board)
+                    moves = generate_legal_moves(chess_board.side_to_move, chess_board, STANDARD_SPECIAL_MOVES)
+                    if not moves:
+                        break
+                    move = randomizer.choice(moves)
+                    special_move = registry.find(move, chess_board)
+                    if special_move is not None:
+                        special_move.create_executor(move)(chess_board)
+                    else:
+                        chess_board.apply_move(move)
+                    chess_board.end_turn()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,7 @@ from domain.move import Move
 from domain.chess_board import ChessBoard
 from domain.teams import TeamEnum
 from exception.illegal_move_exception import IllegalMoveException
-from logic.move_constructors import create_castle_steps,create_en_passant_steps
+from logic.move_constructors import create_castle_steps,create_en_passant_steps,create_il_vaticano_steps,create_pawn_promotion_steps
 
 """""""""""""""""""""""
 UPPERCASE: whites
@@ -131,3 +131,96 @@ class TestEnPassantConstruction(unittest.TestCase):
         self.assertEquals('.', chess_board._get_cell('c', 5))   
         self.assertEquals('P', chess_board._get_cell('c', 6))
 
+
+
+class TestPawnPromotionConstruction(unittest.TestCase):
+
+    def test_promotion_whites(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('g', 7, 'P')
+        chess_board._set_cell('g', 8, '.')
+        promotion_move = Move(TeamEnum.WHITES.value, "g7", "g8", 'q')
+
+        execute_function = create_pawn_promotion_steps(promotion_move)
+        execute_function(chess_board)
+        self.assertEqual('.', chess_board._get_cell('g', 7))
+        self.assertEqual('Q', chess_board._get_cell('g', 8))
+
+    def test_promotion_blacks_capturing(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('d', 2, 'p')
+        promotion_move = Move(TeamEnum.BLACKS.value, "d2", "c1", 'N')
+
+        execute_function = create_pawn_promotion_steps(promotion_move)
+        execute_function(chess_board)
+        self.assertEqual('.', chess_board._get_cell('d', 2))
+        self.assertEqual('n', chess_board._get_cell('c', 1))
+
+
+class TestIlVaticanoConstruction(unittest.TestCase):
+
+    def test_il_vaticano_horizontal(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('c', 4, 'B')
+        chess_board._set_cell('d', 4, 'p')
+        chess_board._set_cell('e', 4, 'p')
+        chess_board._set_cell('f', 4, 'B')
+        il_vaticano_move = Move(TeamEnum.WHITES.value, "c4", "f4", None)
+
+        execute_function = create_il_vaticano_steps(il_vaticano_move)
+        steps = execute_function(chess_board)
+        self.assertEqual(4, len(steps))
+        self.assertEqual('B', chess_board._get_cell('c', 4))
+        self.assertEqual('.', chess_board._get_cell('d', 4))
+        self.assertEqual('.', chess_board._get_cell('e', 4))
+        self.assertEqual('B', chess_board._get_cell('f', 4))
+
+    def test_il_vaticano_vertical(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('d', 6, 'b')
+        chess_board._set_cell('d', 5, 'P')
+        chess_board._set_cell('d', 4, 'P')
+        chess_board._set_cell('d', 3, 'b')
+        il_vaticano_move = Move(TeamEnum.BLACKS.value, "d3", "d6", None)
+
+        execute_function = create_il_vaticano_steps(il_vaticano_move)
+        execute_function(chess_board)
+        self.assertEqual('b', chess_board._get_cell('d', 6))
+        self.assertEqual('.', chess_board._get_cell('d', 5))
+        self.assertEqual('.', chess_board._get_cell('d', 4))
+        self.assertEqual('b', chess_board._get_cell('d', 3))
+
+
+class TestReversibleConstruction(unittest.TestCase):
+
+    def test_unmake_castle(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('f', 1, '.')
+        chess_board._set_cell('g', 1, '.')
+        before = chess_board.to_string()
+
+        chess_board.make_steps(create_castle_steps(Move(TeamEnum.WHITES.value, "e1", "h1", None)))
+        self.assertEqual('K', chess_board._get_cell('g', 1))
+        chess_board.unmake_move()
+        self.assertEqual(before, chess_board.to_string())
+
+    def test_unmake_en_passant(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('d', 5, 'P')
+        chess_board._set_cell('c', 5, 'p')
+        before = chess_board.to_string()
+
+        chess_board.make_steps(create_en_passant_steps(Move(TeamEnum.WHITES.value, "d5", "c6", None)))
+        chess_board.unmake_move()
+        self.assertEqual(before, chess_board.to_string())
+
+    def test_unmake_promotion(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('b', 7, 'P')
+        before = chess_board.to_string()
+
+        with chess_board.probe():
+            create_pawn_promotion_steps(Move(TeamEnum.WHITES.value, "b7", "a8", 'Q'))(chess_board)
+            self.assertEqual('Q', chess_board._get_cell('a', 8))
+        self.assertEqual(before, chess_board.to_string())
+        self.assertEqual(0, chess_board.bitboards.pieces['Q'] & (1 << 56))
@@ -0,0 +1,131 @@
+import unittest
+from domain.castling_rights import WHITE_KINGSIDE
+from domain.chess_board import ChessBoard
+from domain.move import Move
+from domain.squares import to_square
+from domain.teams import TeamEnum
+from logic.move_generation.move_generator import CASTLE, EN_PASSANT, IL_VATICANO, PAWN_PROMOTION, \
+    STANDARD_SPECIAL_MOVES, generate_legal_moves
+
+"""""""""""""""""""""""
+UPPERCASE: whites
+lowercase: blacks
+ 8   r n b q k b n r
+ 7   p p p p p p p p
+ 6   . . . . . . . .
+ 5   . . . . . . . .
+ 4   . . . . . . . .
+ 3   . . . . . . . .
+ 2   P P P P P P P P
+ 1   R N B Q K B N R
+
+     A B C D E F G H
+"""""""""""""""""""""""
+
+EMPTY_BOARD = ";".join([". . . . . . . ."] * 8)
+
+
+def _as_strings(moves: list) -> set:
+    return {move.get_cell_from()[0] + str(move.get_cell_from()[1])
+            + move.get_cell_to()[0] + str(move.get_cell_to()[1])
+            + (move.get_additional_data() or '') for move in moves}
+
+
+class TestMoveGeneration(unittest.TestCase):
+
+    def test_starting_position(self):
+        chess_board = ChessBoard()
+        moves = generate_legal_moves(TeamEnum.WHITES.value, chess_board, STANDARD_SPECIAL_MOVES)
+        self.assertEqual(20, len(moves))
+        self.assertIn('g1f3', _as_strings(moves))
+        self.assertIn('e2e4', _as_strings(moves))
+
+    def test_pinned_piece_stays_on_pin_line(self):
+        chess_board = ChessBoard(EMPTY_BOARD)
+        chess_board._set_cell('e', 1, 'K')
+        chess_board._set_cell('e', 3, 'R')
+        chess_board._set_cell('e', 8, 'r')
+        chess_board._set_cell('a', 8, 'k')
+        moves = _as_strings(generate_legal_moves(TeamEnum.WHITES.value, chess_board, STANDARD_SPECIAL_MOVES))
+        rook_moves = {move for move in moves if move.startswith('e3')}
+        self.assertEqual({'e3e2', 'e3e4', 'e3e5', 'e3e6', 'e3e7', 'e3e8'}, rook_moves)
+
+    def test_check_must_be_answered(self):
+        chess_board = ChessBoard(EMPTY_BOARD)
+        chess_board._set_cell('e', 1, 'K')
+        chess_board._set_cell('a', 2, 'N')
+        chess_board._set_cell('b', 4, 'b')
+        chess_board._set_cell('h', 8, 'k')
+        moves = _as_strings(generate_legal_moves(TeamEnum.WHITES.value, chess_board, STANDARD_SPECIAL_MOVES))
+        self.assertEqual({'a2b4', 'a2c3', 'e1e2', 'e1f2', 'e1f1', 'e1d1'}, moves)
+
+    def test_double_check_only_king_moves(self):
+        chess_board = ChessBoard(EMPTY_BOARD)
+        chess_board._set_cell('e', 1, 'K')
+        chess_board._set_cell('d', 1, 'Q')
+        chess_board._set_cell('e', 8, 'r')
+        chess_board._set_cell('d', 3, 'n')
+        chess_board._set_cell('h', 8, 'k')
+        moves = generate_legal_moves(TeamEnum.WHITES.value, chess_board, STANDARD_SPECIAL_MOVES)
+        self.assertTrue(all(move.get_cell_from() == tuple(['e', 1]) for move in moves))
+
+    def test_castles_are_king_to_rook_moves(self):
+        chess_board = ChessBoard()
+        for col in ['b', 'c', 'd', 'f', 'g']:
+            chess_board._set_cell(col, 1, '.')
+        moves = _as_strings(generate_legal_moves(TeamEnum.WHITES.value, chess_board, [CASTLE]))
+        self.assertIn('e1h1', moves)
+        self.assertIn('e1a1', moves)
+
+        chess_board.set_castling_rights(chess_board.castling_rights & ~WHITE_KINGSIDE)
+        moves = _as_strings(generate_legal_moves(TeamEnum.WHITES.value, chess_board, [CASTLE]))
+        self.assertNotIn('e1h1', moves)
+        self.assertIn('e1a1', moves)
+
+    def test_cannot_castle_through_attacked_square(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('f', 1, '.')
+        chess_board._set_cell('g', 1, '.')
+        chess_board._set_cell('f', 2, '.')
+        chess_board._set_cell('f', 5, 'r')
+        moves = _as_strings(generate_legal_moves(TeamEnum.WHITES.value, chess_board, [CASTLE]))
+        self.assertNotIn('e1h1', moves)
+
+    def test_en_passant_only_after_double_push(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('e', 5, 'P')
+        chess_board._set_cell('d', 7, '.')
+        chess_board._set_cell('d', 5, 'p')
+        moves = _as_strings(generate_legal_moves(TeamEnum.WHITES.value, chess_board, [EN_PASSANT]))
+        self.assertNotIn('e5d6', moves)
+        chess_board.set_en_passant_square(to_square(tuple(['d', 6])))
+        moves = _as_strings(generate_legal_moves(TeamEnum.WHITES.value, chess_board, [EN_PASSANT]))
+        self.assertIn('e5d6', moves)
+        chess_board.set_en_passant_square(None)
+        chess_board.apply_move(Move(TeamEnum.BLACKS.value, 'd5', 'd7', None))
+        chess_board.apply_move(Move(TeamEnum.BLACKS.value, 'd7', 'd5', None))
+        moves = _as_strings(generate_legal_moves(TeamEnum.WHITES.value, chess_board, [EN_PASSANT]))
+        self.assertIn('e5d6', moves)
+        chess_board.apply_move(Move(TeamEnum.BLACKS.value, 'h7', 'h6', None))
+        moves = _as_strings(generate_legal_moves(TeamEnum.WHITES.value, chess_board, [EN_PASSANT]))
+        self.assertNotIn('e5d6', moves)
+
+    def test_promotions(self):
+        chess_board = ChessBoard(EMPTY_BOARD)
+        chess_board._set_cell('a', 1, 'K')
+        chess_board._set_cell('h', 8, 'k')
+        chess_board._set_cell('c', 7, 'P')
+        moves = _as_strings(generate_legal_moves(TeamEnum.WHITES.value, chess_board, [PAWN_PROMOTION]))
+        self.assertEqual({'c7c8Q', 'c7c8R', 'c7c8B', 'c7c8N'}, {move for move in moves if move.startswith('c7')})
+
+    def test_il_vaticano(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('c', 4, 'B')
+        chess_board._set_cell('d', 4, 'p')
+        chess_board._set_cell('e', 4, 'p')
+        chess_board._set_cell('f', 4, 'B')
+        moves = _as_strings(generate_legal_moves(TeamEnum.WHITES.value, chess_board, [IL_VATICANO]))
+        self.assertIn('c4f4', moves)
+        self.assertIn('f4c4', moves)
+        moves = _as_strings(generate_legal_moves(TeamEnum.WHITES.value, chess_board, STANDARD_SPECIAL_MOVES))
+        self.assertNotIn('c4f4', moves)
@@ -1,7 +1,7 @@
 import unittest
 from domain.move import Move
 from domain.chess_board import ChessBoard
-from logic.move_identifiers import is_castle, is_en_passant, is_pawn_promotion
+from logic.move_identifiers import is_castle, is_en_passant, is_il_vaticano, is_pawn_promotion
 
 """""""""""""""""""""""
 UPPERCASE: whites
@@ -162,3 +162,42 @@ class TestPawnPromotionIdentify(unittest.TestCase):
         chess_board._set_cell('g', 8, 'k')
         move = Move('WHITES', 'g7', 'g8', 'Q')
         self.assertFalse(is_pawn_promotion(move, chess_board))
+
+
+class TestIlVaticanoIdentify(unittest.TestCase):
+
+    def test_is_move_horizontal(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('c', 4, 'B')
+        chess_board._set_cell('d', 4, 'p')
+        chess_board._set_cell('e', 4, 'p')
+        chess_board._set_cell('f', 4, 'B')
+        move = Move('WHITES', 'c4', 'f4', None)
+        self.assertTrue(is_il_vaticano(move, chess_board))
+
+    def test_is_move_vertical(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('d', 6, 'b')
+        chess_board._set_cell('d', 5, 'P')
+        chess_board._set_cell('d', 4, 'P')
+        chess_board._set_cell('d', 3, 'b')
+        move = Move('BLACKS', 'd6', 'd3', None)
+        self.assertTrue(is_il_vaticano(move, chess_board))
+
+    def test_is_not_move_own_pawns(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('c', 4, 'B')
+        chess_board._set_cell('d', 4, 'P')
+        chess_board._set_cell('e', 4, 'P')
+        chess_board._set_cell('f', 4, 'B')
+        move = Move('WHITES', 'c4', 'f4', None)
+        self.assertFalse(is_il_vaticano(move, chess_board))
+
+    def test_is_not_move_diagonal(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('c', 3, 'B')
+        chess_board._set_cell('d', 4, 'p')
+        chess_board._set_cell('e', 5, 'p')
+        chess_board._set_cell('f', 6, 'B')
+        move = Move('WHITES', 'c3', 'f6', None)
+        self.assertFalse(is_il_vaticano(move, chess_board))
@@ -0,0 +1,93 @@
+import unittest
+from domain.chess_board import ChessBoard
+from domain.move import Move
+from domain.teams import TeamEnum
+from exception.illegal_move_exception import IllegalMoveException
+from logic.move_generation.move_generator import STANDARD_SPECIAL_MOVES, generate_legal_moves
+from logic.move_generation.perft import PERFT_POSITIONS
+from logic.move_validation_elector import get_validations_for
+from logic.special_move_registry import get_special_move_registry_for
+
+WHITES = TeamEnum.WHITES.value
+BLACKS = TeamEnum.BLACKS.value
+
+
+def _is_valid(move: Move, chess_board: ChessBoard) -> bool:
+    try:
+        for validate_function in get_validations_for(move, chess_board):
+            validate_function(move, chess_board)
+    except IllegalMoveException:
+        return False
+    return True
+
+
+class TestMoveValidationElector(unittest.TestCase):
+
+    def assertValidatesGeneratedMoves(self, chess_board: ChessBoard):
+        """
+        Out of every (from, to) pair of the side to move, validation accepts exactly the generated ordinary moves
+        """
+        team = chess_board.side_to_move
+        registry = get_special_move_registry_for(STANDARD_SPECIAL_MOVES)
+        generated = set()
+        for move in generate_legal_moves(team, chess_board, STANDARD_SPECIAL_MOVES):
+            if registry.find(move, chess_board) is None:
+                generated.add((move.get_cell_from(), move.get_cell_to()))
+        validated = set()
+        for square_from in chess_board.get_team_squares(team):
+            for square_to in range(64):
+                move = Move.from_squares(team, square_from, square_to)
+                if registry.find(move, chess_board) is None and _is_valid(move, chess_board):
+                    validated.add((move.get_cell_from(), move.get_cell_to()))
+        self.assertEqual(generated, validated)
+
+    def test_agrees_with_the_move_generator(self):
+        for name, (board_string, team, _) in PERFT_POSITIONS.items():
+            chess_board = ChessBoard(board_string, team)
+            with self.subTest(position=name):
+                self.assertValidatesGeneratedMoves(chess_board)
+            # Every position after an ordinary move, many of them in check
+            registry = get_special_move_registry_for(STANDARD_SPECIAL_MOVES)
+            for move in generate_legal_moves(team, chess_board, STANDARD_SPECIAL_MOVES):
+                if registry.find(move, chess_board) is not None:
+                    continue
+                with self.subTest(position=name, move=move), chess_board.probe():
+                    chess_board.apply_move(move)
+                    chess_board.end_turn()
+                    self.assertValidatesGeneratedMoves(chess_board)
+
+    def test_errors(self):
+        pinned = '4k3/8/8/8/1b6/7n/3P4/R3K1N1 w - - 0 1'
+        in_check = '4k3/8/8/8/8/8/8/R3K2r w - - 0 1'
+        double_check = '4k3/8/8/8/8/3n4/8/R3K2r w - - 0 1'
+        for fen, move, message in [
+            (pinned, Move(WHITES, 'e3', 'e4', None), 'You can only move your own pieces'),
+            (pinned, Move(WHITES, 'e8', 'e7', None), 'You can only move your own pieces'),
+            (pinned, Move(WHITES, 'a1', 'e1', None), 'You cannot capture your own piece'),
+            (pinned, Move(WHITES, 'g1', 'g3', None), 'Knights can only move in an L'),
+            (pinned, Move(WHITES, 'a1', 'b2', None), 'Rooks can only move vertically or horizontally'),
+            (pinned, Move(WHITES, 'a1', 'f1', None), 'There are pieces in the way'),
+            (pinned, Move(WHITES, 'd2', 'd5', None), 'Pawn can only move forward'),
+            (pinned, Move(WHITES, 'd2', 'c3', None), 'Pawn can only move diagonally to capture an opponent piece'),
+            (pinned, Move(WHITES, 'd2', 'd3', None), 'That piece is pinned, you will put yourself in check'),
+            (pinned, Move(WHITES, 'e1', 'f2', None), 'You will put yourself in check'),
+            (in_check, Move(WHITES, 'a1', 'a2', None), 'You are in check'),
+            (in_check, Move(WHITES, 'e1', 'f1', None), 'You will put yourself in check'),
+            (double_check, Move(WHITES, 'a1', 'd1', None), 'You are in double check, only the king can move'),
+        ]:
+            chess_board = ChessBoard.from_fen(fen)
+            with self.subTest(move=move), self.assertRaises(IllegalMoveException) as context:
+                for validate_function in get_validations_for(move, chess_board):
+                    validate_function(move, chess_board)
+            self.assertEqual(message, str(context.exception))
+
+    def test_blocking_and_capturing_the_checker(self):
+        chess_board = ChessBoard.from_fen('4k3/8/8/6R1/8/8/5N2/4K2r w - - 0 1')
+        self.assertTrue(_is_valid(Move(WHITES, 'g5', 'g1', None), chess_board))
+        self.assertTrue(_is_valid(Move(WHITES, 'f2', 'h1', None), chess_board))
+        self.assertFalse(_is_valid(Move(WHITES, 'f2', 'd3', None), chess_board))
+        self.assertTrue(_is_valid(Move(WHITES, 'e1', 'e2', None), chess_board))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 from domain.move import Move
 from domain.chess_board import ChessBoard
+from domain.squares import to_square
 from domain.teams import TeamEnum
 from exception.illegal_move_exception import IllegalMoveException
 from logic.move_validations import validate_castle, is_in_check, validate_en_passant, validate_pawn_promotion
@@ -143,6 +144,26 @@ class TestCheckValidator(unittest.TestCase):
             chess_board
         ))
 
+    def test_is_in_check_king_adjacent(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('e', 5, 'K')
+        chess_board._set_cell('f', 6, 'k')
+        self.assertTrue(is_in_check(
+            tuple(['e', 5]),
+            TeamEnum.WHITES.value,
+            chess_board
+        ))
+
+    def test_is_not_in_check_pawn_behind(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('d', 5, 'K')
+        chess_board._set_cell('e', 4, 'p')
+        self.assertFalse(is_in_check(
+            tuple(['d', 5]),
+            TeamEnum.WHITES.value,
+            chess_board
+        ))
+
     def test_is_not_in_check_no_pieces(self):
         chess_board = ChessBoard()
         chess_board._set_cell('f', 4, 'K')
@@ -162,7 +183,7 @@ class TestCastleValidate(unittest.TestCase):
         chess_board._set_cell('d', 1, '.')
         move = Move(TeamEnum.WHITES.value, 'e1', 'a1', None)
 
-        validate_castle(move, chess_board, [])
+        validate_castle(move, chess_board)
 
         self.assertTrue(True)
 
@@ -172,7 +193,7 @@ class TestCastleValidate(unittest.TestCase):
         chess_board._set_cell('g', 8, '.')
         move = Move(TeamEnum.BLACKS.value, 'e8', 'h8', None)
 
-        validate_castle(move, chess_board, [])
+        validate_castle(move, chess_board)
 
         self.assertTrue(True)
 
@@ -188,7 +209,7 @@ class TestCastleValidate(unittest.TestCase):
         move = Move(TeamEnum.BLACKS.value, 'e8', 'a8', None)
 
         with self.assertRaises(IllegalMoveException):
-            validate_castle(move, chess_board, [])
+            validate_castle(move, chess_board)
 
     def test_cannot_move_in_check(self):
         chess_board = ChessBoard()
@@ -202,28 +223,26 @@ class TestCastleValidate(unittest.TestCase):
         move = Move(TeamEnum.BLACKS.value, 'e8', 'a8', None)
 
         with self.assertRaises(IllegalMoveException):
-            validate_castle(move, chess_board, [])
+            validate_castle(move, chess_board)
 
     def test_cannot_move_pieces_in_way(self):
         chess_board = ChessBoard()
         move = Move(TeamEnum.WHITES.value, 'e1', 'h1', None)
 
         with self.assertRaises(IllegalMoveException):
-            validate_castle(move, chess_board, [])
+            validate_castle(move, chess_board)
 
     def test_cannot_move_king_moved(self):
         chess_board = ChessBoard()
         chess_board._set_cell('f', 8, '.')
         chess_board._set_cell('g', 8, '.')
 
-        move_history = []
-        move_history.append(Move(TeamEnum.BLACKS.value, 'e8', 'f8', None))
-        move_history.append(Move(TeamEnum.WHITES.value, 'a1', 'a3', None))
-        move_history.append(Move(TeamEnum.BLACKS.value, 'f8', 'e8', None))
+        chess_board.apply_move(Move(TeamEnum.BLACKS.value, 'e8', 'f8', None))
+        chess_board.apply_move(Move(TeamEnum.BLACKS.value, 'f8', 'e8', None))
 
         move = Move(TeamEnum.BLACKS.value, 'e8', 'h8', None)
         with self.assertRaises(IllegalMoveException):
-            validate_castle(move, chess_board, move_history)
+            validate_castle(move, chess_board)
 
     def test_cannot_move_rook_moved(self):
         chess_board = ChessBoard()
@@ -231,108 +250,161 @@ class TestCastleValidate(unittest.TestCase):
         chess_board._set_cell('c', 1, '.')
         chess_board._set_cell('d', 1, '.')
 
-        move_history = []
-        move_history.append(Move(TeamEnum.BLACKS.value, 'a1', 'b1', None))
-        move_history.append(Move(TeamEnum.WHITES.value, 'g8', 'h6', None))
-        move_history.append(Move(TeamEnum.BLACKS.value, 'b1', 'a1', None))
+        chess_board.apply_move(Move(TeamEnum.WHITES.value, 'a1', 'b1', None))
+        chess_board.apply_move(Move(TeamEnum.WHITES.value, 'b1', 'a1', None))
 
         move = Move(TeamEnum.WHITES.value, 'e1', 'a1', None)
         with self.assertRaises(IllegalMoveException):
-            validate_castle(move, chess_board, move_history)
+            validate_castle(move, chess_board)
+
+    def test_cannot_move_knight_in_way_queenside(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('c', 1, '.')
+        chess_board._set_cell('d', 1, '.')
+        move = Move(TeamEnum.WHITES.value, 'e1', 'a1', None)
+
+        with self.assertRaises(IllegalMoveException):
+            validate_castle(move, chess_board)
 
 
 class TestEnPassantValidate(unittest.TestCase):
 
     def test_captured_pawn_didnt_move_in_previous_move(self):
         chess_board = ChessBoard()
-
         chess_board._set_cell('e', 5, 'p')
         chess_board._set_cell('f', 5, 'P')
         move = Move(TeamEnum.WHITES.value, 'f5', 'e6', None)
 
-        move_history = []
-        move_history.append(Move(TeamEnum.WHITES.value, 'f4', 'f5', None))
-        move_history.append(Move(TeamEnum.BLACKS.value, 'e7', 'e5', None))
-        move_history.append(Move(TeamEnum.WHITES.value, 'h2', 'h3', None))
-        move_history.append(Move(TeamEnum.BLACKS.value, 'h7', 'h6', None))
+        chess_board.set_en_passant_square(to_square(tuple(['e', 6])))
+        chess_board.apply_move(Move(TeamEnum.WHITES.value, 'h2', 'h3', None))
 
         with self.assertRaises(IllegalMoveException):
-            validate_en_passant(move, chess_board, move_history)
-
+            validate_en_passant(move, chess_board)
 
     def test_wrong_rank(self):
         chess_board = ChessBoard()
-
         chess_board._set_cell('e', 4, 'p')
         chess_board._set_cell('f', 4, 'P')
-
         move = Move(TeamEnum.WHITES.value, 'f4', 'e5', None)
 
-        move_history = []
-        move_history.append(Move(TeamEnum.BLACKS.value, 'e7', 'e5', None))
-        move_history.append(Move(TeamEnum.WHITES.value, 'f2', 'f4', None))
-        move_history.append(Move(TeamEnum.BLACKS.value, 'e5', 'e4', None))
+        chess_board.set_en_passant_square(to_square(tuple(['e', 6])))
 
         with self.assertRaises(IllegalMoveException):
-            validate_en_passant(move, chess_board, move_history)
+            validate_en_passant(move, chess_board)
 
     def test_cannot_capture_pawn_moved_one_square(self):
         chess_board = ChessBoard()
-
-        chess_board._set_cell('e', 5, 'p')
+        chess_board._set_cell('e', 6, 'p')
+        chess_board._set_cell('e', 7, '.')
         chess_board._set_cell('f', 5, 'P')
         move = Move(TeamEnum.WHITES.value, 'f5', 'e6', None)
 
-        move_history = []
-        move_history.append(Move(TeamEnum.BLACKS.value, 'e7', 'e6', None))
-        move_history.append(Move(TeamEnum.WHITES.value, 'h2', 'h3', None))#pass move
-        move_history.append(Move(TeamEnum.BLACKS.value, 'e6', 'e5', None))
+        chess_board.apply_move(Move(TeamEnum.BLACKS.value, 'e6', 'e5', None))
 
         with self.assertRaises(IllegalMoveException):
-            validate_en_passant(move, chess_board, move_history)
-
+            validate_en_passant(move, chess_board)
 
     def test_cannot_move_into_check(self):
         chess_board = ChessBoard()
-
-        chess_board._set_cell('e', 5, 'p')
         chess_board._set_cell('f', 5, 'P')
         chess_board._set_cell('g', 6, 'b')
         chess_board._set_cell('d', 3, 'K')
         chess_board._set_cell('e', 1, '.')
         move = Move(TeamEnum.WHITES.value, 'f5', 'e6', None)
 
-        move_history = []
-        move_history.append(Move(TeamEnum.BLACKS.value, 'e7', 'e5', None))
+        chess_board.apply_move(Move(TeamEnum.BLACKS.value, 'e7', 'e5', None))
 
         with self.assertRaises(IllegalMoveException):
-            validate_en_passant(move, chess_board, move_history)
+            validate_en_passant(move, chess_board)
 
     def test_correct_en_passant_white(self):
         chess_board = ChessBoard()
-        chess_board._set_cell('e', 5, 'p')
         chess_board._set_cell('f', 5, 'P')
         move = Move(TeamEnum.WHITES.value, 'f5', 'e6', None)
 
-        move_history = []
-        move_history.append(Move(TeamEnum.BLACKS.value, 'e7', 'e5', None))
+        chess_board.apply_move(Move(TeamEnum.BLACKS.value, 'e7', 'e5', None))
 
         try:
-            validate_en_passant(move, chess_board, move_history)
+            validate_en_passant(move, chess_board)
         except IllegalMoveException as exception:
             self.fail(f"validate_en_passant raised {type(exception).__name__}")
 
     def test_correct_en_passant_black(self):
         chess_board = ChessBoard()
         chess_board._set_cell('e', 4, 'p')
-        chess_board._set_cell('f', 4, 'P')
         move = Move(TeamEnum.BLACKS.value, 'e4', 'f3', None)
 
-        move_history = []
-        move_history.append(Move(TeamEnum.WHITES.value, 'f2', 'f4', None))
+        chess_board.apply_move(Move(TeamEnum.WHITES.value, 'f2', 'f4', None))
 
         try:
-            validate_en_passant(move, chess_board, move_history)
+            validate_en_passant(move, chess_board)
         except IllegalMoveException as exception:
             self.fail(f"validate_en_passant raised {type(exception).__name__}")
-               
\ No newline at end of file
+
+
+class TestPawnPromotionValidate(unittest.TestCase):
+
+    def test_correct_promotion(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('g', 7, 'P')
+        chess_board._set_cell('g', 8, '.')
+        move = Move(TeamEnum.WHITES.value, 'g7', 'g8', 'Q')
+
+        try:
+            validate_pawn_promotion(move, chess_board)
+        except IllegalMoveException as exception:
+            self.fail(f"validate_pawn_promotion raised {type(exception).__name__}")
+
+    def test_cannot_promote_without_piece(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('d', 2, 'p')
+        chess_board._set_cell('d', 1, '.')
+        move = Move(TeamEnum.BLACKS.value, 'd2', 'd1', None)
+
+        with self.assertRaises(IllegalMoveException):
+            validate_pawn_promotion(move, chess_board)
+
+    def test_cannot_promote_to_king(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('d', 2, 'p')
+        chess_board._set_cell('d', 1, '.')
+        move = Move(TeamEnum.BLACKS.value, 'd2', 'd1', 'K')
+
+        with self.assertRaises(IllegalMoveException):
+            validate_pawn_promotion(move, chess_board)
+
+    def test_cannot_promote_into_check(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('e', 1, '.')
+        chess_board._set_cell('a', 7, 'K')
+        chess_board._set_cell('b', 7, 'P')
+        chess_board._set_cell('b', 8, '.')
+        chess_board._set_cell('h', 7, 'r')
+        chess_board._set_cell('g', 7, '.')
+        chess_board._set_cell('f', 7, '.')
+        chess_board._set_cell('e', 7, '.')
+        chess_board._set_cell('d', 7, '.')
+        chess_board._set_cell('c', 7, '.')
+        move = Move(TeamEnum.WHITES.value, 'b7', 'b8', 'Q')
+
+        with self.assertRaises(IllegalMoveException):
+            validate_pawn_promotion(move, chess_board)
+
+    def test_cannot_promote_opponent_pawn(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('g', 7, 'p')
+        chess_board._set_cell('g', 8, '.')
+        move = Move(TeamEnum.WHITES.value, 'g7', 'g8', 'Q')
+
+        with self.assertRaises(IllegalMoveException):
+            validate_pawn_promotion(move, chess_board)
+
+    def test_cannot_promote_jumping_rows(self):
+        chess_board = ChessBoard()
+        chess_board._set_cell('g', 6, 'P')
+        chess_board._set_cell('g', 7, '.')
+        chess_board._set_cell('g', 8, '.')
+        move = Move(TeamEnum.WHITES.value, 'g6', 'g8', 'Q')
+
+        with self.assertRaises(IllegalMoveException):
+            validate_pawn_promotion(move, chess_board)
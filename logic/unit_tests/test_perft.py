@@ -0,0 +1,44 @@
+import unittest
+from domain.castling_rights import NO_CASTLING_RIGHTS
+from domain.chess_board import ChessBoard
+from domain.move import Move
+from logic.move_generation.move_generator import STANDARD_SPECIAL_MOVES
+from logic.move_generation.perft import PERFT_POSITIONS, _make_move, divide, perft
+
+
+class TestPerft(unittest.TestCase):
+
+    def test_published_counts_depth_2(self):
+        for name, (board_string, team, expected_counts) in PERFT_POSITIONS.items():
+            with self.subTest(position=name):
+                chess_board = ChessBoard(board_string, team)
+                self.assertEqual(expected_counts[1], perft(chess_board, 2))
+
+    def test_initial_position_depth_3(self):
+        chess_board = ChessBoard()
+        self.assertEqual(8902, perft(chess_board, 3))
+
+    def test_board_and_state_restored(self):
+        board_string = PERFT_POSITIONS['kiwipete'][0]
+        chess_board = ChessBoard(board_string)
+        state = chess_board.get_state()
+        perft(chess_board, 2)
+        self.assertEqual(board_string, chess_board.to_board_string())
+        self.assertEqual(state, chess_board.get_state())
+        self.assertEqual([], chess_board.undo_log)
+
+    def test_position_state_is_taken_from_the_board(self):
+        chess_board = ChessBoard()
+        for move_name in ['e2e4', 'a7a6', 'e4e5', 'd7d5']:
+            _make_move(Move(chess_board.side_to_move, move_name[:2], move_name[2:], None),
+                       chess_board, STANDARD_SPECIAL_MOVES)
+        self.assertIn('e5d6', divide(chess_board, 1))
+        chess_board = ChessBoard(PERFT_POSITIONS['kiwipete'][0])
+        chess_board.set_castling_rights(NO_CASTLING_RIGHTS)
+        self.assertEqual(46, perft(chess_board, 1))
+
+    def test_parallel_divide_matches_perft(self):
+        board_string, team, expected_counts = PERFT_POSITIONS['promotions']
+        root_counts = divide(ChessBoard(board_string, team), 2, processes=2)
+        self.assertEqual(expected_counts[0], len(root_counts))
+        self.assertEqual(expected_counts[1], sum(root_counts.values()))
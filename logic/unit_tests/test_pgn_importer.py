@@ -0,0 +1,153 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+from typing import List, Tuple
+from domain.chess_board import ChessBoard
+from domain.fen import STARTING_FEN
+from domain.move import Move
+from domain.teams import TeamEnum
+from exception.illegal_move_exception import IllegalMoveException
+from logic.move_generation.move_generator import STANDARD_SPECIAL_MOVES, generate_legal_moves
+from logic.pgn_importer import import_pgn, move_to_san, read_games, replay_game, resolve_san, write_game
+from logic.special_move_registry import get_special_move_registry
+
+KIWIPETE = 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1'
+WHITES = TeamEnum.WHITES.value
+
+PGN = '''[Event "First"]
+[Site "?"]
+[White "A \\"quoted\\" name"]
+
+1. e4 {a comment
+over two lines} e5 2.Nf3 $1 (2. f4 exf4 (2... d5)) Nc6 ; rest of the line
+3. Bb5 a6 1-0
+
+% escaped line
+[Event "Second"]
+[FEN "8/P7/8/8/8/8/8/k6K w - - 0 1"]
+
+1. a8=Q+ *
+[Event "Third"]
+1. d4 d5
+'''
+
+
+def _random_san_game(plies: int, seed: int) -> Tuple[List[str], str]:
+    """
+    SAN of generated legal moves, played without going through the elector, and the final FEN
+    """
+    chess_board = ChessBoard.from_fen(STARTING_FEN)
+    registry = get_special_move_registry()
+    randomizer = random.Random(seed)
+    sans = []
+    for _ in range(plies):
+        moves = generate_legal_moves(chess_board.side_to_move, chess_board, STANDARD_SPECIAL_MOVES)
+        if not moves:
+            break
+        move = randomizer.choice(moves)
+        sans.append(move_to_san(move, chess_board, moves))
+        special_move = registry.find(move, chess_board)
+        if special_move is not None:
+            special_move.create_executor(move)(chess_board)
+        else:
+            chess_board.apply_move(move)
+        chess_board.end_turn()
+    return sans, chess_board.to_fen()
+
+
+class TestPgnImporter(unittest.TestCase):
+
+    def test_read_games(self):
+        games = list(read_games(io.StringIO(PGN)))
+        self.assertEqual(3, len(games))
+        self.assertEqual({'Event': 'First', 'Site': '?', 'White': 'A "quoted" name'}, games[0].tags)
+        self.assertEqual(['e4', 'e5', 'Nf3', 'Nc6', 'Bb5', 'a6'], games[0].moves)
+        self.assertEqual('1-0', games[0].result)
+        self.assertEqual(['a8=Q+'], games[1].moves)
+        self.assertEqual('*', games[1].result)
+        self.assertEqual(['d4', 'd5'], games[2].moves)
+
+    def test_san_round_trip(self):
+        for fen in [STARTING_FEN, KIWIPETE, 'R6k/8/8/8/R7/8/8/R6K w - - 0 1', '8/P7/8/8/8/8/8/k6K w - - 0 1']:
+            with self.subTest(fen=fen):
+                chess_board = ChessBoard.from_fen(fen)
+                moves = generate_legal_moves(chess_board.side_to_move, chess_board, STANDARD_SPECIAL_MOVES)
+                for move in moves:
+                    self.assertEqual(move, resolve_san(move_to_san(move, chess_board, moves), chess_board, moves))
+
+    def test_special_moves(self):
+        chess_board = ChessBoard.from_fen(KIWIPETE)
+        moves = generate_legal_moves(WHITES, chess_board, STANDARD_SPECIAL_MOVES)
+        self.assertEqual(Move(WHITES, 'e1', 'h1', None), resolve_san('O-O', chess_board, moves))
+        self.assertEqual(Move(WHITES, 'e1', 'a1', None), resolve_san('0-0-0+', chess_board, moves))
+
+        chess_board = ChessBoard.from_fen('rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3')
+        moves = generate_legal_moves(WHITES, chess_board, STANDARD_SPECIAL_MOVES)
+        self.assertEqual(Move(WHITES, 'e5', 'f6', None), resolve_san('exf6', chess_board, moves))
+        self.assertEqual('exf6', move_to_san(Move(WHITES, 'e5', 'f6', None), chess_board, moves))
+
+        chess_board = ChessBoard.from_fen('8/P7/8/8/8/8/8/k6K w - - 0 1')
+        moves = generate_legal_moves(WHITES, chess_board, STANDARD_SPECIAL_MOVES)
+        self.assertEqual(Move(WHITES, 'a7', 'a8', 'N'), resolve_san('a8N', chess_board, moves))
+        self.assertEqual(Move(WHITES, 'a7', 'a8', 'Q'), resolve_san('a8=Q#', chess_board, moves))
+
+    def test_disambiguation(self):
+        chess_board = ChessBoard.from_fen('R6k/8/8/8/8/8/8/R6K w - - 0 1')
+        moves = generate_legal_moves(WHITES, chess_board, STANDARD_SPECIAL_MOVES)
+        self.assertEqual(Move(WHITES, 'a1', 'a4', None), resolve_san('R1a4', chess_board, moves))
+        self.assertEqual('R8a4', move_to_san(Move(WHITES, 'a8', 'a4', None), chess_board, moves))
+        with self.assertRaisesRegex(IllegalMoveException, 'Ambiguous'):
+            resolve_san('Ra4', chess_board, moves)
+
+    def test_illegal_and_invalid_san(self):
+        chess_board = ChessBoard.from_fen(STARTING_FEN)
+        moves = generate_legal_moves(WHITES, chess_board, STANDARD_SPECIAL_MOVES)
+        for san in ['e5', 'Ke2', 'O-O', 'Nf3=Q', 'Zz9', '']:
+            with self.subTest(san=san):
+                with self.assertRaises(IllegalMoveException):
+                    resolve_san(san, chess_board, moves)
+
+    def test_replay_game(self):
+        sans, fen = _random_san_game(60, seed=3)
+        pgn_game = next(read_games(io.StringIO(write_game(sans, {'Event': 'Random'}))))
+        game, failure = replay_game(pgn_game)
+        self.assertIsNone(failure)
+        self.assertEqual(fen, game.to_fen())
+
+    def test_replay_game_with_an_unplayable_fen(self):
+        for fen in ['8/8/8/8/8/8/8/8 w - - 0 1', 'garbage']:
+            with self.subTest(fen=fen):
+                pgn_game = next(read_games(io.StringIO(write_game(['Kb2'], {'Event': 'Bad', 'FEN': fen}))))
+                game, failure = replay_game(pgn_game)
+                self.assertIsNone(game)
+                self.assertEqual(0, failure.ply)
+                self.assertEqual('', failure.san)
+
+    def test_import_reports_the_first_illegal_move(self):
+        games = []
+        plies = 0
+        for number in range(1, 31):
+            sans, _ = _random_san_game(20, seed=number)
+            if number % 3 == 0:
+                sans = sans[:5] + ['Ke5'] + sans[5:]
+            else:
+                plies += len(sans)
+            games.append(write_game(sans, {'Event': str(number)}))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'games.pgn')
+            with open(path, 'w') as pgn_file:
+                pgn_file.write(''.join(games))
+            for processes in [1, 2]:
+                with self.subTest(processes=processes):
+                    report = import_pgn(path, processes)
+                    self.assertEqual(30, report.games)
+                    self.assertEqual(plies + 5 * 10, report.plies)
+                    self.assertEqual(list(range(3, 31, 3)), [failure.game_number for failure in report.failures])
+                    self.assertEqual([(6, 'Ke5')] * 10, [(failure.ply, failure.san) for failure in report.failures])
+                    self.assertEqual([str(number) for number in range(3, 31, 3)],
+                                     [failure.tags['Event'] for failure in report.failures])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from config.config_wrapper import ConfigurationWrapper
+from domain.chess_board import ChessBoard
+from domain.move import Move
+from domain.teams import TeamEnum
+from logic.special_move_registry import SpecialMoveRegistry, get_special_move_registry, \
+    get_special_move_registry_for
+
+CASTLE_CONFIGURATION = {
+    "name": "Castle",
+    "identifier_func": "is_castle",
+    "moved_piece": "k",
+    "validator_func": "validate_castle",
+    "creator_func": "create_castle_steps",
+    "enabled": True
+}
+PROMOTION_CONFIGURATION = {
+    "name": "Pawn Promotion",
+    "identifier_func": "is_pawn_promotion",
+    "validator_func": "validate_pawn_promotion",
+    "creator_func": "create_pawn_promotion_steps",
+    "enabled": True
+}
+
+
+class TestSpecialMoveRegistry(unittest.TestCase):
+
+    def test_indexed_by_moved_piece(self):
+        registry = SpecialMoveRegistry([CASTLE_CONFIGURATION])
+        self.assertEqual(['k'], list(registry.special_moves_by_piece))
+
+    def test_unindexed_special_move_applies_to_every_piece(self):
+        registry = SpecialMoveRegistry([CASTLE_CONFIGURATION, PROMOTION_CONFIGURATION])
+        self.assertEqual(['Castle', 'Pawn Promotion'], [special_move.name for special_move
+                                                        in registry.special_moves_by_piece['k']])
+        self.assertEqual(['Pawn Promotion'], [special_move.name for special_move
+                                              in registry.special_moves_by_piece['n']])
+
+    def test_find(self):
+        registry = SpecialMoveRegistry([CASTLE_CONFIGURATION])
+        chess_board = ChessBoard()
+        self.assertEqual('Castle', registry.find(Move(TeamEnum.WHITES.value, 'e1', 'h1', None), chess_board).name)
+        self.assertIsNone(registry.find(Move(TeamEnum.WHITES.value, 'e2', 'e4', None), chess_board))
+
+    def test_enabled_registry_is_cached_per_config_version(self):
+        registry = get_special_move_registry()
+        self.assertIs(registry, get_special_move_registry())
+        self.assertNotIn('Siberian Swipe', [special_move.name for special_move in registry.special_moves])
+        ConfigurationWrapper.reload_config_from_file()
+        self.assertIsNot(registry, get_special_move_registry())
+
+    def test_named_registry(self):
+        registry = get_special_move_registry_for(['Castle', 'En Passant'])
+        self.assertEqual({'Castle', 'En Passant'}, {special_move.name for special_move in registry.special_moves})
+        self.assertIs(registry, get_special_move_registry_for(['En Passant', 'Castle']))
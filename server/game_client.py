@@ -0,0 +1,69 @@
+import asyncio
+import itertools
+import json
+from typing import Dict, Optional
+
+
+class GameClient:
+    """
+    Client side of the GameServer protocol. Requests can be pipelined: each call waits
+    for the response carrying its own id
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._waiting: Dict[int, asyncio.Future] = dict()
+        self._receiver = asyncio.get_running_loop().create_task(self._receive())
+
+    @classmethod
+    async def connect_tcp(cls, host: str, port: int) -> 'GameClient':
+        return cls(*await asyncio.open_connection(host, port))
+
+    @classmethod
+    async def connect_unix(cls, path: str) -> 'GameClient':
+        return cls(*await asyncio.open_unix_connection(path))
+
+    async def _receive(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._waiting.pop(response.get('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError('Connection closed'))
+            self._waiting.clear()
+
+    async def request(self, operation: str, **fields) -> dict:
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = future
+        self._writer.write(json.dumps(dict(fields, id=request_id, op=operation)).encode() + b'\n')
+        await self._writer.drain()
+        return await future
+
+    async def create_game(self) -> str:
+        return (await self.request('create'))['game_id']
+
+    async def join(self, game_id: str, team: str, player: str) -> dict:
+        return await self.request('join', game_id=game_id, team=team, player=player)
+
+    async def move(self, game_id: str, team: str, cell_from: str, cell_to: str,
+                   additional_data: Optional[str] = None) -> dict:
+        return await self.request('move', game_id=game_id, team=team, to=cell_to, data=additional_data,
+                                  **{'from': cell_from})
+
+    async def close(self):
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        await self._receiver
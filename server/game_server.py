@@ -0,0 +1,204 @@
+import argparse
+import asyncio
+import json
+from typing import Optional, Set, Tuple
+from domain.move import Move
+from exception.illegal_move_exception import IllegalMoveException
+from exception.no_king_exception import NoKingException
+from exception.no_such_game_exception import NoSuchGameException
+from exception.no_such_team_exception import NoSuchTeamException
+from exception.not_joined_exception import NotJoinedException
+from exception.team_taken_exception import TeamTakenException
+from server.session_manager import DEFAULT_QUEUE_SIZE, SessionManager
+
+"""
+Line-delimited JSON over TCP or a Unix socket, one object per line.
+Every request carries an id that is echoed in its response:
+{"id": 1, "op": "create"}                                            -> {"id": 1, "ok": true, "game_id": "1"}
+{"id": 2, "op": "join", "game_id": "1", "team": "WHITES", "player": "ana"} -> {"id": 2, "ok": true}
+{"id": 3, "op": "move", "game_id": "1", "team": "WHITES", "from": "e2", "to": "e4", "data": null}
+                                                                     -> {"id": 3, "ok": true}
+{"id": 4, "op": "state", "game_id": "1"}  -> {"id": 4, "ok": true, "board": "...", "side_to_move": "BLACKS", "moves": 1,
+                                                                        "status": "ONGOING"}
+    moves counts plies, a castle is one move
+{"id": 5, "op": "close", "game_id": "1"}                             -> {"id": 5, "ok": true}
+Failures answer {"id": ..., "ok": false, "error": "<exception name>", "message": "..."}
+A connection can only move the teams it joined
+"""
+
+EXPECTED_ERRORS = (IllegalMoveException, NoKingException, NoSuchGameException, NoSuchTeamException,
+                   NotJoinedException, TeamTakenException)
+DEFAULT_MAX_PENDING = 64
+
+
+class BadRequestException(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+
+
+class GameServer:
+    """
+    Serves the games of a SessionManager. The requests of a connection are handled concurrently,
+    at most max_pending at a time: after that the connection is not read until a response is sent,
+    so a fast client is slowed down instead of queueing without bound
+    """
+
+    manager: SessionManager
+    max_pending: int
+
+    def __init__(self, manager: Optional[SessionManager] = None, max_pending: int = DEFAULT_MAX_PENDING):
+        self.manager = manager if manager is not None else SessionManager()
+        self.max_pending = max_pending
+        self._servers = []
+        self._connections: Set[asyncio.Task] = set()
+        self._writers: Set[asyncio.StreamWriter] = set()
+
+    async def start_tcp(self, host: str = '127.0.0.1', port: int = 0) -> asyncio.AbstractServer:
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        self._servers.append(server)
+        return server
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        server = await asyncio.start_unix_server(self._handle_connection, path)
+        self._servers.append(server)
+        return server
+
+    async def close(self):
+        for server in self._servers:
+            server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers.clear()
+        self.manager.close()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        self._writers.add(writer)
+        pending = asyncio.Semaphore(self.max_pending)
+        # (game id, team) of every team this connection joined
+        seats: Set[Tuple[str, str]] = set()
+        tasks: Set[asyncio.Task] = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                await pending.acquire()
+                task = asyncio.get_running_loop().create_task(self._respond(line, writer, pending, seats))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            self._connections.discard(connection)
+            self._writers.discard(writer)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter, pending: asyncio.Semaphore,
+                       seats: Set[Tuple[str, str]]):
+        try:
+            response = await self.handle_line(line, seats)
+            writer.write(json.dumps(response).encode() + b'\n')
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            pending.release()
+
+    async def handle_line(self, line: bytes, seats: Set[Tuple[str, str]]) -> dict:
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                raise BadRequestException('Request is not valid JSON')
+            if not isinstance(request, dict):
+                raise BadRequestException('Request must be a JSON object')
+            request_id = request.get('id')
+            response = await self.handle_request(request, seats)
+        except EXPECTED_ERRORS + (BadRequestException,) as error:
+            return {'id': request_id, 'ok': False, 'error': type(error).__name__, 'message': str(error)}
+        except Exception as error:
+            return {'id': request_id, 'ok': False, 'error': 'InternalError', 'message': repr(error)}
+        response['id'] = request_id
+        response['ok'] = True
+        return response
+
+    async def handle_request(self, request: dict, seats: Set[Tuple[str, str]]) -> dict:
+        """
+        Seats are the (game id, team) pairs the requesting connection joined, join adds to them
+        """
+        operation = request.get('op')
+        if operation == 'create':
+            return {'game_id': self.manager.create_game().game_id}
+        if operation == 'join':
+            game_id, team = _field(request, 'game_id'), _field(request, 'team')
+            self.manager.join_game(game_id, team, _field(request, 'player'))
+            seats.add((game_id, team))
+            return {}
+        if operation == 'move':
+            game_id, team = _field(request, 'game_id'), _field(request, 'team')
+            if (game_id, team) not in seats:
+                raise NotJoinedException(f'Join {team} in game {game_id} before moving its pieces')
+            move = Move(team, _field(request, 'from'), _field(request, 'to'), request.get('data'))
+            await self.manager.submit_move(game_id, move)
+            return {}
+        if operation == 'state':
+            game = self.manager.get_session(_field(request, 'game_id')).game
+            return {
+                'board': game.chess_board.to_board_string(),
+                'side_to_move': game.chess_board.side_to_move,
+                'moves': game.chess_board.get_ply(),
+                'status': game.status.value,
+            }
+        if operation == 'close':
+            self.manager.close_game(_field(request, 'game_id'))
+            return {}
+        raise BadRequestException(f'Unknown operation: {operation}')
+
+
+def _field(request: dict, name: str):
+    value = request.get(name)
+    if not isinstance(value, str):
+        raise BadRequestException(f'Missing field: {name}')
+    return value
+
+
+async def serve(host: str, port: int, unix_path: Optional[str], queue_size: int):
+    server = GameServer(SessionManager(queue_size))
+    if unix_path:
+        listener = await server.start_unix(unix_path)
+    else:
+        listener = await server.start_tcp(host, port)
+    print('Serving on', ', '.join(str(sock.getsockname()) for sock in listener.sockets))
+    try:
+        await listener.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Chess game session server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help='serve on this Unix socket path instead of TCP')
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE, help='pending moves per game')
+    arguments = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(arguments.host, arguments.port, arguments.unix, arguments.queue_size))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+import asyncio
+import itertools
+from typing import Dict, Optional, Tuple
+from config.rule_set import RuleSet
+from domain.game import Game
+from domain.move import Move
+from domain.teams import TeamEnum
+from exception.no_such_game_exception import NoSuchGameException
+from exception.no_such_team_exception import NoSuchTeamException
+from exception.team_taken_exception import TeamTakenException
+
+DEFAULT_QUEUE_SIZE = 16
+
+
+class GameSession:
+    """
+    A hosted Game. Moves are queued and applied one at a time by the session's own task,
+    so a game sees its moves in submission order while other games run concurrently.
+    The queue is bounded: once it is full, submitters wait, which slows down their connection.
+    Closing the session fails the moves still waiting with NoSuchGameException
+    """
+
+    game_id: str
+    game: Game
+    players: Dict[str, Optional[str]]
+    closed: bool
+    queue: 'asyncio.Queue[Tuple[Move, asyncio.Future]]'
+
+    def __init__(self, game_id: str, game: Game, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.game_id = game_id
+        self.game = game
+        self.players = {team.value: None for team in TeamEnum}
+        self.queue = asyncio.Queue(queue_size)
+        self.closed = False
+        self._task = asyncio.get_running_loop().create_task(self._apply_moves())
+
+    async def submit_move(self, move: Move):
+        """
+        Waits until the move is applied, raising what Game.make_move raised
+        """
+        if self.closed:
+            raise self._closed_error()
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((move, future))
+        if self.closed:
+            # Closed while waiting for room in the queue: nothing applies moves anymore.
+            # Emptying the queue again also lets the next waiting submitter in
+            self._fail_queued_moves()
+        await future
+
+    async def _apply_moves(self):
+        while True:
+            move, future = await self.queue.get()
+            if future.cancelled():
+                continue
+            try:
+                self.game.make_move(move)
+            except Exception as error:
+                # The error belongs to the submitter, the session keeps serving the game
+                future.set_exception(error)
+            else:
+                future.set_result(None)
+
+    def join(self, team: str, player: str):
+        if team not in self.players:
+            raise NoSuchTeamException(f'No such team: {team}')
+        if self.players[team] not in (None, player):
+            raise TeamTakenException(f'{team} already joined game {self.game_id}')
+        self.players[team] = player
+
+    def close(self):
+        self.closed = True
+        self._task.cancel()
+        self._fail_queued_moves()
+
+    def _fail_queued_moves(self):
+        while not self.queue.empty():
+            _, future = self.queue.get_nowait()
+            if not future.done():
+                future.set_exception(self._closed_error())
+
+    def _closed_error(self) -> NoSuchGameException:
+        return NoSuchGameException(f'Game closed: {self.game_id}')
+
+
+class SessionManager:
+    """
+    Creates, finds and closes the game sessions of one event loop
+    """
+
+    sessions: Dict[str, GameSession]
+    queue_size: int
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.sessions = dict()
+        self.queue_size = queue_size
+        self._ids = itertools.count(1)
+
+    def create_game(self, rule_set: Optional[RuleSet] = None) -> GameSession:
+        game_id = str(next(self._ids))
+        session = GameSession(game_id, Game(rule_set), self.queue_size)
+        self.sessions[game_id] = session
+        return session
+
+    def get_session(self, game_id: str) -> GameSession:
+        try:
+            return self.sessions[game_id]
+        except KeyError:
+            raise NoSuchGameException(f'No such game: {game_id}')
+
+    def join_game(self, game_id: str, team: str, player: str) -> GameSession:
+        session = self.get_session(game_id)
+        session.join(team, player)
+        return session
+
+    async def submit_move(self, game_id: str, move: Move):
+        await self.get_session(game_id).submit_move(move)
+
+    def close_game(self, game_id: str):
+        self.get_session(game_id).close()
+        del self.sessions[game_id]
+
+    def close(self):
+        for session in self.sessions.values():
+            session.close()
+        self.sessions.clear()
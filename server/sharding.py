@@ -0,0 +1,230 @@
+import bisect
+import itertools
+import multiprocessing
+import os
+import zlib
+from multiprocessing.connection import Connection
+from typing import Dict, List, Optional, Tuple
+from config.config_wrapper import ConfigurationWrapper
+from config.rule_set import RuleSet
+from domain.game import Game
+from domain.game_snapshot import dumps, loads
+from domain.move import Move
+from exception.no_such_game_exception import NoSuchGameException
+
+"""
+Games hashed to a fixed pool of worker processes. Each worker owns its games' Game objects,
+the front end only routes requests, so moves of different workers' games run in parallel.
+Game ids are placed on a consistent hash ring, so adding a worker only moves the games
+that land on the new worker's share of the ring. A game moves as a snapshot with its rule set,
+and is only dropped from its old worker once the new one has loaded it
+"""
+
+VIRTUAL_NODES = 64
+
+
+def _ring_position(key: str) -> int:
+    return zlib.crc32(key.encode())
+
+
+class _Worker:
+    """
+    Front end side of a worker process
+    """
+
+    def __init__(self, worker_id: int, cpu: Optional[int]):
+        self.worker_id = worker_id
+        self.connection, worker_connection = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_worker_main, args=(worker_connection, cpu), name=f'game-worker-{worker_id}', daemon=True)
+        self.process.start()
+        worker_connection.close()
+
+    def send(self, requests: List[tuple]):
+        self.connection.send(requests)
+
+    def receive(self) -> List[tuple]:
+        return self.connection.recv()
+
+    def call(self, operation: str, *arguments):
+        self.send([(operation, arguments)])
+        return _unwrap(self.receive()[0])
+
+    def stop(self):
+        try:
+            self.connection.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join()
+        self.connection.close()
+
+
+def _unwrap(result: tuple):
+    status, value = result
+    if status == 'error':
+        raise value
+    return value
+
+
+class ShardedGames:
+    """
+    Front end of the worker pool. make_moves sends one batch per worker and then collects
+    the answers, so every worker is busy at the same time.
+    With pin_cpus each worker is bound to one core where the platform allows it
+    """
+
+    def __init__(self, workers: Optional[int] = None, pin_cpus: bool = False):
+        self.pin_cpus = pin_cpus
+        self.workers: Dict[int, _Worker] = dict()
+        self.owners: Dict[str, int] = dict()
+        self._ring: List[Tuple[int, int]] = []
+        self._game_ids = itertools.count(1)
+        self._worker_ids = itertools.count(0)
+        for _ in range(workers or os.cpu_count() or 1):
+            self._start_worker()
+
+    def _start_worker(self) -> int:
+        worker_id = next(self._worker_ids)
+        cpu = None
+        if self.pin_cpus and hasattr(os, 'sched_getaffinity'):
+            cpus = sorted(os.sched_getaffinity(0))
+            cpu = cpus[worker_id % len(cpus)]
+        self.workers[worker_id] = _Worker(worker_id, cpu)
+        for node in range(VIRTUAL_NODES):
+            bisect.insort(self._ring, (_ring_position(f'{worker_id}:{node}'), worker_id))
+        return worker_id
+
+    def get_worker_of(self, game_id: str) -> int:
+        """
+        The worker the game id hashes to
+        """
+        index = bisect.bisect(self._ring, (_ring_position(game_id), -1)) % len(self._ring)
+        return self._ring[index][1]
+
+    def _owner(self, game_id: str) -> _Worker:
+        try:
+            return self.workers[self.owners[game_id]]
+        except KeyError:
+            raise NoSuchGameException(f'No such game: {game_id}')
+
+    def create_game(self) -> str:
+        game_id = str(next(self._game_ids))
+        worker_id = self.get_worker_of(game_id)
+        self.workers[worker_id].call('create', game_id)
+        self.owners[game_id] = worker_id
+        return game_id
+
+    def make_move(self, game_id: str, move: Move):
+        self._owner(game_id).call('move', game_id, move)
+
+    def make_moves(self, moves: List[Tuple[str, Move]]) -> List[Optional[Exception]]:
+        """
+        Applies the moves, in order within each game, and returns the error of each move (None if applied)
+        """
+        batches: Dict[int, List[int]] = dict()
+        for index, (game_id, _) in enumerate(moves):
+            batches.setdefault(self.owners.get(game_id, -1), []).append(index)
+        errors: List[Optional[Exception]] = [None] * len(moves)
+        for index in batches.pop(-1, []):
+            errors[index] = NoSuchGameException(f'No such game: {moves[index][0]}')
+        for worker_id, indexes in batches.items():
+            self.workers[worker_id].send([('move', moves[index]) for index in indexes])
+        for worker_id, indexes in batches.items():
+            for index, (status, value) in zip(indexes, self.workers[worker_id].receive()):
+                if status == 'error':
+                    errors[index] = value
+        return errors
+
+    def get_state(self, game_id: str) -> Tuple[str, str, int]:
+        """
+        Board string, side to move and number of moves (plies) played in the game
+        """
+        return self._owner(game_id).call('state', game_id)
+
+    def close_game(self, game_id: str):
+        self._owner(game_id).call('close', game_id)
+        del self.owners[game_id]
+
+    def add_worker(self) -> int:
+        """
+        Starts one more worker and moves to it the games that now hash to it.
+        Returns the number of games moved
+        """
+        worker_id = self._start_worker()
+        moved = [game_id for game_id in self.owners if self.get_worker_of(game_id) == worker_id]
+        for game_id in moved:
+            owner = self._owner(game_id)
+            self.workers[worker_id].call('import', game_id, owner.call('export', game_id))
+            self.owners[game_id] = worker_id
+            owner.call('close', game_id)
+        return len(moved)
+
+    def close(self):
+        for worker in self.workers.values():
+            worker.stop()
+        self.workers.clear()
+        self.owners.clear()
+
+    def __enter__(self) -> 'ShardedGames':
+        return self
+
+    def __exit__(self, *exception_info):
+        self.close()
+
+
+def _local_rule_set(rule_sets: Dict[int, RuleSet], rule_set: RuleSet) -> RuleSet:
+    """
+    The worker's own copy of a rule set sent by another worker, so the games it imports
+    share one rule set (and one compiled registry) per version
+    """
+    local_rule_set = rule_sets.get(rule_set.version)
+    if local_rule_set is not None and local_rule_set.config == rule_set.config:
+        return local_rule_set
+    rule_sets[rule_set.version] = rule_set
+    return rule_set
+
+
+def _handle(games: Dict[str, Game], rule_sets: Dict[int, RuleSet], operation: str, arguments: tuple):
+    if operation == 'create':
+        games[arguments[0]] = Game()
+        return None
+    if operation == 'import':
+        game_id, (snapshot, rule_set) = arguments
+        games[game_id] = loads(snapshot, _local_rule_set(rule_sets, rule_set))
+        return None
+    try:
+        game = games[arguments[0]]
+    except KeyError:
+        raise NoSuchGameException(f'No such game: {arguments[0]}')
+    if operation == 'move':
+        game.make_move(arguments[1])
+        return None
+    if operation == 'state':
+        return game.chess_board.to_board_string(), game.chess_board.side_to_move, game.chess_board.get_ply()
+    if operation == 'export':
+        # The game stays here until the front end closes it, after the new worker has imported it
+        return dumps(game), game.rule_set
+    if operation == 'close':
+        del games[arguments[0]]
+        return None
+    raise ValueError(f'Unknown operation: {operation}')
+
+
+def _worker_main(connection: Connection, cpu: Optional[int]):
+    if cpu is not None:
+        os.sched_setaffinity(0, {cpu})
+    games: Dict[str, Game] = dict()
+    current_rule_set = ConfigurationWrapper.get_rule_set()
+    rule_sets: Dict[int, RuleSet] = {current_rule_set.version: current_rule_set}
+    while True:
+        requests = connection.recv()
+        if requests is None:
+            break
+        results = []
+        for operation, arguments in requests:
+            try:
+                results.append(('ok', _handle(games, rule_sets, operation, arguments)))
+            except Exception as error:
+                results.append(('error', error))
+        connection.send(results)
+    connection.close()
@@ -0,0 +1,145 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from domain.move import Move
+from domain.teams import TeamEnum
+from exception.no_such_game_exception import NoSuchGameException
+from server.game_client import GameClient
+from server.game_server import GameServer
+from server.session_manager import SessionManager
+
+WHITES = TeamEnum.WHITES.value
+BLACKS = TeamEnum.BLACKS.value
+
+
+def _clear_kingside(session):
+    session.game.chess_board._set_cell('f', 1, '.')
+    session.game.chess_board._set_cell('g', 1, '.')
+
+
+class TestSessionManager(unittest.IsolatedAsyncioTestCase):
+
+    async def test_moves_are_applied_in_submission_order(self):
+        manager = SessionManager(queue_size=1)
+        session = manager.create_game()
+        _clear_kingside(session)
+        results = await asyncio.gather(
+            manager.submit_move(session.game_id, Move(WHITES, 'e1', 'h1', None)),
+            manager.submit_move(session.game_id, Move(WHITES, 'e1', 'h1', None)),
+            return_exceptions=True)
+        self.assertIsNone(results[0])
+        self.assertIsInstance(results[1], Exception)
+        self.assertEqual(2, len(session.game.move_history))
+        manager.close()
+
+    async def test_close_fails_the_queued_moves(self):
+        manager = SessionManager(queue_size=1)
+        session = manager.create_game()
+        submitted = [asyncio.ensure_future(manager.submit_move(session.game_id, move)) for move in [
+            Move(WHITES, 'e2', 'e4', None), Move(BLACKS, 'e7', 'e5', None), Move(WHITES, 'g1', 'f3', None)]]
+        await asyncio.sleep(0)
+        manager.close_game(session.game_id)
+        results = await asyncio.wait_for(asyncio.gather(*submitted, return_exceptions=True), 1)
+        self.assertTrue(all(isinstance(result, NoSuchGameException) for result in results))
+        self.assertEqual('Game closed: 1', str(results[0]))
+        self.assertEqual(0, len(session.game.move_history))
+
+    async def test_join(self):
+        manager = SessionManager()
+        session = manager.create_game()
+        manager.join_game(session.game_id, WHITES, 'ana')
+        manager.join_game(session.game_id, WHITES, 'ana')
+        self.assertEqual('ana', session.players[WHITES])
+        manager.close()
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = GameServer()
+        listener = await self.server.start_tcp()
+        self.port = listener.sockets[0].getsockname()[1]
+        self.client = await GameClient.connect_tcp('127.0.0.1', self.port)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+
+    async def test_create_and_state(self):
+        game_id = await self.client.create_game()
+        state = await self.client.request('state', game_id=game_id)
+        self.assertTrue(state['ok'])
+        self.assertEqual(WHITES, state['side_to_move'])
+        self.assertEqual(0, state['moves'])
+        self.assertEqual('ONGOING', state['status'])
+
+    async def test_move(self):
+        game_id = await self.client.create_game()
+        _clear_kingside(self.server.manager.get_session(game_id))
+        await self.client.join(game_id, WHITES, 'ana')
+        response = await self.client.move(game_id, WHITES, 'e1', 'h1')
+        self.assertTrue(response['ok'])
+        state = await self.client.request('state', game_id=game_id)
+        self.assertEqual(BLACKS, state['side_to_move'])
+        self.assertEqual(1, state['moves'])
+
+    async def test_errors(self):
+        game_id = await self.client.create_game()
+        await self.client.join(game_id, BLACKS, 'bea')
+        response = await self.client.move(game_id, BLACKS, 'e8', 'h8')
+        self.assertEqual('IllegalMoveException', response['error'])
+        response = await self.client.join('missing', WHITES, 'ana')
+        self.assertEqual('NoSuchGameException', response['error'])
+        await self.client.join(game_id, WHITES, 'ana')
+        response = await self.client.join(game_id, WHITES, 'bea')
+        self.assertEqual('TeamTakenException', response['error'])
+        response = await self.client.request('join', game_id=game_id, team=BLACKS)
+        self.assertEqual('BadRequestException', response['error'])
+        response = await self.client.request('dance')
+        self.assertEqual('BadRequestException', response['error'])
+
+    async def test_only_joined_teams_can_move(self):
+        game_id = await self.client.create_game()
+        response = await self.client.move(game_id, WHITES, 'e2', 'e4')
+        self.assertEqual('NotJoinedException', response['error'])
+        other_client = await GameClient.connect_tcp('127.0.0.1', self.port)
+        try:
+            await other_client.join(game_id, WHITES, 'ana')
+            response = await self.client.move(game_id, WHITES, 'e2', 'e4')
+            self.assertEqual('NotJoinedException', response['error'])
+            response = await other_client.move(game_id, WHITES, 'e2', 'e4')
+            self.assertTrue(response['ok'])
+            response = await other_client.move(game_id, BLACKS, 'e7', 'e5')
+            self.assertEqual('NotJoinedException', response['error'])
+        finally:
+            await other_client.close()
+        self.assertEqual(1, len(self.server.manager.get_session(game_id).game.move_history))
+
+    async def test_invalid_json_keeps_connection(self):
+        self.client._writer.write(b'{not json\n')
+        game_id = await self.client.create_game()
+        self.assertEqual(1, len(self.server.manager.sessions))
+        self.assertIn(game_id, self.server.manager.sessions)
+
+    async def test_concurrent_games_over_many_connections(self):
+        clients = [await GameClient.connect_tcp('127.0.0.1', self.port) for _ in range(8)]
+        try:
+            game_ids = await asyncio.gather(*[clients[index % 8].create_game() for index in range(200)])
+            states = await asyncio.gather(*[
+                clients[index % 8].request('state', game_id=game_id) for index, game_id in enumerate(game_ids)])
+        finally:
+            for client in clients:
+                await client.close()
+        self.assertEqual(200, len(set(game_ids)))
+        self.assertTrue(all(state['ok'] for state in states))
+
+    async def test_unix_socket(self):
+        path = os.path.join(tempfile.mkdtemp(), 'server.sock')
+        await self.server.start_unix(path)
+        client = await GameClient.connect_unix(path)
+        try:
+            self.assertTrue(await client.create_game())
+        finally:
+            await client.close()
+            os.unlink(path)
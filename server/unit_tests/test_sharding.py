@@ -0,0 +1,71 @@
+import unittest
+from domain.chess_board import DEFAULT_CHESS_BOARD
+from domain.game_snapshot import loads
+from domain.game_status import GameStatusEnum
+from domain.move import Move
+from domain.teams import TeamEnum
+from exception.illegal_move_exception import IllegalMoveException
+from exception.no_such_game_exception import NoSuchGameException
+from server.sharding import ShardedGames
+
+
+class TestShardedGames(unittest.TestCase):
+
+    def setUp(self):
+        self.games = ShardedGames(workers=2)
+
+    def tearDown(self):
+        self.games.close()
+
+    def test_games_are_spread_over_workers(self):
+        game_ids = [self.games.create_game() for _ in range(40)]
+        self.assertEqual({0, 1}, set(self.games.owners.values()))
+        for game_id in game_ids:
+            self.assertEqual(self.games.get_worker_of(game_id), self.games.owners[game_id])
+            self.assertEqual((DEFAULT_CHESS_BOARD, TeamEnum.WHITES.value, 0), self.games.get_state(game_id))
+
+    def test_errors_come_back_from_workers(self):
+        game_id = self.games.create_game()
+        with self.assertRaises(IllegalMoveException):
+            self.games.make_move(game_id, Move(TeamEnum.BLACKS.value, 'e7', 'e5', None))
+        with self.assertRaises(NoSuchGameException):
+            self.games.get_state('missing')
+        errors = self.games.make_moves([
+            (game_id, Move(TeamEnum.BLACKS.value, 'e7', 'e5', None)),
+            ('missing', Move(TeamEnum.WHITES.value, 'e2', 'e4', None)),
+        ])
+        self.assertIsInstance(errors[0], IllegalMoveException)
+        self.assertIsInstance(errors[1], NoSuchGameException)
+
+    def test_adding_a_worker_moves_only_its_games(self):
+        game_ids = [self.games.create_game() for _ in range(60)]
+        owners_before = dict(self.games.owners)
+        moved = self.games.add_worker()
+        self.assertGreater(moved, 0)
+        self.assertLess(moved, len(game_ids))
+        for game_id in game_ids:
+            owner = self.games.owners[game_id]
+            self.assertIn(owner, (owners_before[game_id], 2))
+            self.assertEqual(self.games.get_worker_of(game_id), owner)
+            self.assertEqual((DEFAULT_CHESS_BOARD, TeamEnum.WHITES.value, 0), self.games.get_state(game_id))
+        self.assertEqual(moved, sum(1 for owner in self.games.owners.values() if owner == 2))
+
+    def test_moved_games_keep_their_whole_state(self):
+        game_ids = [self.games.create_game() for _ in range(30)]
+        shuffle = [(TeamEnum.WHITES.value, 'g1', 'f3'), (TeamEnum.BLACKS.value, 'g8', 'f6'),
+                   (TeamEnum.WHITES.value, 'f3', 'g1'), (TeamEnum.BLACKS.value, 'f6', 'g8')] * 2
+        for team, cell_from, cell_to in shuffle:
+            errors = self.games.make_moves([(game_id, Move(team, cell_from, cell_to, None)) for game_id in game_ids])
+            self.assertEqual([None] * len(game_ids), errors)
+        owners_before = dict(self.games.owners)
+        self.assertGreater(self.games.add_worker(), 0)
+        for game_id in game_ids:
+            owner = self.games.owners[game_id]
+            self.assertEqual((DEFAULT_CHESS_BOARD, TeamEnum.WHITES.value, 8), self.games.get_state(game_id))
+            snapshot, rule_set = self.games.workers[owner].call('export', game_id)
+            game = loads(snapshot, rule_set)
+            self.assertEqual(GameStatusEnum.THREEFOLD_REPETITION, game.status)
+            self.assertEqual(8, len(game.move_history))
+            if owner != owners_before[game_id]:
+                with self.assertRaises(NoSuchGameException):
+                    self.games.workers[owners_before[game_id]].call('state', game_id)